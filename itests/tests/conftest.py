@@ -22,7 +22,6 @@
 import os
 import uuid
 
-import grpc
 import pytest
 from squeak.params import SelectParams
 
@@ -36,6 +35,7 @@ from tests.util import delete_profile
 from tests.util import generate_signing_key
 from tests.util import get_address
 from tests.util import open_peer_connection
+from tests.util import StubPool
 
 
 @pytest.fixture(autouse=True)
@@ -44,16 +44,29 @@ def select_mainnet_params():
     SelectParams("simnet")
 
 
+@pytest.fixture(scope="session")
+def admin_stub_pool():
+    pool = StubPool("squeaknode:8994", squeak_admin_pb2_grpc.SqueakAdminStub)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def other_admin_stub_pool():
+    pool = StubPool("squeaknode_other:8994",
+                    squeak_admin_pb2_grpc.SqueakAdminStub)
+    yield pool
+    pool.close()
+
+
 @pytest.fixture
-def admin_stub():
-    with grpc.insecure_channel("squeaknode:8994") as admin_channel:
-        yield squeak_admin_pb2_grpc.SqueakAdminStub(admin_channel)
+def admin_stub(admin_stub_pool):
+    yield admin_stub_pool.get()
 
 
 @pytest.fixture
-def other_admin_stub():
-    with grpc.insecure_channel("squeaknode_other:8994") as admin_channel:
-        yield squeak_admin_pb2_grpc.SqueakAdminStub(admin_channel)
+def other_admin_stub(other_admin_stub_pool):
+    yield other_admin_stub_pool.get()
 
 
 @pytest.fixture
@@ -408,6 +408,21 @@ def test_set_profile_image(admin_stub, contact_profile_id, random_image, random_
     assert not squeak_profile.has_custom_profile_image
 
 
+def test_set_profile_image_bytes(admin_stub, contact_profile_id, random_image, random_image_base64_string):
+    # Set the profile image with raw bytes
+    admin_stub.SetSqueakProfileImage(
+        squeak_admin_pb2.SetSqueakProfileImageRequest(
+            profile_id=contact_profile_id,
+            profile_image_bytes=random_image,
+        )
+    )
+
+    # Get the squeak profile
+    squeak_profile = get_squeak_profile(admin_stub, contact_profile_id)
+    assert squeak_profile.profile_image == random_image_base64_string
+    assert squeak_profile.has_custom_profile_image
+
+
 def test_delete_profile(admin_stub, random_name, squeak_address, contact_profile_id):
     # Delete the profile
     delete_profile(admin_stub, contact_profile_id)
@@ -470,6 +485,31 @@ def test_get_following_squeaks(
         pass
 
 
+def test_stream_following_squeaks(
+    admin_stub, saved_squeak_hash, signing_profile_id
+):
+    # Set the profile to be following
+    admin_stub.SetSqueakProfileFollowing(
+        squeak_admin_pb2.SetSqueakProfileFollowingRequest(
+            profile_id=signing_profile_id,
+            following=True,
+        )
+    )
+
+    # Stream all squeak displays in the timeline
+    squeak_display_entries = list(
+        admin_stub.StreamTimelineSqueakDisplays(
+            squeak_admin_pb2.GetTimelineSqueakDisplaysRequest(
+                limit=100,
+            )
+        )
+    )
+    assert len(squeak_display_entries) >= 1
+    assert saved_squeak_hash in [
+        entry.squeak_hash for entry in squeak_display_entries
+    ]
+
+
 def test_delete_squeak(admin_stub, saved_squeak_hash):
     # Delete the squeak
     delete_squeak(admin_stub, saved_squeak_hash)
@@ -905,6 +945,34 @@ def test_get_squeak_details(admin_stub, saved_squeak_hash):
     CheckSqueak(deserialized_squeak)
 
 
+def test_admin_batch(admin_stub, saved_squeak_hash, signing_profile_id):
+    admin_batch_response = admin_stub.AdminBatch(
+        squeak_admin_pb2.AdminBatchRequest(
+            calls=[
+                squeak_admin_pb2.AdminBatchCall(
+                    get_squeak_profile=squeak_admin_pb2.GetSqueakProfileRequest(
+                        profile_id=signing_profile_id,
+                    ),
+                ),
+                squeak_admin_pb2.AdminBatchCall(
+                    get_squeak_display=squeak_admin_pb2.GetSqueakDisplayRequest(
+                        squeak_hash=saved_squeak_hash,
+                    ),
+                ),
+                squeak_admin_pb2.AdminBatchCall(
+                    get_squeak_details=squeak_admin_pb2.GetSqueakDetailsRequest(
+                        squeak_hash=saved_squeak_hash,
+                    ),
+                ),
+            ],
+        )
+    )
+    profile_result, display_result, details_result = admin_batch_response.results
+    assert profile_result.get_squeak_profile.squeak_profile.profile_id == signing_profile_id
+    assert display_result.get_squeak_display.squeak_display_entry.squeak_hash == saved_squeak_hash
+    assert details_result.get_squeak_details.HasField("squeak_detail_entry")
+
+
 def test_like_squeak(admin_stub, saved_squeak_hash):
     # Get the squeak display item
     get_squeak_display_entry = get_squeak_display(
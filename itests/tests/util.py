@@ -22,14 +22,18 @@
 from __future__ import print_function
 
 import base64
+import itertools
 import queue
+import random
 import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 from contextlib import contextmanager
 
-from squeak.core.elliptic import scalar_difference
-from squeak.core.elliptic import scalar_from_bytes
-from squeak.core.elliptic import scalar_to_bytes
+import grpc
+from squeak.core.elliptic import CURVE
 from squeak.core.signing import CSigningKey
 from squeak.core.signing import CSqueakAddress
 
@@ -37,6 +41,116 @@ from proto import lnd_pb2
 from proto import squeak_admin_pb2
 
 
+# Shared pool for the threads that consume subscription streams.
+SUBSCRIPTION_POOL = ThreadPoolExecutor(
+    max_workers=8,
+    thread_name_prefix="subscription",
+)
+SUBSCRIPTION_REAP_TIMEOUT_S = 5
+
+
+class StubPool:
+    """ Round-robin pool of persistent gRPC channels to one target.
+
+    Channels are opened once with keepalive enabled and reused across
+    tests, so RPC helpers don't pay for connection setup on each test.
+    """
+
+    CHANNEL_OPTIONS = [
+        ('grpc.keepalive_time_ms', 10000),
+        ('grpc.keepalive_permit_without_calls', 1),
+    ]
+
+    def __init__(self, target, stub_cls, size=2):
+        self.channels = [
+            grpc.insecure_channel(target, options=self.CHANNEL_OPTIONS)
+            for _ in range(size)
+        ]
+        self.stubs = [stub_cls(channel) for channel in self.channels]
+        self._indices = itertools.cycle(range(size))
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            index = next(self._indices)
+        return self.stubs[index]
+
+    def close(self):
+        for channel in self.channels:
+            channel.close()
+
+
+class EventDeque:
+    """ Single-producer, single-consumer queue for subscription results.
+
+    Uses the atomic append/popleft of deque with one event for wakeup,
+    instead of the locks and conditions of queue.Queue.
+
+    With a maxsize, put() blocks until the consumer makes room. The
+    subscription helpers use a handoff depth of one: the stream stays
+    buffered in gRPC until the test asks for the next item, and a
+    deeper buffer doesn't make the test see results any sooner.
+    """
+
+    def __init__(self, maxsize=0):
+        self.maxsize = maxsize
+        self._items = deque()
+        self._event = threading.Event()
+        self._space = threading.Event()
+        self._closed = False
+
+    def put(self, item):
+        while self.maxsize and len(self._items) >= self.maxsize:
+            self._space.clear()
+            if self._closed:
+                return
+            # Check again in case an item was taken before the clear.
+            if len(self._items) < self.maxsize:
+                break
+            self._space.wait()
+        self._items.append(item)
+        self._event.set()
+
+    def get(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                item = self._items.popleft()
+                self._space.set()
+                return item
+            except IndexError:
+                pass
+            self._event.clear()
+            # Check again in case an item arrived before the clear.
+            if self._items:
+                continue
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise queue.Empty
+            self._event.wait(remaining)
+
+    def drain(self):
+        """ Remove and return all items currently buffered. """
+        items = []
+        while True:
+            try:
+                items.append(self._items.popleft())
+            except IndexError:
+                self._space.set()
+                return items
+
+    def drain_all(self, timeout=None):
+        """ Wait for at least one item, then return everything buffered. """
+        items = [self.get(timeout=timeout)]
+        items.extend(self.drain())
+        return items
+
+    def close(self):
+        """ Release a producer blocked on a full queue. """
+        self._closed = True
+        self._space.set()
+
+
 def generate_signing_key():
     return CSigningKey.generate()
 
@@ -49,8 +163,9 @@ def get_address(signing_key):
 
 def get_hash(squeak):
     """ Needs to be reversed because hash is stored as little-endian """
-    hash_bytes = squeak.GetHash()[::-1]
-    return hash_bytes.hex()
+    hash_bytes = squeak.GetHash()
+    return int.from_bytes(hash_bytes, 'little').to_bytes(
+        len(hash_bytes), 'big').hex()
 
 
 def string_to_hex(s):
@@ -58,15 +173,42 @@ def string_to_hex(s):
 
 
 def subtract_tweak(n, tweak):
-    n_int = scalar_from_bytes(n)
-    tweak_int = scalar_from_bytes(tweak)
-    sum_int = scalar_difference(n_int, tweak_int)
-    return scalar_to_bytes(sum_int)
+    return subtract_tweaks_bulk([n], [tweak])[0]
+
+
+def subtract_tweaks_bulk(ns, tweaks):
+    """ Subtract each tweak from the matching scalar, modulo the curve order. """
+    order = CURVE.order
+    return [
+        ((int.from_bytes(n, 'big') - int.from_bytes(tweak, 'big')) %
+         order).to_bytes(32, 'big')
+        for n, tweak in zip(ns, tweaks)
+    ]
 
 
 def bytes_to_base64_string(data: bytes) -> str:
     encoded_string = base64.b64encode(data)
-    return encoded_string.decode('utf-8')
+    return encoded_string.decode('ascii')
+
+
+def poll_with_backoff(fn, predicate, timeout=60.0, base=0.5, cap=8.0):
+    """ Call `fn` until `predicate` holds for its result.
+
+    Sleeps between attempts with exponential backoff and full jitter,
+    and raises once the total time budget is exhausted.
+    """
+    deadline = time.monotonic() + timeout
+    i = 0
+    while True:
+        result = fn()
+        if predicate(result):
+            return result
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise Exception("Polling timed out after {} tries.".format(i + 1))
+        delay = random.uniform(0, min(cap, base * 2 ** i))
+        time.sleep(min(delay, remaining))
+        i += 1
 
 
 @contextmanager
@@ -79,11 +221,20 @@ def peer_connection(node_stub, lightning_host, remote_pubkey):
     finally:
         # Disconnect the peer
         disconnect_peer(node_stub, remote_pubkey)
-        time.sleep(2)
+        poll_with_backoff(
+            lambda: list_peers(node_stub),
+            lambda peers_list: all(
+                peer.pub_key != remote_pubkey
+                for peer in peers_list.peers
+            ),
+            timeout=10.0,
+            base=0.05,
+            cap=0.5,
+        )
 
 
 @contextmanager
-def channel(node_stub, remote_pubkey, amount):
+def channel(node_stub, remote_pubkey, amount, verbose=True):
     # Open channel to the server lightning node
     # pubkey_bytes = string_to_hex(remote_pubkey)
     # open_channel_response = lightning_client.open_channel(pubkey_bytes, amount)
@@ -92,26 +243,38 @@ def channel(node_stub, remote_pubkey, amount):
     print("Opening channel...")
 
     # Wait for channel to be open.
-    MAX_RETRIES = 30
-    i = 0
-    while True:
-        print("Try number: {}".format(i))
-        # peers_list = lightning_client.list_peers()
-        peers_list = list_peers(node_stub)
-        # channels_list = lightning_client.list_channels()
-        channels_list = list_channels(node_stub)
-        # pending_channels_list = lightning_client.pending_channels()
-        pending_channels_list = pending_channels(node_stub)
-        print("list peers: {}".format(peers_list))
-        print("list channels: {}".format(channels_list))
-        print("pending channels: {}".format(pending_channels_list))
-        if len(channels_list.channels) > 0:
-            print("Channel now open.")
-            break
-        time.sleep(1)
-        i += 1
-        if i > MAX_RETRIES:
-            raise Exception("Open channel timed out.")
+    def get_channels():
+        # Issue the status calls concurrently. Only the channels list
+        # gates the exit, so the others are only requested for logging.
+        channels_future = list_channels(node_stub, future=True)
+        if verbose:
+            peers_future = list_peers(node_stub, future=True)
+            pending_channels_future = pending_channels(node_stub, future=True)
+            print("list peers: {}".format(peers_future.result()))
+            print("pending channels: {}".format(
+                pending_channels_future.result()))
+        channels_list = channels_future.result()
+        if verbose:
+            print("list channels: {}".format(channels_list))
+        return channels_list
+
+    poll_with_backoff(
+        get_channels,
+        lambda channels_list: len(channels_list.channels) > 0,
+        timeout=30.0,
+    )
+    print("Channel now open.")
+
+    # Wait for the channel to become active.
+    poll_with_backoff(
+        lambda: list_channels(node_stub),
+        lambda channels_list: all(
+            chan.active for chan in channels_list.channels
+        ),
+        timeout=30.0,
+        base=0.05,
+        cap=0.5,
+    )
 
     # for update in open_channel_response:
     #     if update.HasField("chan_open"):
@@ -121,13 +284,21 @@ def channel(node_stub, remote_pubkey, amount):
     # print("list peers: {}".format(lightning_client.list_peers()))
     # print("list channels: {}".format(lightning_client.list_channels()))
     # print("pending channels: {}".format(lightning_client.pending_channels()))
-    time.sleep(10)
     try:
         yield
     finally:
         # Code to release resource, e.g.:
-        # Close the channel
-        time.sleep(2)
+        # Wait for in-flight payments to settle, then close the channel
+        poll_with_backoff(
+            lambda: list_channels(node_stub),
+            lambda channels_list: all(
+                len(chan.pending_htlcs) == 0
+                for chan in channels_list.channels
+            ),
+            timeout=10.0,
+            base=0.05,
+            cap=0.5,
+        )
         # for update in lightning_client.close_channel(channel_point):
         close_channel(node_stub, channel_point)
 
@@ -158,8 +329,9 @@ def open_peer_connection(node_stub, peer_name, peer_host, peer_port):
         print(e)
         raise
     finally:
-        # Disconnect the peer
-        node_stub.DisconnectPeer(
+        # Disconnect and delete the peer concurrently. Deleting the saved
+        # peer doesn't depend on the live connection being closed.
+        disconnect_future = node_stub.DisconnectPeer.future(
             squeak_admin_pb2.DisconnectPeerRequest(
                 peer_address=squeak_admin_pb2.PeerAddress(
                     host=peer_host,
@@ -167,12 +339,13 @@ def open_peer_connection(node_stub, peer_name, peer_host, peer_port):
                 )
             )
         )
-        # Delete the peer
-        node_stub.DeletePeer(
+        delete_future = node_stub.DeletePeer.future(
             squeak_admin_pb2.DeletePeerRequest(
                 peer_id=peer_id,
             )
         )
+        disconnect_future.result()
+        delete_future.result()
 
 
 def get_connected_peers(node_stub):
@@ -219,7 +392,7 @@ def get_search_squeaks(node_stub, search_text):
 
 @contextmanager
 def subscribe_connected_peers(node_stub):
-    q = queue.Queue()
+    q = EventDeque(maxsize=1)
     subscribe_connected_peers_response = node_stub.SubscribeConnectedPeers(
         squeak_admin_pb2.SubscribeConnectedPeersRequest()
     )
@@ -228,11 +401,13 @@ def subscribe_connected_peers(node_stub):
         for result in subscribe_connected_peers_response:
             q.put(result.connected_peers)
 
-    threading.Thread(
-        target=enqueue_results,
-    ).start()
-    yield q
-    subscribe_connected_peers_response.cancel()
+    future = SUBSCRIPTION_POOL.submit(enqueue_results)
+    try:
+        yield q
+    finally:
+        q.close()
+        subscribe_connected_peers_response.cancel()
+        wait([future], timeout=SUBSCRIPTION_REAP_TIMEOUT_S)
 
 
 def get_squeak_display(node_stub, squeak_hash):
@@ -384,21 +559,33 @@ def close_channel(node_stub, channel_point):
     )
 
 
-def list_peers(node_stub):
-    return node_stub.LndListPeers(
-        lnd_pb2.ListPeersRequest()
+def _call(method, request, future):
+    if future:
+        return method.future(request)
+    return method(request)
+
+
+def list_peers(node_stub, future=False):
+    return _call(
+        node_stub.LndListPeers,
+        lnd_pb2.ListPeersRequest(),
+        future,
     )
 
 
-def list_channels(node_stub):
-    return node_stub.LndListChannels(
-        lnd_pb2.ListChannelsRequest()
+def list_channels(node_stub, future=False):
+    return _call(
+        node_stub.LndListChannels,
+        lnd_pb2.ListChannelsRequest(),
+        future,
     )
 
 
-def pending_channels(node_stub):
-    return node_stub.LndPendingChannels(
-        lnd_pb2.PendingChannelsRequest()
+def pending_channels(node_stub, future=False):
+    return _call(
+        node_stub.LndPendingChannels,
+        lnd_pb2.PendingChannelsRequest(),
+        future,
     )
 
 
@@ -434,7 +621,7 @@ def send_coins(node_stub, addr, amount):
 
 @contextmanager
 def subscribe_squeak_entry(node_stub, squeak_hash):
-    q = queue.Queue()
+    q = EventDeque(maxsize=1)
     subscribe_squeak_entry_response = node_stub.SubscribeSqueakDisplay(
         squeak_admin_pb2.SubscribeSqueakDisplayRequest(
             squeak_hash=squeak_hash,
@@ -445,16 +632,18 @@ def subscribe_squeak_entry(node_stub, squeak_hash):
         for result in subscribe_squeak_entry_response:
             q.put(result.squeak_display_entry)
 
-    threading.Thread(
-        target=enqueue_results,
-    ).start()
-    yield q
-    subscribe_squeak_entry_response.cancel()
+    future = SUBSCRIPTION_POOL.submit(enqueue_results)
+    try:
+        yield q
+    finally:
+        q.close()
+        subscribe_squeak_entry_response.cancel()
+        wait([future], timeout=SUBSCRIPTION_REAP_TIMEOUT_S)
 
 
 @contextmanager
 def subscribe_squeaks_for_address(node_stub, squeak_address):
-    q = queue.Queue()
+    q = EventDeque(maxsize=1)
     subscribe_address_squeaks_response = node_stub.SubscribeAddressSqueakDisplays(
         squeak_admin_pb2.SubscribeAddressSqueakDisplaysRequest(
             address=squeak_address,
@@ -465,16 +654,18 @@ def subscribe_squeaks_for_address(node_stub, squeak_address):
         for result in subscribe_address_squeaks_response:
             q.put(result.squeak_display_entry)
 
-    threading.Thread(
-        target=enqueue_results,
-    ).start()
-    yield q
-    subscribe_address_squeaks_response.cancel()
+    future = SUBSCRIPTION_POOL.submit(enqueue_results)
+    try:
+        yield q
+    finally:
+        q.close()
+        subscribe_address_squeaks_response.cancel()
+        wait([future], timeout=SUBSCRIPTION_REAP_TIMEOUT_S)
 
 
 @contextmanager
 def subscribe_squeak_ancestor_entries(node_stub, squeak_hash):
-    q = queue.Queue()
+    q = EventDeque(maxsize=1)
     subscribe_squeak_ancestor_entries_response = node_stub.SubscribeAncestorSqueakDisplays(
         squeak_admin_pb2.SubscribeAncestorSqueakDisplaysRequest(
             squeak_hash=squeak_hash,
@@ -485,8 +676,10 @@ def subscribe_squeak_ancestor_entries(node_stub, squeak_hash):
         for result in subscribe_squeak_ancestor_entries_response:
             q.put(result.squeak_display_entries)
 
-    threading.Thread(
-        target=enqueue_results,
-    ).start()
-    yield q
-    subscribe_squeak_ancestor_entries_response.cancel()
+    future = SUBSCRIPTION_POOL.submit(enqueue_results)
+    try:
+        yield q
+    finally:
+        q.close()
+        subscribe_squeak_ancestor_entries_response.cancel()
+        wait([future], timeout=SUBSCRIPTION_REAP_TIMEOUT_S)
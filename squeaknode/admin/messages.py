@@ -20,7 +20,14 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 import logging
-
+from binascii import unhexlify
+from functools import lru_cache
+from typing import Callable
+from typing import Iterable
+from typing import Optional
+from typing import TypeVar
+
+from google.protobuf.internal.containers import RepeatedCompositeFieldContainer
 from squeak.core import CSqueak
 
 from proto import squeak_admin_pb2
@@ -37,74 +44,117 @@ from squeaknode.core.sent_payment_summary import SentPaymentSummary
 from squeaknode.core.squeak_entry import SqueakEntry
 from squeaknode.core.squeak_peer import SqueakPeer
 from squeaknode.core.squeak_profile import SqueakProfile
+from squeaknode.core.squeaks import HASH_LENGTH
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
 
 DEFAULT_PROFILE_IMAGE = load_default_profile_image()
+DEFAULT_PROFILE_IMAGE_BASE64 = bytes_to_base64_string(DEFAULT_PROFILE_IMAGE)
+# Profile image size is not limited, and each cache entry holds both the
+# image and its base64 string, so only keep the images of a few authors.
+PROFILE_IMAGE_BASE64_CACHE_SIZE = 32
+
+
+@lru_cache(maxsize=PROFILE_IMAGE_BASE64_CACHE_SIZE)
+def profile_image_to_base64_string(profile_image: bytes) -> str:
+    return bytes_to_base64_string(profile_image)
 
 
 def squeak_entry_to_message(squeak_entry: SqueakEntry) -> squeak_admin_pb2.SqueakDisplayEntry:
+    msg = squeak_admin_pb2.SqueakDisplayEntry()
+    set_squeak_entry_message(msg, squeak_entry)
+    return msg
+
+
+def squeak_entry_to_display_reply(squeak_entry: SqueakEntry) -> squeak_admin_pb2.GetSqueakDisplayReply:
+    # Fill the entry in place in the reply, instead of building a
+    # separate message that the reply constructor would copy.
+    reply = squeak_admin_pb2.GetSqueakDisplayReply()
+    set_squeak_entry_message(reply.squeak_display_entry, squeak_entry)
+    return reply
+
+
+def squeak_entries_to_message(
+        squeak_entries: Iterable[SqueakEntry],
+        msgs: 'RepeatedCompositeFieldContainer[squeak_admin_pb2.SqueakDisplayEntry]',
+) -> None:
+    # Fill each entry in place in the repeated field, so that no
+    # standalone message has to be built and copied in. The functions
+    # used per entry are bound to locals before the loop.
+    add_msg = msgs.add
+    set_msg = set_squeak_entry_message
+    for squeak_entry in squeak_entries:
+        set_msg(add_msg(), squeak_entry)
+
+
+def set_squeak_entry_message(
+        msg: squeak_admin_pb2.SqueakDisplayEntry,
+        squeak_entry: SqueakEntry,
+) -> None:
+    # Assign fields directly instead of going through the keyword
+    # constructor, so that callers can also fill a message obtained
+    # from a repeated field with add().
     squeak_profile = squeak_entry.squeak_profile
-    is_reply = bool(squeak_entry.reply_to)
-    reply_to = squeak_entry.reply_to.hex() if squeak_entry.reply_to else None
-    is_author_known = False
-    profile_msg = None
+    reply_to_hash = squeak_entry.reply_to
+    msg.squeak_hash = squeak_entry.squeak_hash.hex()
+    msg.is_unlocked = squeak_entry.is_unlocked
+    if squeak_entry.content is not None:
+        msg.content_str = squeak_entry.content
+    msg.block_height = squeak_entry.block_height
+    msg.block_hash = squeak_entry.block_hash.hex()
+    msg.block_time = squeak_entry.block_time
+    msg.squeak_time = squeak_entry.squeak_time
+    msg.is_reply = bool(reply_to_hash)
+    if reply_to_hash:
+        msg.reply_to = reply_to_hash.hex()
+    msg.author_address = squeak_entry.address
+    msg.is_author_known = squeak_profile is not None
     if squeak_profile is not None:
-        is_author_known = True
-        profile_msg = squeak_profile_to_message(squeak_profile)
-    return squeak_admin_pb2.SqueakDisplayEntry(
-        squeak_hash=squeak_entry.squeak_hash.hex(),
-        is_unlocked=squeak_entry.is_unlocked,
-        content_str=squeak_entry.content,  # type: ignore
-        block_height=squeak_entry.block_height,
-        block_hash=squeak_entry.block_hash.hex(),
-        block_time=squeak_entry.block_time,
-        squeak_time=squeak_entry.squeak_time,
-        is_reply=is_reply,
-        reply_to=reply_to,  # type: ignore
-        author_address=squeak_entry.address,
-        is_author_known=is_author_known,
-        author=profile_msg,
-        liked_time_ms=squeak_entry.liked_time_ms,  # type: ignore
-    )
+        msg.author.CopyFrom(squeak_profile_to_message(squeak_profile))
+    if squeak_entry.liked_time_ms is not None:
+        msg.liked_time_ms = squeak_entry.liked_time_ms
 
 
 def squeak_profile_to_message(squeak_profile: SqueakProfile) -> squeak_admin_pb2.SqueakProfile:
-    if squeak_profile.profile_id is None:
+    profile_id = squeak_profile.profile_id
+    if profile_id is None:
         raise Exception("Profile id cannot be None.")
-    has_private_key = squeak_profile.private_key is not None
-    profile_image = squeak_profile.profile_image or DEFAULT_PROFILE_IMAGE
-    has_custom_profile_image = squeak_profile.profile_image is not None
-    image_base64_str = bytes_to_base64_string(profile_image)
+    profile_image = squeak_profile.profile_image
+    image_base64_str = profile_image_to_base64_string(
+        profile_image,
+    ) if profile_image else DEFAULT_PROFILE_IMAGE_BASE64
     return squeak_admin_pb2.SqueakProfile(
-        profile_id=squeak_profile.profile_id,
+        profile_id=profile_id,
         profile_name=squeak_profile.profile_name,
-        has_private_key=has_private_key,
+        has_private_key=squeak_profile.private_key is not None,
         address=squeak_profile.address,
         following=squeak_profile.following,
         use_custom_price=squeak_profile.use_custom_price,
         custom_price_msat=squeak_profile.custom_price_msat,
         profile_image=image_base64_str,
-        has_custom_profile_image=has_custom_profile_image,
+        has_custom_profile_image=profile_image is not None,
     )
 
 
 def squeak_peer_to_message(squeak_peer: SqueakPeer) -> squeak_admin_pb2.SqueakPeer:
     if squeak_peer.peer_id is None:
         raise Exception("Peer id cannot be None.")
-    return squeak_admin_pb2.SqueakPeer(
+    msg = squeak_admin_pb2.SqueakPeer(
         peer_id=squeak_peer.peer_id,
         peer_name=squeak_peer.peer_name,
-        peer_address=peer_address_to_message(squeak_peer.address),
         autoconnect=squeak_peer.autoconnect,
     )
+    set_peer_address_message(msg.peer_address, squeak_peer.address)
+    return msg
 
 
 def offer_entry_to_message(received_offer: ReceivedOffer) -> squeak_admin_pb2.OfferDisplayEntry:
     if received_offer.received_offer_id is None:
         raise Exception("Received offer id cannot be None.")
-    return squeak_admin_pb2.OfferDisplayEntry(
+    msg = squeak_admin_pb2.OfferDisplayEntry(
         offer_id=received_offer.received_offer_id,
         squeak_hash=received_offer.squeak_hash.hex(),
         price_msat=received_offer.price_msat,
@@ -113,8 +163,9 @@ def offer_entry_to_message(received_offer: ReceivedOffer) -> squeak_admin_pb2.Of
         node_port=received_offer.lightning_address.port,
         invoice_timestamp=received_offer.invoice_timestamp,
         invoice_expiry=received_offer.invoice_expiry,
-        peer_address=peer_address_to_message(received_offer.peer_address)
     )
+    set_peer_address_message(msg.peer_address, received_offer.peer_address)
+    return msg
 
 
 def sent_payment_to_message(sent_payment: SentPayment) -> squeak_admin_pb2.SentPayment:
@@ -122,7 +173,7 @@ def sent_payment_to_message(sent_payment: SentPayment) -> squeak_admin_pb2.SentP
         raise Exception("Sent payment id cannot be None.")
     if sent_payment.created_time_ms is None:
         raise Exception("Sent payment created time ms not found.")
-    return squeak_admin_pb2.SentPayment(
+    msg = squeak_admin_pb2.SentPayment(
         sent_payment_id=sent_payment.sent_payment_id,
         squeak_hash=sent_payment.squeak_hash.hex(),
         payment_hash=sent_payment.payment_hash.hex(),
@@ -130,8 +181,9 @@ def sent_payment_to_message(sent_payment: SentPayment) -> squeak_admin_pb2.SentP
         node_pubkey=sent_payment.node_pubkey,
         valid=sent_payment.valid,
         time_ms=sent_payment.created_time_ms,
-        peer_address=peer_address_to_message(sent_payment.peer_address)
     )
+    set_peer_address_message(msg.peer_address, sent_payment.peer_address)
+    return msg
 
 
 def squeak_to_detail_message(squeak: CSqueak) -> squeak_admin_pb2.SqueakDetailEntry:
@@ -157,14 +209,15 @@ def received_payments_to_message(received_payment: ReceivedPayment) -> squeak_ad
         raise Exception("Received payment id cannot be None.")
     if received_payment.created_time_ms is None:
         raise Exception("Received payment created time ms not found.")
-    return squeak_admin_pb2.ReceivedPayment(
+    msg = squeak_admin_pb2.ReceivedPayment(
         received_payment_id=received_payment.received_payment_id,
         squeak_hash=received_payment.squeak_hash.hex(),
         payment_hash=received_payment.payment_hash.hex(),
         price_msat=received_payment.price_msat,
         time_ms=received_payment.created_time_ms,
-        peer_address=peer_address_to_message(received_payment.peer_address)
     )
+    set_peer_address_message(msg.peer_address, received_payment.peer_address)
+    return msg
 
 
 def payment_summary_to_message(
@@ -186,8 +239,7 @@ def connected_peer_to_message(connected_peer: ConnectedPeer) -> squeak_admin_pb2
     saved_peer_msg = None
     if saved_peer is not None:
         saved_peer_msg = squeak_peer_to_message(saved_peer)
-    return squeak_admin_pb2.ConnectedPeer(
-        peer_address=peer_address_to_message(peer.remote_address),
+    msg = squeak_admin_pb2.ConnectedPeer(
         connect_time_s=peer.connect_time,
         last_message_received_time_s=peer.last_msg_revc_time,
         number_messages_received=peer.num_msgs_received,
@@ -197,14 +249,21 @@ def connected_peer_to_message(connected_peer: ConnectedPeer) -> squeak_admin_pb2
         is_peer_saved=is_peer_saved,
         saved_peer=saved_peer_msg,
     )
+    set_peer_address_message(msg.peer_address, peer.remote_address)
+    return msg
 
 
 def peer_address_to_message(peer_address: PeerAddress) -> squeak_admin_pb2.PeerAddress:
-    return squeak_admin_pb2.PeerAddress(
-        host=peer_address.host,
-        port=peer_address.port,
-        use_tor=peer_address.use_tor,
-    )
+    msg = squeak_admin_pb2.PeerAddress()
+    set_peer_address_message(msg, peer_address)
+    return msg
+
+
+def set_peer_address_message(msg: squeak_admin_pb2.PeerAddress, peer_address: PeerAddress) -> None:
+    # Assign in place so nested fields don't need a separate message copy.
+    msg.host = peer_address.host
+    msg.port = peer_address.port
+    msg.use_tor = peer_address.use_tor
 
 
 def message_to_peer_address(peer_address: squeak_admin_pb2.PeerAddress) -> PeerAddress:
@@ -215,16 +274,48 @@ def message_to_peer_address(peer_address: squeak_admin_pb2.PeerAddress) -> PeerA
     )
 
 
+def message_to_squeak_hash(squeak_hash_str: str) -> bytes:
+    squeak_hash = bytes.fromhex(squeak_hash_str)
+    if len(squeak_hash) != HASH_LENGTH:
+        raise Exception("Invalid squeak hash: {}.".format(
+            squeak_hash_str,
+        ))
+    return squeak_hash
+
+
+def optional_field_to_value(
+        msg,
+        field_name: str,
+        convert: Callable[..., T],
+) -> Optional[T]:
+    # Unset message fields read as default instances, so check presence
+    # before converting.
+    if not msg.HasField(field_name):
+        return None
+    return convert(getattr(msg, field_name))
+
+
 def message_to_squeak_entry(squeak_entry: squeak_admin_pb2.SqueakDisplayEntry) -> SqueakEntry:
+    if squeak_entry.reply_to:
+        return _message_to_squeak_entry(
+            squeak_entry,
+            unhexlify(squeak_entry.reply_to),
+        )
+    return _message_to_squeak_entry(squeak_entry, None)
+
+
+def _message_to_squeak_entry(
+        squeak_entry: squeak_admin_pb2.SqueakDisplayEntry,
+        reply_to: Optional[bytes],
+) -> SqueakEntry:
     return SqueakEntry(
-        squeak_hash=bytes.fromhex(squeak_entry.squeak_hash),
+        squeak_hash=unhexlify(squeak_entry.squeak_hash),
         address=squeak_entry.author_address,
         block_height=squeak_entry.block_height,
-        block_hash=bytes.fromhex(squeak_entry.block_hash),
+        block_hash=unhexlify(squeak_entry.block_hash),
         block_time=squeak_entry.block_time,
         squeak_time=squeak_entry.squeak_time,
-        reply_to=bytes.fromhex(
-            squeak_entry.reply_to) if squeak_entry.reply_to else None,
+        reply_to=reply_to,
         is_unlocked=squeak_entry.is_unlocked,
         squeak_profile=None,  # TODO: message to squeak profile
         liked_time_ms=squeak_entry.liked_time_ms,
@@ -237,8 +328,8 @@ def message_to_sent_payment(sent_payment: squeak_admin_pb2.SentPayment) -> SentP
         sent_payment_id=sent_payment.sent_payment_id,
         created_time_ms=sent_payment.time_ms,
         peer_address=message_to_peer_address(sent_payment.peer_address),
-        squeak_hash=bytes.fromhex(sent_payment.squeak_hash),
-        payment_hash=bytes.fromhex(sent_payment.payment_hash),
+        squeak_hash=unhexlify(sent_payment.squeak_hash),
+        payment_hash=unhexlify(sent_payment.payment_hash),
         secret_key=b'',  # TODO: why does this field exist?
         price_msat=sent_payment.price_msat,
         node_pubkey=sent_payment.node_pubkey,
@@ -250,8 +341,8 @@ def message_to_received_payment(received_payment: squeak_admin_pb2.ReceivedPayme
     return ReceivedPayment(
         received_payment_id=received_payment.received_payment_id,
         created_time_ms=received_payment.time_ms,
-        squeak_hash=bytes.fromhex(received_payment.squeak_hash),
-        payment_hash=bytes.fromhex(received_payment.payment_hash),
+        squeak_hash=unhexlify(received_payment.squeak_hash),
+        payment_hash=unhexlify(received_payment.payment_hash),
         price_msat=received_payment.price_msat,
         settle_index=0,  # TODO: This is not correct, fix later.
         peer_address=message_to_peer_address(received_payment.peer_address),
@@ -19,7 +19,7 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
-import base64
+import binascii
 
 from pkg_resources import resource_stream
 
@@ -31,10 +31,9 @@ def load_default_profile_image():
 
 
 def bytes_to_base64_string(data: bytes) -> str:
-    encoded_string = base64.b64encode(data)
-    return encoded_string.decode('utf-8')
+    encoded_string = binascii.b2a_base64(data, newline=False)
+    return encoded_string.decode('ascii')
 
 
 def base64_string_to_bytes(data: str) -> bytes:
-    base64_bytes = data.encode('utf-8')
-    return base64.decodebytes(base64_bytes)
+    return binascii.a2b_base64(data)
@@ -20,30 +20,96 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import Any
+from typing import Iterable
+from typing import Optional
+
+from google.protobuf.message import Message
 
 from proto import squeak_admin_pb2
 from squeaknode.admin.messages import connected_peer_to_message
 from squeaknode.admin.messages import message_to_peer_address
 from squeaknode.admin.messages import message_to_received_payment
 from squeaknode.admin.messages import message_to_sent_payment
+from squeaknode.admin.messages import message_to_squeak_hash
 from squeaknode.admin.messages import message_to_squeak_entry
 from squeaknode.admin.messages import offer_entry_to_message
+from squeaknode.admin.messages import optional_field_to_value
 from squeaknode.admin.messages import payment_summary_to_message
 from squeaknode.admin.messages import peer_address_to_message
 from squeaknode.admin.messages import received_payments_to_message
 from squeaknode.admin.messages import sent_offer_to_message
 from squeaknode.admin.messages import sent_payment_to_message
+from squeaknode.admin.messages import squeak_entries_to_message
+from squeaknode.admin.messages import squeak_entry_to_display_reply
 from squeaknode.admin.messages import squeak_entry_to_message
 from squeaknode.admin.messages import squeak_peer_to_message
 from squeaknode.admin.messages import squeak_profile_to_message
 from squeaknode.admin.messages import squeak_to_detail_message
 from squeaknode.admin.profile_image_util import base64_string_to_bytes
+from squeaknode.core.squeak_entry import SqueakEntry
 from squeaknode.lightning.lnd_lightning_client import LNDLightningClient
 from squeaknode.node.squeak_controller import SqueakController
 
 logger = logging.getLogger(__name__)
 
 
+BATCH_MAX_WORKERS = 8
+PAYMENT_SUMMARY_MAX_WORKERS = 2
+
+# Replies for lookups that found nothing. They are shared between
+# requests, so they must never be modified.
+EMPTY_GET_SQUEAK_PROFILE_REPLY = squeak_admin_pb2.GetSqueakProfileReply()
+EMPTY_GET_SQUEAK_PROFILE_BY_ADDRESS_REPLY = squeak_admin_pb2.GetSqueakProfileByAddressReply()
+EMPTY_GET_SQUEAK_PROFILE_BY_NAME_REPLY = squeak_admin_pb2.GetSqueakProfileByNameReply()
+EMPTY_MAKE_SQUEAK_REPLY = squeak_admin_pb2.MakeSqueakReply()
+EMPTY_GET_SQUEAK_DISPLAY_REPLY = squeak_admin_pb2.GetSqueakDisplayReply()
+EMPTY_GET_PEER_REPLY = squeak_admin_pb2.GetPeerReply()
+EMPTY_GET_PEER_BY_ADDRESS_REPLY = squeak_admin_pb2.GetPeerByAddressReply()
+EMPTY_GET_BUY_OFFER_REPLY = squeak_admin_pb2.GetBuyOfferReply()
+EMPTY_GET_SENT_PAYMENT_REPLY = squeak_admin_pb2.GetSentPaymentReply()
+EMPTY_GET_SQUEAK_DETAILS_REPLY = squeak_admin_pb2.GetSqueakDetailsReply()
+EMPTY_GET_CONNECTED_PEER_REPLY = squeak_admin_pb2.GetConnectedPeerReply()
+
+# Replies for calls that return no data. They are also shared between
+# requests.
+SET_SQUEAK_PROFILE_FOLLOWING_REPLY = squeak_admin_pb2.SetSqueakProfileFollowingReply()
+SET_SQUEAK_PROFILE_USE_CUSTOM_PRICE_REPLY = squeak_admin_pb2.SetSqueakProfileUseCustomPriceReply()
+SET_SQUEAK_PROFILE_CUSTOM_PRICE_REPLY = squeak_admin_pb2.SetSqueakProfileCustomPriceReply()
+RENAME_SQUEAK_PROFILE_REPLY = squeak_admin_pb2.RenameSqueakProfileReply()
+DELETE_SQUEAK_PROFILE_REPLY = squeak_admin_pb2.DeleteSqueakProfileReply()
+SET_SQUEAK_PROFILE_IMAGE_REPLY = squeak_admin_pb2.SetSqueakProfileImageReply()
+CLEAR_SQUEAK_PROFILE_IMAGE_REPLY = squeak_admin_pb2.ClearSqueakProfileImageReply()
+DELETE_SQUEAK_REPLY = squeak_admin_pb2.DeleteSqueakReply()
+RENAME_PEER_REPLY = squeak_admin_pb2.RenamePeerReply()
+SET_PEER_AUTOCONNECT_REPLY = squeak_admin_pb2.SetPeerAutoconnectReply()
+DELETE_PEER_REPLY = squeak_admin_pb2.DeletePeerReply()
+DOWNLOAD_SQUEAKS_REPLY = squeak_admin_pb2.DownloadSqueaksReply()
+DOWNLOAD_SQUEAK_REPLY = squeak_admin_pb2.DownloadSqueakReply()
+DOWNLOAD_OFFERS_REPLY = squeak_admin_pb2.DownloadOffersReply()
+DOWNLOAD_REPLIES_REPLY = squeak_admin_pb2.DownloadRepliesReply()
+DOWNLOAD_ADDRESS_SQUEAKS_REPLY = squeak_admin_pb2.DownloadAddressSqueaksReply()
+REPROCESS_RECEIVED_PAYMENTS_REPLY = squeak_admin_pb2.ReprocessReceivedPaymentsReply()
+LIKE_SQUEAK_REPLY = squeak_admin_pb2.LikeSqueakReply()
+UNLIKE_SQUEAK_REPLY = squeak_admin_pb2.UnlikeSqueakReply()
+CONNECT_PEER_REPLY = squeak_admin_pb2.ConnectPeerReply()
+DISCONNECT_PEER_REPLY = squeak_admin_pb2.DisconnectPeerReply()
+
+
+def squeak_display_replies(
+        squeak_entries: Iterable[Optional[SqueakEntry]],
+) -> Iterable[squeak_admin_pb2.GetSqueakDisplayReply]:
+    """Convert a stream of squeak entries into display replies, with the
+    empty reply for entries that are missing."""
+    to_reply = squeak_entry_to_display_reply
+    empty_reply = EMPTY_GET_SQUEAK_DISPLAY_REPLY
+    for squeak_entry in squeak_entries:
+        yield empty_reply if squeak_entry is None else to_reply(squeak_entry)
+
+
 class SqueakAdminServerHandler(object):
     """Handles admin server commands."""
 
@@ -54,307 +120,301 @@ class SqueakAdminServerHandler(object):
     ):
         self.lightning_client = lightning_client
         self.squeak_controller = squeak_controller
-
-    def handle_lnd_get_info(self, request):
-        logger.info("Handle lnd get info")
-        return self.lightning_client.stub.GetInfo(request)
-
-    def handle_lnd_wallet_balance(self, request):
-        logger.info("Handle lnd wallet balance")
-        return self.lightning_client.stub.WalletBalance(request)
-
-    def handle_lnd_new_address(self, request):
-        logger.info("Handle lnd new address: {}".format(request))
-        return self.lightning_client.stub.NewAddress(request)
-
-    def handle_lnd_list_channels(self, request):
-        logger.info("Handle lnd list channels")
-        return self.lightning_client.stub.ListChannels(request)
-
-    def handle_lnd_pending_channels(self, request):
-        logger.info("Handle lnd pending channels")
-        return self.lightning_client.stub.PendingChannels(request)
-
-    def handle_lnd_get_transactions(self, request):
-        logger.info("Handle lnd get transactions")
-        return self.lightning_client.stub.GetTransactions(request)
-
-    def handle_lnd_list_peers(self, request):
-        logger.info("Handle list peers")
-        return self.lightning_client.stub.ListPeers(request)
-
-    def handle_lnd_connect_peer(self, request):
-        logger.info("Handle connect peer: {}".format(request))
-        return self.lightning_client.stub.ConnectPeer(request)
-
-    def handle_lnd_disconnect_peer(self, request):
-        logger.info("Handle disconnect peer: {}".format(request))
-        return self.lightning_client.stub.DisconnectPeer(request)
-
-    def handle_lnd_open_channel_sync(self, request):
-        logger.info("Handle open channel: {}".format(request))
-        return self.lightning_client.stub.OpenChannelSync(request)
-
-    def handle_lnd_close_channel(self, request):
-        logger.info("Handle close channel: {}".format(request))
-        return self.lightning_client.stub.CloseChannel(request)
-
-    def handle_lnd_subscribe_channel_events(self, request):
-        logger.info("Handle subscribe channel events")
-        return self.lightning_client.stub.SubscribeChannelEvents(request)
-
-    def handle_lnd_send_coins(self, request):
-        logger.info("Handle send coins.")
-        return self.lightning_client.stub.SendCoins(request)
-
-    def handle_create_signing_profile(self, request):
+        self.batch_executor = ThreadPoolExecutor(
+            max_workers=BATCH_MAX_WORKERS,
+            thread_name_prefix="admin_batch",
+        )
+        # Separate from the batch executor, so that a payment summary
+        # requested inside a batch call cannot wait on its own pool.
+        self.payment_summary_executor = ThreadPoolExecutor(
+            max_workers=PAYMENT_SUMMARY_MAX_WORKERS,
+            thread_name_prefix="admin_payment_summary",
+        )
+        # Calls allowed in an admin batch, keyed by the name of the
+        # request field, which is also the name of the reply field.
+        self.batch_handlers = {
+            "get_squeak_profile": self.handle_get_squeak_profile,
+            "get_squeak_profile_by_address": self.handle_get_squeak_profile_by_address,
+            "get_squeak_display": self.handle_get_squeak_display_entry,
+            "get_squeak_details": self.handle_get_squeak_details,
+            "get_ancestor_squeak_displays": self.handle_get_ancestor_squeak_display_entries,
+            "get_reply_squeak_displays": self.handle_get_reply_squeak_display_entries,
+            "get_buy_offers": self.handle_get_buy_offers,
+            "get_peer": self.handle_get_squeak_peer,
+            "get_peer_by_address": self.handle_get_squeak_peer_by_address,
+            "get_connected_peer": self.handle_get_connected_peer,
+        }
+
+    @cached_property
+    def lnd_stub(self):
+        # The stub only exists once the lightning client is initialized,
+        # so look it up on first use and keep it for later requests.
+        return self.lightning_client.stub
+
+    def handle_lnd_call(self, method: str, request: Message) -> Any:
+        logger.info("Handle lnd call: %s", method)
+        return getattr(self.lnd_stub, method)(request)
+
+    def handle_lnd_passthrough(self, method: str, request_bytes: bytes) -> bytes:
+        logger.info("Handle lnd passthrough: %s", method)
+        return self.lightning_client.get_raw_unary_unary(method)(request_bytes)
+
+    def handle_lnd_passthrough_stream(self, method: str, request_bytes: bytes) -> Iterable[bytes]:
+        logger.info("Handle lnd passthrough stream: %s", method)
+        return self.lightning_client.get_raw_unary_stream(method)(request_bytes)
+
+    def handle_create_signing_profile(self, request: squeak_admin_pb2.CreateSigningProfileRequest) -> squeak_admin_pb2.CreateSigningProfileReply:
         profile_name = request.profile_name
         logger.info(
-            "Handle create signing profile with name: {}".format(profile_name))
+            "Handle create signing profile with name: %s", profile_name)
         profile_id = self.squeak_controller.create_signing_profile(
             profile_name)
-        logger.info("New profile_id: {}".format(profile_id))
+        logger.info("New profile_id: %s", profile_id)
         return squeak_admin_pb2.CreateSigningProfileReply(
             profile_id=profile_id,
         )
 
-    def handle_import_signing_profile(self, request):
+    def handle_import_signing_profile(self, request: squeak_admin_pb2.ImportSigningProfileRequest) -> squeak_admin_pb2.ImportSigningProfileReply:
         profile_name = request.profile_name
         private_key = request.private_key
         logger.info(
-            "Handle import signing profile with name: {}".format(profile_name))
+            "Handle import signing profile with name: %s", profile_name)
         profile_id = self.squeak_controller.import_signing_profile(
             profile_name, private_key)
-        logger.info("New profile_id: {}".format(profile_id))
+        logger.info("New profile_id: %s", profile_id)
         return squeak_admin_pb2.ImportSigningProfileReply(
             profile_id=profile_id,
         )
 
-    def handle_create_contact_profile(self, request):
+    def handle_create_contact_profile(self, request: squeak_admin_pb2.CreateContactProfileRequest) -> squeak_admin_pb2.CreateContactProfileReply:
         profile_name = request.profile_name
         squeak_address = request.address
         logger.info(
-            "Handle create contact profile with name: {}, address: {}".format(
-                profile_name,
-                squeak_address,
-            )
+            "Handle create contact profile with name: %s, address: %s",
+            profile_name,
+            squeak_address,
         )
         profile_id = self.squeak_controller.create_contact_profile(
             profile_name, squeak_address
         )
-        logger.info("New profile_id: {}".format(profile_id))
+        logger.info("New profile_id: %s", profile_id)
         return squeak_admin_pb2.CreateContactProfileReply(
             profile_id=profile_id,
         )
 
-    def handle_get_profiles(self, request):
+    def handle_get_profiles(self, request: squeak_admin_pb2.GetProfilesRequest) -> squeak_admin_pb2.GetProfilesReply:
         logger.info("Handle get profiles.")
         profiles = self.squeak_controller.get_profiles()
-        logger.info("Got number of profiles: {}".format(len(profiles)))
-        profile_msgs = [squeak_profile_to_message(
-            profile) for profile in profiles]
-        return squeak_admin_pb2.GetProfilesReply(squeak_profiles=profile_msgs)
+        logger.info("Got number of profiles: %s", len(profiles))
+        reply = squeak_admin_pb2.GetProfilesReply()
+        reply.squeak_profiles.extend(
+            map(squeak_profile_to_message, profiles)
+        )
+        return reply
 
-    def handle_get_signing_profiles(self, request):
+    def handle_get_signing_profiles(self, request: squeak_admin_pb2.GetSigningProfilesRequest) -> squeak_admin_pb2.GetSigningProfilesReply:
         logger.info("Handle get signing profiles.")
         profiles = self.squeak_controller.get_signing_profiles()
-        logger.info("Got number of signing profiles: {}".format(len(profiles)))
-        profile_msgs = [squeak_profile_to_message(
-            profile) for profile in profiles]
-        return squeak_admin_pb2.GetSigningProfilesReply(squeak_profiles=profile_msgs)
+        logger.info("Got number of signing profiles: %s", len(profiles))
+        reply = squeak_admin_pb2.GetSigningProfilesReply()
+        reply.squeak_profiles.extend(
+            map(squeak_profile_to_message, profiles)
+        )
+        return reply
 
-    def handle_get_contact_profiles(self, request):
+    def handle_get_contact_profiles(self, request: squeak_admin_pb2.GetContactProfilesRequest) -> squeak_admin_pb2.GetContactProfilesReply:
         logger.info("Handle get contact profiles.")
         profiles = self.squeak_controller.get_contact_profiles()
-        logger.info("Got number of contact profiles: {}".format(len(profiles)))
-        profile_msgs = [squeak_profile_to_message(
-            profile) for profile in profiles]
-        return squeak_admin_pb2.GetContactProfilesReply(squeak_profiles=profile_msgs)
+        logger.info("Got number of contact profiles: %s", len(profiles))
+        reply = squeak_admin_pb2.GetContactProfilesReply()
+        reply.squeak_profiles.extend(
+            map(squeak_profile_to_message, profiles)
+        )
+        return reply
 
-    def handle_get_squeak_profile(self, request):
+    def handle_get_squeak_profile(self, request: squeak_admin_pb2.GetSqueakProfileRequest) -> squeak_admin_pb2.GetSqueakProfileReply:
         profile_id = request.profile_id
-        logger.info("Handle get squeak profile with id: {}".format(profile_id))
+        logger.info("Handle get squeak profile with id: %s", profile_id)
         squeak_profile = self.squeak_controller.get_squeak_profile(profile_id)
         if squeak_profile is None:
-            return squeak_admin_pb2.GetSqueakProfileReply(
-                squeak_profile=None,
-            )
+            return EMPTY_GET_SQUEAK_PROFILE_REPLY
         squeak_profile_msg = squeak_profile_to_message(squeak_profile)
         return squeak_admin_pb2.GetSqueakProfileReply(
             squeak_profile=squeak_profile_msg,
         )
 
-    def handle_get_squeak_profile_by_address(self, request):
+    def handle_get_squeak_profile_by_address(self, request: squeak_admin_pb2.GetSqueakProfileByAddressRequest) -> squeak_admin_pb2.GetSqueakProfileByAddressReply:
         address = request.address
-        logger.info(
-            "Handle get squeak profile with address: {}".format(address))
+        logger.info("Handle get squeak profile with address: %s", address)
         squeak_profile = self.squeak_controller.get_squeak_profile_by_address(
             address)
         if squeak_profile is None:
-            return squeak_admin_pb2.GetSqueakProfileByAddressReply(
-                squeak_profile=None
-            )
+            return EMPTY_GET_SQUEAK_PROFILE_BY_ADDRESS_REPLY
         squeak_profile_msg = squeak_profile_to_message(squeak_profile)
         return squeak_admin_pb2.GetSqueakProfileByAddressReply(
             squeak_profile=squeak_profile_msg
         )
 
-    def handle_get_squeak_profile_by_name(self, request):
+    def handle_get_squeak_profile_by_name(self, request: squeak_admin_pb2.GetSqueakProfileByNameRequest) -> squeak_admin_pb2.GetSqueakProfileByNameReply:
         name = request.name
-        logger.info("Handle get squeak profile with name: {}".format(name))
+        logger.info("Handle get squeak profile with name: %s", name)
         squeak_profile = self.squeak_controller.get_squeak_profile_by_name(
             name)
         if squeak_profile is None:
-            return squeak_admin_pb2.GetSqueakProfileByNameReply(
-                squeak_profile=None
-            )
+            return EMPTY_GET_SQUEAK_PROFILE_BY_NAME_REPLY
         squeak_profile_msg = squeak_profile_to_message(squeak_profile)
         return squeak_admin_pb2.GetSqueakProfileByNameReply(
             squeak_profile=squeak_profile_msg
         )
 
-    def handle_set_squeak_profile_following(self, request):
+    def handle_set_squeak_profile_following(self, request: squeak_admin_pb2.SetSqueakProfileFollowingRequest) -> squeak_admin_pb2.SetSqueakProfileFollowingReply:
         profile_id = request.profile_id
         following = request.following
         logger.info(
-            "Handle set squeak profile following with profile id: {}, following: {}".format(
-                profile_id,
-                following,
-            )
+            "Handle set squeak profile following with profile id: %s, following: %s",
+            profile_id,
+            following,
         )
         self.squeak_controller.set_squeak_profile_following(
             profile_id, following)
-        return squeak_admin_pb2.SetSqueakProfileFollowingReply()
+        return SET_SQUEAK_PROFILE_FOLLOWING_REPLY
 
-    def handle_set_squeak_profile_use_custom_price(self, request):
+    def handle_set_squeak_profile_use_custom_price(self, request: squeak_admin_pb2.SetSqueakProfileUseCustomPriceRequest) -> squeak_admin_pb2.SetSqueakProfileUseCustomPriceReply:
         profile_id = request.profile_id
         use_custom_price = request.use_custom_price
         logger.info(
-            "Handle set squeak profile use_custom_price with profile id: {}, use_custom_price: {}".format(
-                profile_id,
-                use_custom_price,
-            )
+            "Handle set squeak profile use_custom_price with profile id: %s, use_custom_price: %s",
+            profile_id,
+            use_custom_price,
         )
         self.squeak_controller.set_squeak_profile_use_custom_price(
             profile_id, use_custom_price)
-        return squeak_admin_pb2.SetSqueakProfileUseCustomPriceReply()
+        return SET_SQUEAK_PROFILE_USE_CUSTOM_PRICE_REPLY
 
-    def handle_set_squeak_profile_custom_price(self, request):
+    def handle_set_squeak_profile_custom_price(self, request: squeak_admin_pb2.SetSqueakProfileCustomPriceRequest) -> squeak_admin_pb2.SetSqueakProfileCustomPriceReply:
         profile_id = request.profile_id
         custom_price_msat = request.custom_price_msat
         logger.info(
-            "Handle set squeak profile custom price with profile id: {}, custom_price_msat: {}".format(
-                profile_id,
-                custom_price_msat,
-            )
+            "Handle set squeak profile custom price with profile id: %s, custom_price_msat: %s",
+            profile_id,
+            custom_price_msat,
         )
         self.squeak_controller.set_squeak_profile_custom_price(
             profile_id, custom_price_msat)
-        return squeak_admin_pb2.SetSqueakProfileCustomPriceReply()
+        return SET_SQUEAK_PROFILE_CUSTOM_PRICE_REPLY
 
-    def handle_rename_squeak_profile(self, request):
+    def handle_rename_squeak_profile(self, request: squeak_admin_pb2.RenameSqueakProfileRequest) -> squeak_admin_pb2.RenameSqueakProfileReply:
         profile_id = request.profile_id
         profile_name = request.profile_name
         logger.info(
-            "Handle rename squeak profile with profile id: {}, new name: {}".format(
-                profile_id,
-                profile_name,
-            )
+            "Handle rename squeak profile with profile id: %s, new name: %s",
+            profile_id,
+            profile_name,
         )
         self.squeak_controller.rename_squeak_profile(profile_id, profile_name)
-        return squeak_admin_pb2.RenameSqueakProfileReply()
+        return RENAME_SQUEAK_PROFILE_REPLY
 
-    def handle_delete_squeak_profile(self, request):
+    def handle_delete_squeak_profile(self, request: squeak_admin_pb2.DeleteSqueakProfileRequest) -> squeak_admin_pb2.DeleteSqueakProfileReply:
         profile_id = request.profile_id
-        logger.info(
-            "Handle delete squeak profile with id: {}".format(profile_id))
+        logger.info("Handle delete squeak profile with id: %s", profile_id)
         self.squeak_controller.delete_squeak_profile(profile_id)
-        return squeak_admin_pb2.DeleteSqueakProfileReply()
+        return DELETE_SQUEAK_PROFILE_REPLY
 
-    def handle_set_squeak_profile_image(self, request):
+    def handle_set_squeak_profile_image(self, request: squeak_admin_pb2.SetSqueakProfileImageRequest) -> squeak_admin_pb2.SetSqueakProfileImageReply:
         profile_id = request.profile_id
-        profile_image = request.profile_image
         logger.info(
-            "Handle set squeak profile image with profile id: {}".format(
-                profile_id,
-            )
-        )
-        profile_image_bytes = base64_string_to_bytes(profile_image)
+            "Handle set squeak profile image with profile id: %s", profile_id)
+        if request.WhichOneof("image") == "profile_image_bytes":
+            profile_image_bytes = request.profile_image_bytes
+        else:
+            profile_image_bytes = base64_string_to_bytes(request.profile_image)
         self.squeak_controller.set_squeak_profile_image(
             profile_id, profile_image_bytes)
-        return squeak_admin_pb2.SetSqueakProfileImageReply()
+        return SET_SQUEAK_PROFILE_IMAGE_REPLY
 
-    def handle_clear_squeak_profile_image(self, request):
+    def handle_clear_squeak_profile_image(self, request: squeak_admin_pb2.ClearSqueakProfileImageRequest) -> squeak_admin_pb2.ClearSqueakProfileImageReply:
         profile_id = request.profile_id
         logger.info(
-            "Handle clear squeak profile image with profile id: {}".format(
-                profile_id,
-            )
+            "Handle clear squeak profile image with profile id: %s",
+            profile_id,
         )
         self.squeak_controller.clear_squeak_profile_image(
             profile_id,
         )
-        return squeak_admin_pb2.ClearSqueakProfileImageReply()
+        return CLEAR_SQUEAK_PROFILE_IMAGE_REPLY
 
-    def handle_get_squeak_profile_private_key(self, request):
+    def handle_get_squeak_profile_private_key(self, request: squeak_admin_pb2.GetSqueakProfilePrivateKeyRequest) -> squeak_admin_pb2.GetSqueakProfilePrivateKeyReply:
         profile_id = request.profile_id
         logger.info(
-            "Handle get squeak profile private key for id: {}".format(profile_id))
+            "Handle get squeak profile private key for id: %s", profile_id)
         private_key = self.squeak_controller.get_squeak_profile_private_key(
             profile_id)
         return squeak_admin_pb2.GetSqueakProfilePrivateKeyReply(
-            private_key=private_key
+            private_key=private_key.decode(),
         )
 
-    def handle_make_squeak(self, request):
+    def handle_make_squeak(self, request: squeak_admin_pb2.MakeSqueakRequest) -> squeak_admin_pb2.MakeSqueakReply:
         profile_id = request.profile_id
         content_str = request.content
         replyto_hash_str = request.replyto
-        replyto_hash = bytes.fromhex(
+        replyto_hash = message_to_squeak_hash(
             replyto_hash_str) if replyto_hash_str else None
-        logger.info("Handle make squeak profile with id: {}".format(profile_id))
+        logger.info("Handle make squeak profile with id: %s", profile_id)
         inserted_squeak_hash = self.squeak_controller.make_squeak(
             profile_id, content_str, replyto_hash
         )
         if inserted_squeak_hash is None:
-            return squeak_admin_pb2.MakeSqueakReply(
-                squeak_hash=None,
-            )
+            return EMPTY_MAKE_SQUEAK_REPLY
         return squeak_admin_pb2.MakeSqueakReply(
             squeak_hash=inserted_squeak_hash.hex(),
         )
 
-    def handle_get_squeak_display_entry(self, request):
+    def handle_make_squeaks(self, request: squeak_admin_pb2.MakeSqueaksRequest) -> squeak_admin_pb2.MakeSqueaksReply:
+        logger.info(
+            "Handle make squeaks with number of squeaks: %s",
+            len(request.squeaks),
+        )
+        inserted_squeak_hashes = self.squeak_controller.make_squeaks(
+            (
+                squeak.profile_id,
+                squeak.content,
+                message_to_squeak_hash(squeak.replyto) if squeak.replyto else None,
+            )
+            for squeak in request.squeaks
+        )
+        reply = squeak_admin_pb2.MakeSqueaksReply()
+        reply.squeak_hashes.extend(
+            squeak_hash.hex() if squeak_hash is not None else ""
+            for squeak_hash in inserted_squeak_hashes
+        )
+        return reply
+
+    def handle_get_squeak_display_entry(self, request: squeak_admin_pb2.GetSqueakDisplayRequest) -> squeak_admin_pb2.GetSqueakDisplayReply:
         squeak_hash_str = request.squeak_hash
-        squeak_hash = bytes.fromhex(squeak_hash_str)
+        squeak_hash = message_to_squeak_hash(squeak_hash_str)
         logger.info(
-            "Handle get squeak display entry for hash: {}".format(squeak_hash_str))
+            "Handle get squeak display entry for hash: %s", squeak_hash_str)
         squeak_entry = (
             self.squeak_controller.get_squeak_entry(
                 squeak_hash
             )
         )
         if squeak_entry is None:
-            return squeak_admin_pb2.GetSqueakDisplayReply(
-                squeak_display_entry=None
-            )
-        display_message = squeak_entry_to_message(
-            squeak_entry)
-        return squeak_admin_pb2.GetSqueakDisplayReply(
-            squeak_display_entry=display_message
-        )
+            return EMPTY_GET_SQUEAK_DISPLAY_REPLY
+        return squeak_entry_to_display_reply(squeak_entry)
 
-    def handle_get_timeline_squeak_display_entries(self, request):
+    def _get_timeline_squeak_entries(self, request):
         limit = request.limit
-        last_entry = message_to_squeak_entry(request.last_entry) if request.HasField(
-            "last_entry") else None
-        logger.info("""Handle get timeline squeak display entries with
-        limit: {}
-        last_entry: {}
-        """.format(
+        last_entry = optional_field_to_value(
+            request, "last_entry", message_to_squeak_entry)
+        logger.info(
+            """Handle get timeline squeak display entries with
+        limit: %s
+        last_entry: %s
+        """,
             limit,
             last_entry,
-        ))
+        )
         squeak_entries = (
             self.squeak_controller.get_timeline_squeak_entries(
                 limit,
@@ -362,30 +422,36 @@ class SqueakAdminServerHandler(object):
             )
         )
         logger.info(
-            "Got number of timeline squeak entries: {}".format(
-                len(squeak_entries)
-            )
-        )
-        squeak_display_msgs = [
-            squeak_entry_to_message(entry) for entry in squeak_entries
-        ]
-        return squeak_admin_pb2.GetTimelineSqueakDisplaysReply(
-            squeak_display_entries=squeak_display_msgs
+            "Got number of timeline squeak entries: %s", len(squeak_entries))
+        return squeak_entries
+
+    def handle_get_timeline_squeak_display_entries(self, request: squeak_admin_pb2.GetTimelineSqueakDisplaysRequest) -> squeak_admin_pb2.GetTimelineSqueakDisplaysReply:
+        squeak_entries = self._get_timeline_squeak_entries(request)
+        reply = squeak_admin_pb2.GetTimelineSqueakDisplaysReply()
+        squeak_entries_to_message(
+            squeak_entries,
+            reply.squeak_display_entries,
         )
+        return reply
+
+    def handle_stream_timeline_squeak_display_entries(self, request: squeak_admin_pb2.GetTimelineSqueakDisplaysRequest) -> Iterable[squeak_admin_pb2.SqueakDisplayEntry]:
+        squeak_entries = self._get_timeline_squeak_entries(request)
+        yield from map(squeak_entry_to_message, squeak_entries)
 
-    def handle_get_squeak_display_entries_for_address(self, request):
+    def _get_squeak_entries_for_address(self, request):
         address = request.address
         limit = request.limit
-        last_entry = message_to_squeak_entry(request.last_entry) if request.HasField(
-            "last_entry") else None
-        logger.info("""Handle get squeak display entries for address: {} with
-        limit: {}
-        last_entry: {}
-        """.format(
+        last_entry = optional_field_to_value(
+            request, "last_entry", message_to_squeak_entry)
+        logger.info(
+            """Handle get squeak display entries for address: %s with
+        limit: %s
+        last_entry: %s
+        """,
             address,
             limit,
             last_entry,
-        ))
+        )
         squeak_entries = (
             self.squeak_controller.get_squeak_entries_for_address(
                 address,
@@ -394,30 +460,38 @@ class SqueakAdminServerHandler(object):
             )
         )
         logger.info(
-            "Got number of squeak entries for address: {}".format(
-                len(squeak_entries)
-            )
+            "Got number of squeak entries for address: %s",
+            len(squeak_entries),
         )
-        squeak_display_msgs = [
-            squeak_entry_to_message(entry) for entry in squeak_entries
-        ]
-        return squeak_admin_pb2.GetAddressSqueakDisplaysReply(
-            squeak_display_entries=squeak_display_msgs
+        return squeak_entries
+
+    def handle_get_squeak_display_entries_for_address(self, request: squeak_admin_pb2.GetAddressSqueakDisplaysRequest) -> squeak_admin_pb2.GetAddressSqueakDisplaysReply:
+        squeak_entries = self._get_squeak_entries_for_address(request)
+        reply = squeak_admin_pb2.GetAddressSqueakDisplaysReply()
+        squeak_entries_to_message(
+            squeak_entries,
+            reply.squeak_display_entries,
         )
+        return reply
+
+    def handle_stream_squeak_display_entries_for_address(self, request: squeak_admin_pb2.GetAddressSqueakDisplaysRequest) -> Iterable[squeak_admin_pb2.SqueakDisplayEntry]:
+        squeak_entries = self._get_squeak_entries_for_address(request)
+        yield from map(squeak_entry_to_message, squeak_entries)
 
-    def handle_get_squeak_display_entries_for_text_search(self, request):
+    def _get_squeak_entries_for_text_search(self, request):
         search_text = request.search_text
         limit = request.limit
-        last_entry = message_to_squeak_entry(request.last_entry) if request.HasField(
-            "last_entry") else None
-        logger.info("""Handle get squeak display entries for search_text: {} with
-        limit: {}
-        last_entry: {}
-        """.format(
+        last_entry = optional_field_to_value(
+            request, "last_entry", message_to_squeak_entry)
+        logger.info(
+            """Handle get squeak display entries for search_text: %s with
+        limit: %s
+        last_entry: %s
+        """,
             search_text,
             limit,
             last_entry,
-        ))
+        )
         squeak_entries = (
             self.squeak_controller.get_squeak_entries_for_text_search(
                 search_text,
@@ -426,24 +500,30 @@ class SqueakAdminServerHandler(object):
             )
         )
         logger.info(
-            "Got number of squeak entries for text search: {}".format(
-                len(squeak_entries)
-            )
+            "Got number of squeak entries for text search: %s",
+            len(squeak_entries),
         )
-        squeak_display_msgs = [
-            squeak_entry_to_message(entry) for entry in squeak_entries
-        ]
-        return squeak_admin_pb2.GetAddressSqueakDisplaysReply(
-            squeak_display_entries=squeak_display_msgs
+        return squeak_entries
+
+    def handle_get_squeak_display_entries_for_text_search(self, request: squeak_admin_pb2.GetSearchSqueakDisplaysRequest) -> squeak_admin_pb2.GetSearchSqueakDisplaysReply:
+        squeak_entries = self._get_squeak_entries_for_text_search(request)
+        reply = squeak_admin_pb2.GetSearchSqueakDisplaysReply()
+        squeak_entries_to_message(
+            squeak_entries,
+            reply.squeak_display_entries,
         )
+        return reply
+
+    def handle_stream_squeak_display_entries_for_text_search(self, request: squeak_admin_pb2.GetSearchSqueakDisplaysRequest) -> Iterable[squeak_admin_pb2.SqueakDisplayEntry]:
+        squeak_entries = self._get_squeak_entries_for_text_search(request)
+        yield from map(squeak_entry_to_message, squeak_entries)
 
-    def handle_get_ancestor_squeak_display_entries(self, request):
+    def _get_ancestor_squeak_entries(self, request):
         squeak_hash_str = request.squeak_hash
-        squeak_hash = bytes.fromhex(squeak_hash_str)
+        squeak_hash = message_to_squeak_hash(squeak_hash_str)
         logger.info(
-            "Handle get ancestor squeak display entries for squeak hash: {}".format(
-                squeak_hash_str
-            )
+            "Handle get ancestor squeak display entries for squeak hash: %s",
+            squeak_hash_str,
         )
         squeak_entries = (
             self.squeak_controller.get_ancestor_squeak_entries(
@@ -451,31 +531,37 @@ class SqueakAdminServerHandler(object):
             )
         )
         logger.info(
-            "Got number of ancestor squeak entries: {}".format(
-                len(squeak_entries)
-            )
-        )
-        squeak_display_msgs = [
-            squeak_entry_to_message(entry) for entry in squeak_entries
-        ]
-        return squeak_admin_pb2.GetAncestorSqueakDisplaysReply(
-            squeak_display_entries=squeak_display_msgs
+            "Got number of ancestor squeak entries: %s", len(squeak_entries))
+        return squeak_entries
+
+    def handle_get_ancestor_squeak_display_entries(self, request: squeak_admin_pb2.GetAncestorSqueakDisplaysRequest) -> squeak_admin_pb2.GetAncestorSqueakDisplaysReply:
+        squeak_entries = self._get_ancestor_squeak_entries(request)
+        reply = squeak_admin_pb2.GetAncestorSqueakDisplaysReply()
+        squeak_entries_to_message(
+            squeak_entries,
+            reply.squeak_display_entries,
         )
+        return reply
 
-    def handle_get_reply_squeak_display_entries(self, request):
+    def handle_stream_ancestor_squeak_display_entries(self, request: squeak_admin_pb2.GetAncestorSqueakDisplaysRequest) -> Iterable[squeak_admin_pb2.SqueakDisplayEntry]:
+        squeak_entries = self._get_ancestor_squeak_entries(request)
+        yield from map(squeak_entry_to_message, squeak_entries)
+
+    def handle_get_reply_squeak_display_entries(self, request: squeak_admin_pb2.GetReplySqueakDisplaysRequest) -> squeak_admin_pb2.GetReplySqueakDisplaysReply:
         squeak_hash_str = request.squeak_hash
-        squeak_hash = bytes.fromhex(squeak_hash_str)
+        squeak_hash = message_to_squeak_hash(squeak_hash_str)
         limit = request.limit
-        last_entry = message_to_squeak_entry(request.last_entry) if request.HasField(
-            "last_entry") else None
-        logger.info("""Handle get reply squeak display entries for squeak hash: {} with
-        limit: {}
-        last_entry: {}
-        """.format(
+        last_entry = optional_field_to_value(
+            request, "last_entry", message_to_squeak_entry)
+        logger.info(
+            """Handle get reply squeak display entries for squeak hash: %s with
+        limit: %s
+        last_entry: %s
+        """,
             squeak_hash_str,
             limit,
             last_entry,
-        ))
+        )
         squeak_entries = (
             self.squeak_controller.get_reply_squeak_entries(
                 squeak_hash,
@@ -484,35 +570,29 @@ class SqueakAdminServerHandler(object):
             )
         )
         logger.info(
-            "Got number of reply squeak entries: {}".format(
-                len(squeak_entries)
-            )
-        )
-        squeak_display_msgs = [
-            squeak_entry_to_message(entry) for entry in squeak_entries
-        ]
-        return squeak_admin_pb2.GetReplySqueakDisplaysReply(
-            squeak_display_entries=squeak_display_msgs
+            "Got number of reply squeak entries: %s", len(squeak_entries))
+        reply = squeak_admin_pb2.GetReplySqueakDisplaysReply()
+        squeak_entries_to_message(
+            squeak_entries,
+            reply.squeak_display_entries,
         )
+        return reply
 
-    def handle_delete_squeak(self, request):
+    def handle_delete_squeak(self, request: squeak_admin_pb2.DeleteSqueakRequest) -> squeak_admin_pb2.DeleteSqueakReply:
         squeak_hash_str = request.squeak_hash
-        squeak_hash = bytes.fromhex(squeak_hash_str)
-        logger.info(
-            "Handle delete squeak with hash: {}".format(squeak_hash_str))
+        squeak_hash = message_to_squeak_hash(squeak_hash_str)
+        logger.info("Handle delete squeak with hash: %s", squeak_hash_str)
         self.squeak_controller.delete_squeak(squeak_hash)
-        logger.info(
-            "Deleted squeak entry with hash: {}".format(squeak_hash_str))
-        return squeak_admin_pb2.DeleteSqueakReply()
+        logger.info("Deleted squeak entry with hash: %s", squeak_hash_str)
+        return DELETE_SQUEAK_REPLY
 
-    def handle_create_peer(self, request):
+    def handle_create_peer(self, request: squeak_admin_pb2.CreatePeerRequest) -> squeak_admin_pb2.CreatePeerReply:
         peer_name = request.peer_name
         peer_address = message_to_peer_address(request.peer_address)
         logger.info(
-            "Handle create peer with name: {}, address: {}".format(
-                peer_name,
-                peer_address,
-            )
+            "Handle create peer with name: %s, address: %s",
+            peer_name,
+            peer_address,
         )
         peer_id = self.squeak_controller.create_peer(
             peer_name,
@@ -522,422 +602,396 @@ class SqueakAdminServerHandler(object):
             peer_id=peer_id,
         )
 
-    def handle_get_squeak_peer(self, request):
+    def handle_get_squeak_peer(self, request: squeak_admin_pb2.GetPeerRequest) -> squeak_admin_pb2.GetPeerReply:
         peer_id = request.peer_id
-        logger.info("Handle get squeak peer with id: {}".format(peer_id))
+        logger.info("Handle get squeak peer with id: %s", peer_id)
         squeak_peer = self.squeak_controller.get_peer(peer_id)
-        logger.info("Got squeak peer: {}".format(squeak_peer))
+        logger.info("Got squeak peer: %s", squeak_peer)
         if squeak_peer is None:
-            return squeak_admin_pb2.GetPeerReply(
-                squeak_peer=None,
-            )
+            return EMPTY_GET_PEER_REPLY
         squeak_peer_msg = squeak_peer_to_message(squeak_peer)
         return squeak_admin_pb2.GetPeerReply(
             squeak_peer=squeak_peer_msg,
         )
 
-    def handle_get_squeak_peer_by_address(self, request):
-        peer_address = message_to_peer_address(request.peer_address)
-        logger.info(
-            "Handle get squeak peer with address: {}".format(peer_address))
-        squeak_peer = self.squeak_controller.get_peer_by_address(peer_address)
+    def handle_get_squeak_peer_by_address(self, request: squeak_admin_pb2.GetPeerByAddressRequest) -> squeak_admin_pb2.GetPeerByAddressReply:
+        host = request.peer_address.host
+        port = request.peer_address.port
+        logger.info("Handle get squeak peer with host: %s, port: %s", host, port)
+        squeak_peer = self.squeak_controller.get_peer_by_host_port(host, port)
         if squeak_peer is None:
-            return squeak_admin_pb2.GetPeerReply(
-                squeak_peer=None,
-            )
+            return EMPTY_GET_PEER_BY_ADDRESS_REPLY
         squeak_peer_msg = squeak_peer_to_message(squeak_peer)
         return squeak_admin_pb2.GetPeerByAddressReply(
             squeak_peer=squeak_peer_msg,
         )
 
-    def handle_get_squeak_peers(self, request):
+    def handle_get_squeak_peers(self, request: squeak_admin_pb2.GetPeersRequest) -> squeak_admin_pb2.GetPeersReply:
         logger.info("Handle get squeak peers")
         squeak_peers = self.squeak_controller.get_peers()
-        squeak_peer_msgs = [
-            squeak_peer_to_message(squeak_peer)
-            for squeak_peer in squeak_peers
-        ]
-        return squeak_admin_pb2.GetPeersReply(
-            squeak_peers=squeak_peer_msgs,
+        reply = squeak_admin_pb2.GetPeersReply()
+        reply.squeak_peers.extend(
+            map(squeak_peer_to_message, squeak_peers)
         )
+        return reply
 
-    def handle_rename_squeak_peer(self, request):
+    def handle_rename_squeak_peer(self, request: squeak_admin_pb2.RenamePeerRequest) -> squeak_admin_pb2.RenamePeerReply:
         peer_id = request.peer_id
         peer_name = request.peer_name
         logger.info(
-            "Handle rename peer with peer id: {}, new name: {}".format(
-                peer_id,
-                peer_name,
-            )
+            "Handle rename peer with peer id: %s, new name: %s",
+            peer_id,
+            peer_name,
         )
         self.squeak_controller.rename_peer(peer_id, peer_name)
-        return squeak_admin_pb2.RenamePeerReply()
+        return RENAME_PEER_REPLY
 
-    def handle_set_squeak_peer_autoconnect(self, request):
+    def handle_set_squeak_peer_autoconnect(self, request: squeak_admin_pb2.SetPeerAutoconnectRequest) -> squeak_admin_pb2.SetPeerAutoconnectReply:
         peer_id = request.peer_id
         autoconnect = request.autoconnect
         logger.info(
-            "Handle set peer autoconnect with peer id: {}, autoconnect: {}".format(
-                peer_id,
-                autoconnect,
-            )
+            "Handle set peer autoconnect with peer id: %s, autoconnect: %s",
+            peer_id,
+            autoconnect,
         )
         self.squeak_controller.set_peer_autoconnect(peer_id, autoconnect)
-        return squeak_admin_pb2.SetPeerAutoconnectReply()
+        return SET_PEER_AUTOCONNECT_REPLY
 
-    def handle_delete_squeak_peer(self, request):
+    def handle_delete_squeak_peer(self, request: squeak_admin_pb2.DeletePeerRequest) -> squeak_admin_pb2.DeletePeerReply:
         peer_id = request.peer_id
-        logger.info("Handle delete squeak peer with id: {}".format(peer_id))
+        logger.info("Handle delete squeak peer with id: %s", peer_id)
         self.squeak_controller.delete_peer(peer_id)
-        return squeak_admin_pb2.DeletePeerReply()
+        return DELETE_PEER_REPLY
 
-    def handle_get_buy_offers(self, request):
+    def handle_get_buy_offers(self, request: squeak_admin_pb2.GetBuyOffersRequest) -> squeak_admin_pb2.GetBuyOffersReply:
         squeak_hash_str = request.squeak_hash
-        squeak_hash = bytes.fromhex(squeak_hash_str)
-        logger.info(
-            "Handle get received offers for hash: {}".format(squeak_hash_str))
+        squeak_hash = message_to_squeak_hash(squeak_hash_str)
+        logger.info("Handle get received offers for hash: %s", squeak_hash_str)
         offers = self.squeak_controller.get_received_offers(
             squeak_hash)
-        offer_msgs = [offer_entry_to_message(offer) for offer in offers]
-        return squeak_admin_pb2.GetBuyOffersReply(
-            offers=offer_msgs,
+        reply = squeak_admin_pb2.GetBuyOffersReply()
+        reply.offers.extend(
+            map(offer_entry_to_message, offers)
         )
+        return reply
 
-    def handle_get_buy_offer(self, request):
+    def handle_get_buy_offer(self, request: squeak_admin_pb2.GetBuyOfferRequest) -> squeak_admin_pb2.GetBuyOfferReply:
         offer_id = request.offer_id
-        logger.info("Handle get buy offer for hash: {}".format(offer_id))
+        logger.info("Handle get buy offer for hash: %s", offer_id)
         offer = self.squeak_controller.get_received_offer(offer_id)
         if offer is None:
-            return squeak_admin_pb2.GetBuyOfferReply(
-                offer=None,
-            )
+            return EMPTY_GET_BUY_OFFER_REPLY
         offer_msg = offer_entry_to_message(offer)
         return squeak_admin_pb2.GetBuyOfferReply(
             offer=offer_msg,
         )
 
-    def handle_download_squeaks(self, request):
+    def handle_download_squeaks(self, request: squeak_admin_pb2.DownloadSqueaksRequest) -> squeak_admin_pb2.DownloadSqueaksReply:
         addresses = request.addreses
         min_block = request.min_block_height
         max_block = request.max_block_height
-        replyto_hash = request.replyto_squeak_hash
-        logger.info("""Handle download squeaks for
-        addreses: {}
-        min_block: {}
-        max_block: {}
-        replyto_hash: {}
-        """.format(
+        replyto_hash_str = request.replyto_squeak_hash
+        replyto_hash = message_to_squeak_hash(
+            replyto_hash_str) if replyto_hash_str else None
+        logger.info(
+            """Handle download squeaks for
+        addreses: %s
+        min_block: %s
+        max_block: %s
+        replyto_hash: %s
+        """,
             addresses,
             min_block,
             max_block,
-            replyto_hash,
-        ))
+            replyto_hash_str,
+        )
         self.squeak_controller.download_squeaks(
             addresses,
             min_block,
             max_block,
             replyto_hash,
         )
-        return squeak_admin_pb2.DownloadSqueaksReply()
+        return DOWNLOAD_SQUEAKS_REPLY
 
-    def handle_download_squeak(self, request):
+    def handle_download_squeak(self, request: squeak_admin_pb2.DownloadSqueakRequest) -> squeak_admin_pb2.DownloadSqueakReply:
         squeak_hash_str = request.squeak_hash
-        squeak_hash = bytes.fromhex(squeak_hash_str)
-        logger.info(
-            "Handle download squeak with hash: {}".format(squeak_hash_str))
+        squeak_hash = message_to_squeak_hash(squeak_hash_str)
+        logger.info("Handle download squeak with hash: %s", squeak_hash_str)
         self.squeak_controller.download_single_squeak(squeak_hash)
-        return squeak_admin_pb2.DownloadSqueakReply()
+        return DOWNLOAD_SQUEAK_REPLY
 
-    def handle_download_offers(self, request):
+    def handle_download_offers(self, request: squeak_admin_pb2.DownloadOffersRequest) -> squeak_admin_pb2.DownloadOffersReply:
         squeak_hash_str = request.squeak_hash
-        squeak_hash = bytes.fromhex(squeak_hash_str)
-        logger.info(
-            "Handle download offer for hash: {}".format(squeak_hash_str))
+        squeak_hash = message_to_squeak_hash(squeak_hash_str)
+        logger.info("Handle download offer for hash: %s", squeak_hash_str)
         self.squeak_controller.download_offers(squeak_hash)
-        return squeak_admin_pb2.DownloadOffersReply()
+        return DOWNLOAD_OFFERS_REPLY
 
-    def handle_download_replies(self, request):
+    def handle_download_replies(self, request: squeak_admin_pb2.DownloadRepliesRequest) -> squeak_admin_pb2.DownloadRepliesReply:
         squeak_hash_str = request.squeak_hash
-        squeak_hash = bytes.fromhex(squeak_hash_str)
-        logger.info(
-            "Handle download replies for hash: {}".format(squeak_hash_str))
+        squeak_hash = message_to_squeak_hash(squeak_hash_str)
+        logger.info("Handle download replies for hash: %s", squeak_hash_str)
         self.squeak_controller.download_replies(squeak_hash)
-        return squeak_admin_pb2.DownloadRepliesReply()
+        return DOWNLOAD_REPLIES_REPLY
 
-    def handle_download_address_squeaks(self, request):
+    def handle_download_address_squeaks(self, request: squeak_admin_pb2.DownloadAddressSqueaksRequest) -> squeak_admin_pb2.DownloadAddressSqueaksReply:
         squeak_address = request.address
         logger.info(
-            "Handle download address squeaks for address: {}".format(squeak_address))
+            "Handle download address squeaks for address: %s", squeak_address)
         self.squeak_controller.download_address_squeaks(squeak_address)
-        return squeak_admin_pb2.DownloadAddressSqueaksReply()
+        return DOWNLOAD_ADDRESS_SQUEAKS_REPLY
 
-    def handle_pay_offer(self, request):
+    def handle_pay_offer(self, request: squeak_admin_pb2.PayOfferRequest) -> squeak_admin_pb2.PayOfferReply:
         offer_id = request.offer_id
-        logger.info("Handle pay offer for offer id: {}".format(offer_id))
+        logger.info("Handle pay offer for offer id: %s", offer_id)
         sent_payment_id = self.squeak_controller.pay_offer(offer_id)
         return squeak_admin_pb2.PayOfferReply(
             sent_payment_id=sent_payment_id,
         )
 
-    def handle_get_sent_payments(self, request):
+    def handle_get_sent_payments(self, request: squeak_admin_pb2.GetSentPaymentsRequest) -> squeak_admin_pb2.GetSentPaymentsReply:
         limit = request.limit
-        last_sent_payment = message_to_sent_payment(request.last_sent_payment) if request.HasField(
-            "last_sent_payment") else None
-        logger.info("""Handle get sent payments with
-        limit: {}
-        last_sent_payment: {}
-        """.format(
+        last_sent_payment = optional_field_to_value(
+            request, "last_sent_payment", message_to_sent_payment)
+        logger.info(
+            """Handle get sent payments with
+        limit: %s
+        last_sent_payment: %s
+        """,
             limit,
             last_sent_payment,
-        ))
+        )
         sent_payments = self.squeak_controller.get_sent_payments(
             limit,
             last_sent_payment,
         )
-        logger.info(
-            "Got number of sent payments: {}".format(
-                len(sent_payments)
-            )
-        )
-        sent_payment_msgs = [
-            sent_payment_to_message(sent_payment)
-            for sent_payment in sent_payments
-        ]
-        return squeak_admin_pb2.GetSentPaymentsReply(
-            sent_payments=sent_payment_msgs,
+        logger.info("Got number of sent payments: %s", len(sent_payments))
+        reply = squeak_admin_pb2.GetSentPaymentsReply()
+        reply.sent_payments.extend(
+            map(sent_payment_to_message, sent_payments)
         )
+        return reply
 
-    def handle_get_sent_payment(self, request):
+    def handle_get_sent_payment(self, request: squeak_admin_pb2.GetSentPaymentRequest) -> squeak_admin_pb2.GetSentPaymentReply:
         sent_payment_id = request.sent_payment_id
-        logger.info(
-            "Handle get sent payment with id: {}".format(sent_payment_id))
+        logger.info("Handle get sent payment with id: %s", sent_payment_id)
         sent_payment = self.squeak_controller.get_sent_payment(sent_payment_id)
         if sent_payment is None:
-            return squeak_admin_pb2.GetSentPaymentReply(
-                sent_payment=None,
-            )
+            return EMPTY_GET_SENT_PAYMENT_REPLY
         sent_payment_msg = sent_payment_to_message(sent_payment)
         return squeak_admin_pb2.GetSentPaymentReply(
             sent_payment=sent_payment_msg,
         )
 
-    def handle_get_squeak_details(self, request: squeak_admin_pb2.GetSqueakDetailsRequest):
+    def handle_get_squeak_details(self, request: squeak_admin_pb2.GetSqueakDetailsRequest) -> squeak_admin_pb2.GetSqueakDetailsReply:
         squeak_hash_str = request.squeak_hash
-        squeak_hash = bytes.fromhex(squeak_hash_str)
-        logger.info(
-            "Handle get squeak details for hash: {}".format(squeak_hash_str))
+        squeak_hash = message_to_squeak_hash(squeak_hash_str)
+        logger.info("Handle get squeak details for hash: %s", squeak_hash_str)
         squeak = (
             self.squeak_controller.get_squeak(
                 squeak_hash
             )
         )
         if squeak is None:
-            return squeak_admin_pb2.GetSqueakDetailsReply(
-                squeak_detail_entry=None
-            )
+            return EMPTY_GET_SQUEAK_DETAILS_REPLY
         detail_message = squeak_to_detail_message(squeak)
         return squeak_admin_pb2.GetSqueakDetailsReply(
             squeak_detail_entry=detail_message
         )
 
-    def handle_get_sent_offers(self, request):
+    def handle_get_sent_offers(self, request: squeak_admin_pb2.GetSentOffersRequest) -> squeak_admin_pb2.GetSentOffersReply:
         logger.info("Handle get sent offers")
         sent_offers = self.squeak_controller.get_sent_offers()
-        sent_offer_msgs = [
-            sent_offer_to_message(sent_offer) for sent_offer in sent_offers
-        ]
-        return squeak_admin_pb2.GetSentOffersReply(
-            sent_offers=sent_offer_msgs,
+        reply = squeak_admin_pb2.GetSentOffersReply()
+        reply.sent_offers.extend(
+            map(sent_offer_to_message, sent_offers)
         )
+        return reply
 
-    def handle_get_received_payments(self, request):
+    def _get_received_payments(self, request):
         limit = request.limit
-        last_received_payment = message_to_received_payment(request.last_received_payment) if request.HasField(
-            "last_received_payment") else None
-        logger.info("""Handle get received payments with
-        limit: {}
-        last_received_payment: {}
-        """.format(
+        last_received_payment = optional_field_to_value(
+            request, "last_received_payment", message_to_received_payment)
+        logger.info(
+            """Handle get received payments with
+        limit: %s
+        last_received_payment: %s
+        """,
             limit,
             last_received_payment,
-        ))
-        received_payments = self.squeak_controller.get_received_payments(
+        )
+        return self.squeak_controller.get_received_payments(
             limit,
             last_received_payment,
         )
-        logger.info(
-            "Got number of received payments: {}".format(
-                len(received_payments)
-            )
+
+    def handle_get_received_payments(self, request: squeak_admin_pb2.GetReceivedPaymentsRequest) -> squeak_admin_pb2.GetReceivedPaymentsReply:
+        received_payments = self._get_received_payments(request)
+        reply = squeak_admin_pb2.GetReceivedPaymentsReply()
+        reply.received_payments.extend(
+            map(received_payments_to_message, received_payments)
         )
-        received_payment_msgs = [
-            received_payments_to_message(received_payment)
-            for received_payment in received_payments
-        ]
-        return squeak_admin_pb2.GetReceivedPaymentsReply(
-            received_payments=received_payment_msgs,
+        logger.debug(
+            "Got number of received payments: %s",
+            len(reply.received_payments),
         )
+        return reply
 
-    def handle_subscribe_received_payments(self, request, stopped):
+    def handle_stream_received_payments(self, request: squeak_admin_pb2.GetReceivedPaymentsRequest) -> Iterable[squeak_admin_pb2.ReceivedPayment]:
+        received_payments = self._get_received_payments(request)
+        yield from map(received_payments_to_message, received_payments)
+
+    def handle_subscribe_received_payments(self, request: squeak_admin_pb2.SubscribeReceivedPaymentsRequest, stopped: threading.Event) -> Iterable[squeak_admin_pb2.ReceivedPayment]:
         payment_index = request.payment_index
         logger.info(
-            "Handle subscribe received payments with index: {}".format(
-                payment_index)
-        )
+            "Handle subscribe received payments with index: %s", payment_index)
         received_payments_stream = self.squeak_controller.subscribe_received_payments(
             payment_index,
             stopped,
         )
-        for received_payment in received_payments_stream:
-            received_payment_msg = received_payments_to_message(
-                received_payment)
-            yield received_payment_msg
+        yield from map(received_payments_to_message, received_payments_stream)
 
-    def handle_get_network(self, request):
+    def handle_get_network(self, request: squeak_admin_pb2.GetNetworkRequest) -> squeak_admin_pb2.GetNetworkReply:
         logger.info("Handle get network")
         network = self.squeak_controller.get_network()
         return squeak_admin_pb2.GetNetworkReply(
             network=network,
         )
 
-    def handle_get_payment_summary(self, request):
+    def handle_get_payment_summary(self, request: squeak_admin_pb2.GetPaymentSummaryRequest) -> squeak_admin_pb2.GetPaymentSummaryReply:
         logger.info("Handle get payment summary")
-        received_payment_summary = self.squeak_controller.get_received_payment_summary()
-        sent_payment_summary = self.squeak_controller.get_sent_payment_summary()
+        # The two summaries are independent queries, so run them
+        # concurrently.
+        received_payment_summary_future = self.payment_summary_executor.submit(
+            self.squeak_controller.get_received_payment_summary,
+        )
+        sent_payment_summary_future = self.payment_summary_executor.submit(
+            self.squeak_controller.get_sent_payment_summary,
+        )
         payment_summary_msg = payment_summary_to_message(
-            received_payment_summary,
-            sent_payment_summary,
+            received_payment_summary_future.result(),
+            sent_payment_summary_future.result(),
         )
         return squeak_admin_pb2.GetPaymentSummaryReply(
             payment_summary=payment_summary_msg,
         )
 
-    def handle_reprocess_received_payments(self, request):
+    def handle_reprocess_received_payments(self, request: squeak_admin_pb2.ReprocessReceivedPaymentsRequest) -> squeak_admin_pb2.ReprocessReceivedPaymentsReply:
         logger.info("Handle reprocess received payments")
         self.squeak_controller.reprocess_received_payments()
-        return squeak_admin_pb2.ReprocessReceivedPaymentsReply()
+        return REPROCESS_RECEIVED_PAYMENTS_REPLY
 
-    def handle_like_squeak(self, request: squeak_admin_pb2.LikeSqueakRequest):
+    def handle_like_squeak(self, request: squeak_admin_pb2.LikeSqueakRequest) -> squeak_admin_pb2.LikeSqueakReply:
         squeak_hash_str = request.squeak_hash
-        squeak_hash = bytes.fromhex(squeak_hash_str)
-        logger.info(
-            "Handle like squeak with hash: {}".format(squeak_hash_str))
+        squeak_hash = message_to_squeak_hash(squeak_hash_str)
+        logger.info("Handle like squeak with hash: %s", squeak_hash_str)
         self.squeak_controller.like_squeak(
             squeak_hash
         )
-        return squeak_admin_pb2.LikeSqueakReply()
+        return LIKE_SQUEAK_REPLY
 
-    def handle_unlike_squeak(self, request: squeak_admin_pb2.UnlikeSqueakRequest):
+    def handle_unlike_squeak(self, request: squeak_admin_pb2.UnlikeSqueakRequest) -> squeak_admin_pb2.UnlikeSqueakReply:
         squeak_hash_str = request.squeak_hash
-        squeak_hash = bytes.fromhex(squeak_hash_str)
-        logger.info(
-            "Handle unlike squeak with hash: {}".format(squeak_hash_str))
+        squeak_hash = message_to_squeak_hash(squeak_hash_str)
+        logger.info("Handle unlike squeak with hash: %s", squeak_hash_str)
         self.squeak_controller.unlike_squeak(
             squeak_hash
         )
-        return squeak_admin_pb2.UnlikeSqueakReply()
+        return UNLIKE_SQUEAK_REPLY
 
-    def handle_get_liked_squeak_display_entries(self, request):
+    def handle_get_liked_squeak_display_entries(self, request: squeak_admin_pb2.GetLikedSqueakDisplaysRequest) -> squeak_admin_pb2.GetLikedSqueakDisplaysReply:
         limit = request.limit
-        last_entry = message_to_squeak_entry(request.last_entry) if request.HasField(
-            "last_entry") else None
-        logger.info("""Handle get liked squeak display entries with
-        limit: {}
-        last_entry: {}
-        """.format(
+        last_entry = optional_field_to_value(
+            request, "last_entry", message_to_squeak_entry)
+        logger.info(
+            """Handle get liked squeak display entries with
+        limit: %s
+        last_entry: %s
+        """,
             limit,
             last_entry,
-        ))
+        )
         squeak_entries = (
             self.squeak_controller.get_liked_squeak_entries(
                 limit,
                 last_entry,
             )
         )
-        logger.info(
-            "Got number of liked squeak entries: {}".format(
-                len(squeak_entries)
-            )
+        reply = squeak_admin_pb2.GetLikedSqueakDisplaysReply()
+        squeak_entries_to_message(
+            squeak_entries,
+            reply.squeak_display_entries,
         )
-        squeak_display_msgs = [
-            squeak_entry_to_message(entry) for entry in squeak_entries
-        ]
-        return squeak_admin_pb2.GetLikedSqueakDisplaysReply(
-            squeak_display_entries=squeak_display_msgs
+        logger.debug(
+            "Got number of liked squeak entries: %s",
+            len(reply.squeak_display_entries),
         )
+        return reply
 
-    def handle_connect_peer(self, request):
+    def handle_connect_peer(self, request: squeak_admin_pb2.ConnectPeerRequest) -> squeak_admin_pb2.ConnectPeerReply:
         peer_address = message_to_peer_address(request.peer_address)
-        logger.info(
-            "Handle connect peer with peer address: {}".format(peer_address))
+        logger.info("Handle connect peer with peer address: %s", peer_address)
         self.squeak_controller.connect_peer(peer_address)
-        return squeak_admin_pb2.ConnectPeerReply()
+        return CONNECT_PEER_REPLY
 
-    def handle_get_connected_peers(self, request):
+    def handle_get_connected_peers(self, request: squeak_admin_pb2.GetConnectedPeersRequest) -> squeak_admin_pb2.GetConnectedPeersReply:
         logger.info("Handle get connected peers.")
         connected_peers = self.squeak_controller.get_connected_peers()
-        logger.info("Connected peers: {}".format(
-            connected_peers,
-        ))
-        connected_peers_display_msgs = [
-            connected_peer_to_message(peer) for peer in connected_peers
-        ]
-        return squeak_admin_pb2.GetConnectedPeersReply(
-            connected_peers=connected_peers_display_msgs
+        logger.info("Connected peers: %s", connected_peers)
+        reply = squeak_admin_pb2.GetConnectedPeersReply()
+        reply.connected_peers.extend(
+            map(connected_peer_to_message, connected_peers)
         )
+        return reply
 
-    def handle_get_connected_peer(self, request):
+    def handle_get_connected_peer(self, request: squeak_admin_pb2.GetConnectedPeerRequest) -> squeak_admin_pb2.GetConnectedPeerReply:
         peer_address = message_to_peer_address(request.peer_address)
-        logger.info("Handle get connected peer for address: {}".format(
-            peer_address,
-        ))
+        logger.info("Handle get connected peer for address: %s", peer_address)
         connected_peer = self.squeak_controller.get_connected_peer(
             peer_address)
-        logger.info("Connected peer: {}".format(
-            connected_peer,
-        ))
+        logger.info("Connected peer: %s", connected_peer)
         if connected_peer is None:
-            return squeak_admin_pb2.GetConnectedPeerReply(
-                connected_peer=None
-            )
+            return EMPTY_GET_CONNECTED_PEER_REPLY
         connected_peers_display_msg = connected_peer_to_message(connected_peer)
         return squeak_admin_pb2.GetConnectedPeerReply(
             connected_peer=connected_peers_display_msg
         )
 
-    def handle_disconnect_peer(self, request):
+    def handle_disconnect_peer(self, request: squeak_admin_pb2.DisconnectPeerRequest) -> squeak_admin_pb2.DisconnectPeerReply:
         peer_address = message_to_peer_address(request.peer_address)
         logger.info(
-            "Handle disconnect peer with peer address: {}".format(peer_address))
+            "Handle disconnect peer with peer address: %s", peer_address)
         self.squeak_controller.disconnect_peer(peer_address)
-        return squeak_admin_pb2.DisconnectPeerReply()
+        return DISCONNECT_PEER_REPLY
 
-    def handle_subscribe_connected_peers(self, request, stopped):
+    def handle_subscribe_connected_peers(self, request: squeak_admin_pb2.SubscribeConnectedPeersRequest, stopped: threading.Event) -> Iterable[squeak_admin_pb2.GetConnectedPeersReply]:
         logger.info("Handle subscribe connected peers")
         connected_peers_stream = self.squeak_controller.subscribe_connected_peers(
             stopped,
         )
+        # The same reply is cleared and refilled for each update. This
+        # is safe because grpc serializes each response before it asks
+        # the generator for the next one.
+        reply = squeak_admin_pb2.GetConnectedPeersReply()
+        to_msg = connected_peer_to_message
         for connected_peers in connected_peers_stream:
-            connected_peers_display_msgs = [
-                connected_peer_to_message(peer) for peer in connected_peers
-            ]
-            yield squeak_admin_pb2.GetConnectedPeersReply(
-                connected_peers=connected_peers_display_msgs
-            )
+            reply.Clear()
+            reply.connected_peers.extend(map(to_msg, connected_peers))
+            yield reply
 
-    def handle_subscribe_connected_peer(self, request, stopped):
+    def handle_subscribe_connected_peer(self, request: squeak_admin_pb2.SubscribeConnectedPeerRequest, stopped: threading.Event) -> Iterable[squeak_admin_pb2.GetConnectedPeerReply]:
         peer_address = message_to_peer_address(request.peer_address)
         logger.info(
-            "Handle subscribe connected peer with peer address: {}".format(peer_address))
+            "Handle subscribe connected peer with peer address: %s",
+            peer_address,
+        )
         connected_peer_stream = self.squeak_controller.subscribe_connected_peer(
             peer_address,
             stopped,
         )
         for connected_peer in connected_peer_stream:
             if connected_peer is None:
-                yield squeak_admin_pb2.GetConnectedPeerReply(
-                    connected_peer=None
-                )
+                yield EMPTY_GET_CONNECTED_PEER_REPLY
             else:
                 connected_peers_display_msg = connected_peer_to_message(
                     connected_peer)
@@ -945,141 +999,122 @@ class SqueakAdminServerHandler(object):
                     connected_peer=connected_peers_display_msg,
                 )
 
-    def handle_subscribe_buy_offers(self, request, stopped):
+    def handle_subscribe_buy_offers(self, request: squeak_admin_pb2.SubscribeBuyOffersRequest, stopped: threading.Event) -> Iterable[squeak_admin_pb2.GetBuyOfferReply]:
         squeak_hash_str = request.squeak_hash
-        squeak_hash = bytes.fromhex(squeak_hash_str)
+        squeak_hash = message_to_squeak_hash(squeak_hash_str)
         logger.info(
-            "Handle subscribe received offers for hash: {}".format(squeak_hash_str))
+            "Handle subscribe received offers for hash: %s", squeak_hash_str)
         received_offer_stream = self.squeak_controller.subscribe_received_offers_for_squeak(
             squeak_hash,
             stopped,
         )
         for offer in received_offer_stream:
-            logger.info("Yielding received offer: {}".format(offer))
+            logger.debug("Yielding received offer: %s", offer)
             offer_msg = offer_entry_to_message(offer)
             yield squeak_admin_pb2.GetBuyOfferReply(
                 offer=offer_msg,
             )
 
-    def handle_subscribe_squeak_display(self, request, stopped):
+    def handle_subscribe_squeak_display(self, request: squeak_admin_pb2.SubscribeSqueakDisplayRequest, stopped: threading.Event) -> Iterable[squeak_admin_pb2.GetSqueakDisplayReply]:
         squeak_hash_str = request.squeak_hash
-        squeak_hash = bytes.fromhex(squeak_hash_str)
+        squeak_hash = message_to_squeak_hash(squeak_hash_str)
         logger.info(
-            "Handle subscribe squeak display for hash: {}".format(squeak_hash_str))
+            "Handle subscribe squeak display for hash: %s", squeak_hash_str)
         squeak_display_stream = self.squeak_controller.subscribe_squeak_entry(
             squeak_hash,
             stopped,
         )
-        for squeak_display in squeak_display_stream:
-            if squeak_display is None:
-                yield squeak_admin_pb2.GetSqueakDisplayReply(
-                    squeak_display_entry=None
-                )
-            else:
-                display_message = squeak_entry_to_message(
-                    squeak_display)
-                yield squeak_admin_pb2.GetSqueakDisplayReply(
-                    squeak_display_entry=display_message
-                )
+        yield from squeak_display_replies(squeak_display_stream)
 
-    def handle_subscribe_reply_squeak_displays(self, request, stopped):
+    def handle_subscribe_reply_squeak_displays(self, request: squeak_admin_pb2.SubscribeReplySqueakDisplaysRequest, stopped: threading.Event) -> Iterable[squeak_admin_pb2.GetSqueakDisplayReply]:
         squeak_hash_str = request.squeak_hash
-        squeak_hash = bytes.fromhex(squeak_hash_str)
+        squeak_hash = message_to_squeak_hash(squeak_hash_str)
         logger.info(
-            "Handle subscribe reply squeak displays for hash: {}".format(squeak_hash_str))
+            "Handle subscribe reply squeak displays for hash: %s",
+            squeak_hash_str,
+        )
         squeak_display_stream = self.squeak_controller.subscribe_squeak_reply_entries(
             squeak_hash,
             stopped,
         )
-        for squeak_display in squeak_display_stream:
-            if squeak_display is None:
-                yield squeak_admin_pb2.GetSqueakDisplayReply(
-                    squeak_display_entry=None
-                )
-            else:
-                display_message = squeak_entry_to_message(
-                    squeak_display)
-                yield squeak_admin_pb2.GetSqueakDisplayReply(
-                    squeak_display_entry=display_message
-                )
+        yield from squeak_display_replies(squeak_display_stream)
 
-    def handle_subscribe_address_squeak_displays(self, request, stopped):
+    def handle_subscribe_address_squeak_displays(self, request: squeak_admin_pb2.SubscribeAddressSqueakDisplaysRequest, stopped: threading.Event) -> Iterable[squeak_admin_pb2.GetSqueakDisplayReply]:
         squeak_address = request.address
         logger.info(
-            "Handle subscribe address squeak displays for address: {}".format(squeak_address))
+            "Handle subscribe address squeak displays for address: %s",
+            squeak_address,
+        )
         squeak_display_stream = self.squeak_controller.subscribe_squeak_address_entries(
             squeak_address,
             stopped,
         )
-        for squeak_display in squeak_display_stream:
-            if squeak_display is None:
-                yield squeak_admin_pb2.GetSqueakDisplayReply(
-                    squeak_display_entry=None
-                )
-            else:
-                display_message = squeak_entry_to_message(
-                    squeak_display)
-                yield squeak_admin_pb2.GetSqueakDisplayReply(
-                    squeak_display_entry=display_message
-                )
+        yield from squeak_display_replies(squeak_display_stream)
 
-    def handle_subscribe_ancestor_squeak_displays(self, request, stopped):
+    def handle_subscribe_ancestor_squeak_displays(self, request: squeak_admin_pb2.SubscribeAncestorSqueakDisplaysRequest, stopped: threading.Event) -> Iterable[squeak_admin_pb2.GetAncestorSqueakDisplaysReply]:
         squeak_hash_str = request.squeak_hash
-        squeak_hash = bytes.fromhex(squeak_hash_str)
+        squeak_hash = message_to_squeak_hash(squeak_hash_str)
         logger.info(
-            "Handle subscribe ancestor squeak displays for hash: {}".format(squeak_hash_str))
+            "Handle subscribe ancestor squeak displays for hash: %s",
+            squeak_hash_str,
+        )
         squeak_entries_stream = self.squeak_controller.subscribe_squeak_ancestor_entries(
             squeak_hash,
             stopped,
         )
         for squeak_entries in squeak_entries_stream:
-            logger.info(
-                "Got number of ancestor squeak entries: {}".format(
-                    len(squeak_entries)
-                )
+            logger.debug(
+                "Got number of ancestor squeak entries: %s",
+                len(squeak_entries),
             )
-            squeak_display_msgs = [
-                squeak_entry_to_message(entry) for entry in squeak_entries
-            ]
-            yield squeak_admin_pb2.GetAncestorSqueakDisplaysReply(
-                squeak_display_entries=squeak_display_msgs
+            reply = squeak_admin_pb2.GetAncestorSqueakDisplaysReply()
+            squeak_entries_to_message(
+                squeak_entries,
+                reply.squeak_display_entries,
             )
+            yield reply
 
-    def handle_subscribe_squeak_displays(self, request, stopped):
+    def handle_subscribe_squeak_displays(self, request: squeak_admin_pb2.SubscribeSqueakDisplaysRequest, stopped: threading.Event) -> Iterable[squeak_admin_pb2.GetSqueakDisplayReply]:
         logger.info("Handle subscribe squeak displays")
         squeak_display_stream = self.squeak_controller.subscribe_squeak_entries(
             stopped,
         )
-        for squeak_display in squeak_display_stream:
-            if squeak_display is None:
-                yield squeak_admin_pb2.GetSqueakDisplayReply(
-                    squeak_display_entry=None
-                )
-            else:
-                display_message = squeak_entry_to_message(
-                    squeak_display)
-                yield squeak_admin_pb2.GetSqueakDisplayReply(
-                    squeak_display_entry=display_message
-                )
+        yield from squeak_display_replies(squeak_display_stream)
 
-    def handle_subscribe_timeline_squeak_displays(self, request, stopped):
+    def handle_subscribe_timeline_squeak_displays(self, request: squeak_admin_pb2.SubscribeTimelineSqueakDisplaysRequest, stopped: threading.Event) -> Iterable[squeak_admin_pb2.GetSqueakDisplayReply]:
         logger.info("Handle subscribe timeline squeak displays")
         squeak_display_stream = self.squeak_controller.subscribe_timeline_squeak_entries(
             stopped,
         )
-        for squeak_display in squeak_display_stream:
-            if squeak_display is None:
-                yield squeak_admin_pb2.GetSqueakDisplayReply(
-                    squeak_display_entry=None
-                )
-            else:
-                display_message = squeak_entry_to_message(
-                    squeak_display)
-                yield squeak_admin_pb2.GetSqueakDisplayReply(
-                    squeak_display_entry=display_message
-                )
+        yield from squeak_display_replies(squeak_display_stream)
+
+    def handle_subscribe_squeak_display_batches(self, request: squeak_admin_pb2.SubscribeSqueakDisplaysRequest, stopped: threading.Event) -> Iterable[squeak_admin_pb2.SqueakDisplayBatchReply]:
+        logger.info("Handle subscribe squeak display batches")
+        squeak_entries_stream = self.squeak_controller.subscribe_squeak_entry_batches(
+            stopped,
+        )
+        for squeak_entries in squeak_entries_stream:
+            reply = squeak_admin_pb2.SqueakDisplayBatchReply()
+            squeak_entries_to_message(
+                squeak_entries,
+                reply.squeak_display_entries,
+            )
+            yield reply
+
+    def handle_subscribe_timeline_squeak_display_batches(self, request: squeak_admin_pb2.SubscribeTimelineSqueakDisplaysRequest, stopped: threading.Event) -> Iterable[squeak_admin_pb2.SqueakDisplayBatchReply]:
+        logger.info("Handle subscribe timeline squeak display batches")
+        squeak_entries_stream = self.squeak_controller.subscribe_timeline_squeak_entry_batches(
+            stopped,
+        )
+        for squeak_entries in squeak_entries_stream:
+            reply = squeak_admin_pb2.SqueakDisplayBatchReply()
+            squeak_entries_to_message(
+                squeak_entries,
+                reply.squeak_display_entries,
+            )
+            yield reply
 
-    def handle_get_external_address(self, request):
+    def handle_get_external_address(self, request: squeak_admin_pb2.GetExternalAddressRequest) -> squeak_admin_pb2.GetExternalAddressReply:
         logger.info("Handle get external address")
         external_address = self.squeak_controller.get_external_address()
         external_address_msg = peer_address_to_message(external_address)
@@ -1087,9 +1122,29 @@ class SqueakAdminServerHandler(object):
             peer_address=external_address_msg,
         )
 
-    def handle_get_default_peer_port(self, request):
+    def handle_get_default_peer_port(self, request: squeak_admin_pb2.GetDefaultPeerPortRequest) -> squeak_admin_pb2.GetDefaultPeerPortReply:
         logger.info("Handle get default peer port")
         default_peer_port = self.squeak_controller.get_default_peer_port()
         return squeak_admin_pb2.GetDefaultPeerPortReply(
             port=default_peer_port,
         )
+
+    def handle_admin_batch(self, request: squeak_admin_pb2.AdminBatchRequest) -> squeak_admin_pb2.AdminBatchReply:
+        logger.info(
+            "Handle admin batch with number of calls: %s", len(request.calls))
+        replies = self.batch_executor.map(
+            self._handle_admin_batch_call,
+            request.calls,
+        )
+        reply = squeak_admin_pb2.AdminBatchReply()
+        for call_name, call_reply in replies:
+            result = reply.results.add()
+            getattr(result, call_name).CopyFrom(call_reply)
+        return reply
+
+    def _handle_admin_batch_call(self, call):
+        call_name = call.WhichOneof("request")
+        if call_name is None:
+            raise Exception("Admin batch call request cannot be empty.")
+        handler = self.batch_handlers[call_name]
+        return call_name, handler(getattr(call, call_name))
@@ -30,17 +30,77 @@ from proto import squeak_admin_pb2_grpc
 logger = logging.getLogger(__name__)
 
 
+ADMIN_SERVICE_PATH = "/squeaknode.SqueakAdmin/"
+
+# Admin methods that are forwarded to lnd as serialized bytes, keyed by
+# admin method name, with the name of the lnd method as value.
+LND_PASSTHROUGH_METHODS = {
+    "LndGetInfo": "GetInfo",
+    "LndWalletBalance": "WalletBalance",
+    "LndNewAddress": "NewAddress",
+    "LndListChannels": "ListChannels",
+    "LndPendingChannels": "PendingChannels",
+    "LndGetTransactions": "GetTransactions",
+    "LndListPeers": "ListPeers",
+    "LndConnectPeer": "ConnectPeer",
+    "LndDisconnectPeer": "DisconnectPeer",
+    "LndOpenChannelSync": "OpenChannelSync",
+    "LndSendCoins": "SendCoins",
+}
+LND_PASSTHROUGH_STREAM_METHODS = {
+    "LndCloseChannel": "CloseChannel",
+    "LndSubscribeChannelEvents": "SubscribeChannelEvents",
+}
+
+
+class LndPassthroughInterceptor(grpc.ServerInterceptor):
+    """Serves the lnd methods of the admin service without parsing the
+    request or the reply, since the admin server does not inspect them."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.method_handlers = {}
+        for admin_method, lnd_method in LND_PASSTHROUGH_METHODS.items():
+            self.method_handlers[ADMIN_SERVICE_PATH + admin_method] = grpc.unary_unary_rpc_method_handler(
+                self._make_passthrough(lnd_method),
+            )
+        for admin_method, lnd_method in LND_PASSTHROUGH_STREAM_METHODS.items():
+            self.method_handlers[ADMIN_SERVICE_PATH + admin_method] = grpc.unary_stream_rpc_method_handler(
+                self._make_passthrough_stream(lnd_method),
+            )
+
+    def intercept_service(self, continuation, handler_call_details):
+        method_handler = self.method_handlers.get(handler_call_details.method)
+        if method_handler is not None:
+            return method_handler
+        return continuation(handler_call_details)
+
+    def _make_passthrough(self, lnd_method):
+        def passthrough(request_bytes, context):
+            return self.handler.handle_lnd_passthrough(lnd_method, request_bytes)
+        return passthrough
+
+    def _make_passthrough_stream(self, lnd_method):
+        def passthrough_stream(request_bytes, context):
+            return self.handler.handle_lnd_passthrough_stream(lnd_method, request_bytes)
+        return passthrough_stream
+
+
 class SqueakAdminServerServicer(squeak_admin_pb2_grpc.SqueakAdminServicer):
     """Provides methods that implement functionality of squeak admin server."""
 
-    def __init__(self, host, port, handler):
+    def __init__(self, host, port, max_workers, handler):
         self.host = host
         self.port = port
+        self.max_workers = max_workers
         self.handler = handler
         self.server = None
 
     def start(self):
-        self.server = grpc.server(futures.ThreadPoolExecutor(max_workers=100))
+        self.server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=self.max_workers),
+            interceptors=[LndPassthroughInterceptor(self.handler)],
+        )
         squeak_admin_pb2_grpc.add_SqueakAdminServicer_to_server(
             self, self.server)
         self.server.add_insecure_port("{}:{}".format(self.host, self.port))
@@ -53,45 +113,6 @@ class SqueakAdminServerServicer(squeak_admin_pb2_grpc.SqueakAdminServicer):
         self.server.stop(None)
         logger.info("Stopped SqueakAdminServerServicer.")
 
-    def LndGetInfo(self, request, context):
-        return self.handler.handle_lnd_get_info(request)
-
-    def LndWalletBalance(self, request, context):
-        return self.handler.handle_lnd_wallet_balance(request)
-
-    def LndNewAddress(self, request, context):
-        return self.handler.handle_lnd_new_address(request)
-
-    def LndListChannels(self, request, context):
-        return self.handler.handle_lnd_list_channels(request)
-
-    def LndPendingChannels(self, request, context):
-        return self.handler.handle_lnd_pending_channels(request)
-
-    def LndGetTransactions(self, request, context):
-        return self.handler.handle_lnd_get_transactions(request)
-
-    def LndListPeers(self, request, context):
-        return self.handler.handle_lnd_list_peers(request)
-
-    def LndConnectPeer(self, request, context):
-        return self.handler.handle_lnd_connect_peer(request)
-
-    def LndDisconnectPeer(self, request, context):
-        return self.handler.handle_lnd_disconnect_peer(request)
-
-    def LndOpenChannelSync(self, request, context):
-        return self.handler.handle_lnd_open_channel_sync(request)
-
-    def LndCloseChannel(self, request, context):
-        return self.handler.handle_lnd_close_channel(request)
-
-    def LndSubscribeChannelEvents(self, request, context):
-        return self.handler.handle_lnd_subscribe_channel_events(request)
-
-    def LndSendCoins(self, request, context):
-        return self.handler.handle_lnd_send_coins(request)
-
     def CreateSigningProfile(self, request, context):
         return self.handler.handle_create_signing_profile(request)
 
@@ -146,21 +167,36 @@ class SqueakAdminServerServicer(squeak_admin_pb2_grpc.SqueakAdminServicer):
     def MakeSqueak(self, request, context):
         return self.handler.handle_make_squeak(request)
 
+    def MakeSqueaks(self, request, context):
+        return self.handler.handle_make_squeaks(request)
+
     def GetSqueakDisplay(self, request, context):
         return self.handler.handle_get_squeak_display_entry(request)
 
     def GetTimelineSqueakDisplays(self, request, context):
         return self.handler.handle_get_timeline_squeak_display_entries(request)
 
+    def StreamTimelineSqueakDisplays(self, request, context):
+        return self.handler.handle_stream_timeline_squeak_display_entries(request)
+
     def GetAddressSqueakDisplays(self, request, context):
         return self.handler.handle_get_squeak_display_entries_for_address(request)
 
+    def StreamAddressSqueakDisplays(self, request, context):
+        return self.handler.handle_stream_squeak_display_entries_for_address(request)
+
     def GetSearchSqueakDisplays(self, request, context):
         return self.handler.handle_get_squeak_display_entries_for_text_search(request)
 
+    def StreamSearchSqueakDisplays(self, request, context):
+        return self.handler.handle_stream_squeak_display_entries_for_text_search(request)
+
     def GetAncestorSqueakDisplays(self, request, context):
         return self.handler.handle_get_ancestor_squeak_display_entries(request)
 
+    def StreamAncestorSqueakDisplays(self, request, context):
+        return self.handler.handle_stream_ancestor_squeak_display_entries(request)
+
     def GetReplySqueakDisplays(self, request, context):
         return self.handler.handle_get_reply_squeak_display_entries(request)
 
@@ -227,6 +263,9 @@ class SqueakAdminServerServicer(squeak_admin_pb2_grpc.SqueakAdminServicer):
     def GetReceivedPayments(self, request, context):
         return self.handler.handle_get_received_payments(request)
 
+    def StreamReceivedPayments(self, request, context):
+        return self.handler.handle_stream_received_payments(request)
+
     def SubscribeReceivedPayments(self, request, context):
         stopped = threading.Event()
 
@@ -377,8 +416,35 @@ class SqueakAdminServerServicer(squeak_admin_pb2_grpc.SqueakAdminServicer):
             stopped,
         )
 
+    def SubscribeSqueakDisplayBatches(self, request, context):
+        stopped = threading.Event()
+
+        def on_rpc_done():
+            logger.info("Stopping SubscribeSqueakDisplayBatches.")
+            stopped.set()
+        context.add_callback(on_rpc_done)
+        return self.handler.handle_subscribe_squeak_display_batches(
+            request,
+            stopped,
+        )
+
+    def SubscribeTimelineSqueakDisplayBatches(self, request, context):
+        stopped = threading.Event()
+
+        def on_rpc_done():
+            logger.info("Stopping SubscribeTimelineSqueakDisplayBatches.")
+            stopped.set()
+        context.add_callback(on_rpc_done)
+        return self.handler.handle_subscribe_timeline_squeak_display_batches(
+            request,
+            stopped,
+        )
+
     def GetExternalAddress(self, request, context):
         return self.handler.handle_get_external_address(request)
 
     def GetDefaultPeerPort(self, request, context):
         return self.handler.handle_get_default_peer_port(request)
+
+    def AdminBatch(self, request, context):
+        return self.handler.handle_admin_batch(request)
@@ -48,7 +48,7 @@ logger = logging.getLogger(__name__)
 
 def create_app(handler, username, password):
     # create and configure the app
-    logger.debug("Starting flask app from directory: {}".format(os.getcwd()))
+    logger.debug("Starting flask app from directory: %s", os.getcwd())
     app = Flask(
         __name__,
         static_url_path="/",
@@ -62,8 +62,8 @@ def create_app(handler, username, password):
         username,
         password,
     )
-    logger.debug("Starting flask with app.root_path: {}".format(app.root_path))
-    logger.debug("Files in root path: {}".format(os.listdir(app.root_path)))
+    logger.debug("Starting flask with app.root_path: %s", app.root_path)
+    logger.debug("Files in root path: %s", os.listdir(app.root_path))
 
     @login.user_loader
     def load_user(id):
@@ -89,6 +89,18 @@ def create_app(handler, username, password):
             return wrapper
         return decorator
 
+    def protobuf_passthrough(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            data = request.get_data()
+            try:
+                return func(data)
+            except Exception as e:
+                logger.error(
+                    "Error in handle admin web request.", exc_info=True)
+                return str(e), 500
+        return wrapper
+
     @app.route("/login", methods=["GET", "POST"])
     def login():
         logger.info("Trying to login")
@@ -130,75 +142,75 @@ def create_app(handler, username, password):
 
     @app.route("/lndgetinfo", methods=["POST"])
     @login_required
-    @protobuf_serialized(lnd_pb2.GetInfoRequest())
-    def lndgetinfo(msg):
-        return handler.handle_lnd_get_info(msg)
+    @protobuf_passthrough
+    def lndgetinfo(data):
+        return handler.handle_lnd_passthrough("GetInfo", data)
 
     @app.route("/lndwalletbalance", methods=["POST"])
     @login_required
-    @protobuf_serialized(lnd_pb2.WalletBalanceRequest())
-    def lndwalletbalance(msg):
-        return handler.handle_lnd_wallet_balance(msg)
+    @protobuf_passthrough
+    def lndwalletbalance(data):
+        return handler.handle_lnd_passthrough("WalletBalance", data)
 
     @app.route("/lndgettransactions", methods=["POST"])
     @login_required
-    @protobuf_serialized(lnd_pb2.GetTransactionsRequest())
-    def lndgettransactions(msg):
-        return handler.handle_lnd_get_transactions(msg)
+    @protobuf_passthrough
+    def lndgettransactions(data):
+        return handler.handle_lnd_passthrough("GetTransactions", data)
 
     @app.route("/lndlistpeers", methods=["POST"])
     @login_required
-    @protobuf_serialized(lnd_pb2.ListPeersRequest())
-    def lndlistpeers(msg):
-        return handler.handle_lnd_list_peers(msg)
+    @protobuf_passthrough
+    def lndlistpeers(data):
+        return handler.handle_lnd_passthrough("ListPeers", data)
 
     @app.route("/lndlistchannels", methods=["POST"])
     @login_required
-    @protobuf_serialized(lnd_pb2.ListChannelsRequest())
-    def lndlistchannels(msg):
-        return handler.handle_lnd_list_channels(msg)
+    @protobuf_passthrough
+    def lndlistchannels(data):
+        return handler.handle_lnd_passthrough("ListChannels", data)
 
     @app.route("/lndpendingchannels", methods=["POST"])
     @login_required
-    @protobuf_serialized(lnd_pb2.PendingChannelsRequest())
-    def lndpendingchannels(msg):
-        return handler.handle_lnd_pending_channels(msg)
+    @protobuf_passthrough
+    def lndpendingchannels(data):
+        return handler.handle_lnd_passthrough("PendingChannels", data)
 
     @app.route("/lndconnectpeer", methods=["POST"])
     @login_required
-    @protobuf_serialized(lnd_pb2.ConnectPeerRequest())
-    def lndconnectpeer(msg):
-        return handler.handle_lnd_connect_peer(msg)
+    @protobuf_passthrough
+    def lndconnectpeer(data):
+        return handler.handle_lnd_passthrough("ConnectPeer", data)
 
     @app.route("/lnddisconnectpeer", methods=["POST"])
     @login_required
-    @protobuf_serialized(lnd_pb2.DisconnectPeerRequest())
-    def lnddisconnectpeer(msg):
-        return handler.handle_lnd_disconnect_peer(msg)
+    @protobuf_passthrough
+    def lnddisconnectpeer(data):
+        return handler.handle_lnd_passthrough("DisconnectPeer", data)
 
     @app.route("/lndopenchannelsync", methods=["POST"])
     @login_required
-    @protobuf_serialized(lnd_pb2.OpenChannelRequest())
-    def lndopenchannelsync(msg):
-        return handler.handle_lnd_open_channel_sync(msg)
+    @protobuf_passthrough
+    def lndopenchannelsync(data):
+        return handler.handle_lnd_passthrough("OpenChannelSync", data)
 
     @app.route("/lndclosechannel", methods=["POST"])
     @login_required
     @protobuf_serialized(lnd_pb2.CloseChannelRequest())
     def lndclosechannel(msg):
-        return handler.handle_lnd_close_channel(msg)
+        return handler.handle_lnd_call("CloseChannel", msg)
 
     @app.route("/lndnewaddress", methods=["POST"])
     @login_required
-    @protobuf_serialized(lnd_pb2.NewAddressRequest())
-    def lndnewaddress(msg):
-        return handler.handle_lnd_new_address(msg)
+    @protobuf_passthrough
+    def lndnewaddress(data):
+        return handler.handle_lnd_passthrough("NewAddress", data)
 
     @app.route("/lndsendcoins", methods=["POST"])
     @login_required
-    @protobuf_serialized(lnd_pb2.SendCoinsRequest())
-    def lndsendcoins(msg):
-        return handler.handle_lnd_send_coins(msg)
+    @protobuf_passthrough
+    def lndsendcoins(data):
+        return handler.handle_lnd_passthrough("SendCoins", data)
 
     @app.route("/gettimelinesqueakdisplays", methods=["POST"])
     @login_required
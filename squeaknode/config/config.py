@@ -43,6 +43,7 @@ DEFAULT_SERVER_RPC_HOST = "0.0.0.0"
 DEFAULT_SERVER_RPC_PORT = None
 DEFAULT_ADMIN_RPC_HOST = "0.0.0.0"
 DEFAULT_ADMIN_RPC_PORT = 8994
+DEFAULT_ADMIN_RPC_MAX_WORKERS = 100
 DEFAULT_WEBADMIN_HOST = "0.0.0.0"
 DEFAULT_WEBADMIN_PORT = 12994
 DEFAULT_BITCOIN_RPC_HOST = "localhost"
@@ -64,6 +65,11 @@ DEFAULT_OFFER_DELETION_INTERVAL_S = 10
 DEFAULT_SUBSCRIBE_INVOICES_RETRY_S = 10
 DEFAULT_SQUEAK_RETENTION_S = 604800
 DEFAULT_SQUEAK_DELETION_INTERVAL_S = 10
+DEFAULT_DB_INIT_MAX_ATTEMPTS = 10
+DEFAULT_DB_INIT_RETRY_BASE_S = 0.5
+DEFAULT_DB_POOL_SIZE = 10
+DEFAULT_DB_MAX_OVERFLOW = 20
+DEFAULT_DB_POOL_RECYCLE_S = 1800
 
 
 @section('bitcoin')
@@ -100,6 +106,8 @@ class AdminConfig(Config):
     rpc_enabled = key(cast=bool, required=False, default=True)
     rpc_host = key(cast=str, required=False, default=DEFAULT_ADMIN_RPC_HOST)
     rpc_port = key(cast=int, required=False, default=DEFAULT_ADMIN_RPC_PORT)
+    rpc_max_workers = key(cast=int, required=False,
+                          default=DEFAULT_ADMIN_RPC_MAX_WORKERS)
 
 
 @section('webadmin')
@@ -151,6 +159,15 @@ class NodeConfig(Config):
 @section('db')
 class DbConfig(Config):
     connection_string = key(cast=str, required=False, default="")
+    init_max_attempts = key(
+        cast=int, required=False, default=DEFAULT_DB_INIT_MAX_ATTEMPTS)
+    init_retry_base_s = key(
+        cast=float, required=False, default=DEFAULT_DB_INIT_RETRY_BASE_S)
+    pool_size = key(cast=int, required=False, default=DEFAULT_DB_POOL_SIZE)
+    max_overflow = key(
+        cast=int, required=False, default=DEFAULT_DB_MAX_OVERFLOW)
+    pool_recycle_s = key(
+        cast=int, required=False, default=DEFAULT_DB_POOL_RECYCLE_S)
 
 
 class SqueaknodeConfig(Config):
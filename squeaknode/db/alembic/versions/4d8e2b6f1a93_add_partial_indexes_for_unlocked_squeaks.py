@@ -0,0 +1,60 @@
+# MIT License
+#
+# Copyright (c) 2020 Jonathan Zernik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Add partial indexes for unlocked squeaks.
+
+Revision ID: 4d8e2b6f1a93
+Revises: b3f5a8e1c740
+Create Date: 2021-10-31 11:26:40.205716
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '4d8e2b6f1a93'
+down_revision = 'b3f5a8e1c740'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('squeak', schema=None) as batch_op:
+        batch_op.create_index('ix_squeak_unlocked_author_address_n_block_height', [
+                              'author_address', 'n_block_height'], unique=False,
+                              sqlite_where=sa.text(
+                                  'secret_key IS NOT NULL'),
+                              postgresql_where=sa.text(
+                                  'secret_key IS NOT NULL'))
+        batch_op.create_index('ix_squeak_unlocked_n_block_height_n_time_hash', [
+                              'n_block_height', 'n_time', 'hash'], unique=False,
+                              sqlite_where=sa.text(
+                                  'secret_key IS NOT NULL'),
+                              postgresql_where=sa.text(
+                                  'secret_key IS NOT NULL'))
+
+
+def downgrade():
+    with op.batch_alter_table('squeak', schema=None) as batch_op:
+        batch_op.drop_index('ix_squeak_unlocked_n_block_height_n_time_hash')
+        batch_op.drop_index(
+            'ix_squeak_unlocked_author_address_n_block_height')
@@ -0,0 +1,66 @@
+# MIT License
+#
+# Copyright (c) 2020 Jonathan Zernik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Add indexes for squeak and received payment pagination.
+
+Revision ID: 5f3c0e2a91b7
+Revises: 231b8b35ed2e
+Create Date: 2021-10-24 17:02:13.418250
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5f3c0e2a91b7'
+down_revision = '231b8b35ed2e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('squeak', schema=None) as batch_op:
+        batch_op.create_index('ix_squeak_n_block_height_n_time_hash', [
+                              'n_block_height', 'n_time', 'hash'], unique=False)
+        batch_op.create_index('ix_squeak_hash_reply_sqk', [
+                              'hash_reply_sqk', 'n_block_height', 'n_time', 'hash'], unique=False)
+        batch_op.create_index('ix_squeak_liked_time_ms_hash', [
+                              'liked_time_ms', 'hash'], unique=False,
+                              sqlite_where=sa.text(
+                                  'liked_time_ms IS NOT NULL'),
+                              postgresql_where=sa.text(
+                                  'liked_time_ms IS NOT NULL'))
+
+    with op.batch_alter_table('received_payment', schema=None) as batch_op:
+        batch_op.create_index('ix_received_payment_created_time_ms_received_payment_id', [
+                              'created_time_ms', 'received_payment_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('received_payment', schema=None) as batch_op:
+        batch_op.drop_index(
+            'ix_received_payment_created_time_ms_received_payment_id')
+
+    with op.batch_alter_table('squeak', schema=None) as batch_op:
+        batch_op.drop_index('ix_squeak_liked_time_ms_hash')
+        batch_op.drop_index('ix_squeak_hash_reply_sqk')
+        batch_op.drop_index('ix_squeak_n_block_height_n_time_hash')
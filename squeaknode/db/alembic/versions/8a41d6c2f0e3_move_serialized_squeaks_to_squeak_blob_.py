@@ -0,0 +1,82 @@
+# MIT License
+#
+# Copyright (c) 2020 Jonathan Zernik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Move serialized squeaks to squeak_blob table.
+
+Revision ID: 8a41d6c2f0e3
+Revises: 5f3c0e2a91b7
+Create Date: 2021-10-25 21:47:35.902114
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8a41d6c2f0e3'
+down_revision = '5f3c0e2a91b7'
+branch_labels = None
+depends_on = None
+
+
+def recreate_liked_time_ms_index(batch_op):
+    # The sqlite batch mode copies the squeak table from reflection,
+    # which may lose the predicate of the partial index.
+    batch_op.drop_index('ix_squeak_liked_time_ms_hash')
+    batch_op.create_index('ix_squeak_liked_time_ms_hash', [
+                          'liked_time_ms', 'hash'], unique=False,
+                          sqlite_where=sa.text(
+                              'liked_time_ms IS NOT NULL'),
+                          postgresql_where=sa.text(
+                              'liked_time_ms IS NOT NULL'))
+
+
+def upgrade():
+    op.create_table('squeak_blob',
+                    sa.Column('hash', sa.LargeBinary(
+                        length=32), nullable=False),
+                    sa.Column('squeak', sa.LargeBinary(), nullable=False),
+                    sa.PrimaryKeyConstraint('hash')
+                    )
+    op.execute(
+        'INSERT INTO squeak_blob (hash, squeak) SELECT hash, squeak FROM squeak')
+
+    # The sqlite table copy also recreates the squeak table without rowid.
+    with op.batch_alter_table('squeak', schema=None,
+                              table_kwargs={'sqlite_with_rowid': False}) as batch_op:
+        batch_op.drop_column('squeak')
+        recreate_liked_time_ms_index(batch_op)
+
+
+def downgrade():
+    with op.batch_alter_table('squeak', schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column('squeak', sa.LargeBinary(), nullable=True))
+
+    op.execute(
+        'UPDATE squeak SET squeak = (SELECT squeak_blob.squeak FROM squeak_blob WHERE squeak_blob.hash = squeak.hash)')
+
+    with op.batch_alter_table('squeak', schema=None) as batch_op:
+        batch_op.alter_column('squeak', existing_type=sa.LargeBinary(),
+                              nullable=False)
+        recreate_liked_time_ms_index(batch_op)
+
+    op.drop_table('squeak_blob')
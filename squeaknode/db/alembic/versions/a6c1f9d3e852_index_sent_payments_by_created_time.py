@@ -0,0 +1,48 @@
+# MIT License
+#
+# Copyright (c) 2020 Jonathan Zernik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Index sent payments by created time and payment hash.
+
+Revision ID: a6c1f9d3e852
+Revises: 4d8e2b6f1a93
+Create Date: 2021-11-08 10:41:27.518306
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6c1f9d3e852'
+down_revision = '4d8e2b6f1a93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('sent_payment', schema=None) as batch_op:
+        batch_op.create_index('ix_sent_payment_created_time_ms_payment_hash', [
+                              'created_time_ms', 'payment_hash'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('sent_payment', schema=None) as batch_op:
+        batch_op.drop_index(
+            'ix_sent_payment_created_time_ms_payment_hash')
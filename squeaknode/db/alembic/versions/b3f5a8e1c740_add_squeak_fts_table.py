@@ -0,0 +1,54 @@
+# MIT License
+#
+# Copyright (c) 2020 Jonathan Zernik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Add squeak_fts table.
+
+Revision ID: b3f5a8e1c740
+Revises: 8a41d6c2f0e3
+Create Date: 2021-10-30 14:12:48.530921
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3f5a8e1c740'
+down_revision = '8a41d6c2f0e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_context().dialect.name != 'sqlite':
+        return
+    op.execute(
+        "CREATE VIRTUAL TABLE squeak_fts USING fts5(hash UNINDEXED, content)"
+    )
+    op.execute(
+        "INSERT INTO squeak_fts (hash, content) "
+        "SELECT hash, content FROM squeak WHERE content IS NOT NULL"
+    )
+
+
+def downgrade():
+    if op.get_context().dialect.name != 'sqlite':
+        return
+    op.execute("DROP TABLE squeak_fts")
@@ -0,0 +1,61 @@
+# MIT License
+#
+# Copyright (c) 2020 Jonathan Zernik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Index offers by squeak hash and received payments by settle index.
+
+Revision ID: f29b7c4e6d18
+Revises: a6c1f9d3e852
+Create Date: 2021-11-09 15:02:44.871903
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f29b7c4e6d18'
+down_revision = 'a6c1f9d3e852'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('received_offer', schema=None) as batch_op:
+        batch_op.create_index('ix_received_offer_squeak_hash', [
+                              'squeak_hash'], unique=False)
+
+    with op.batch_alter_table('sent_offer', schema=None) as batch_op:
+        batch_op.create_index('ix_sent_offer_squeak_hash', [
+                              'squeak_hash'], unique=False)
+
+    with op.batch_alter_table('received_payment', schema=None) as batch_op:
+        batch_op.create_index('ix_received_payment_settle_index', [
+                              'settle_index'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('received_payment', schema=None) as batch_op:
+        batch_op.drop_index('ix_received_payment_settle_index')
+
+    with op.batch_alter_table('sent_offer', schema=None) as batch_op:
+        batch_op.drop_index('ix_sent_offer_squeak_hash')
+
+    with op.batch_alter_table('received_offer', schema=None) as batch_op:
+        batch_op.drop_index('ix_received_offer_squeak_hash')
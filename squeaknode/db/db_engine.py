@@ -22,10 +22,64 @@
 from pathlib import Path
 
 from sqlalchemy import create_engine
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
 
 
-def get_engine(connection_string):
-    return create_engine(connection_string)
+# Applied to every new sqlite connection. WAL lets the subscription
+# readers run concurrently with the writer threads, and the larger page
+# cache and memory map keep hot pages out of the read syscall path.
+SQLITE_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-16384",
+    "PRAGMA temp_store=MEMORY",
+]
+
+
+def get_engine(
+        connection_string,
+        pool_size,
+        max_overflow,
+        pool_recycle_s,
+):
+    url = make_url(connection_string)
+    if url.get_backend_name() == "sqlite":
+        if url.database not in (None, "", ":memory:"):
+            # Keep file connections open in a pool, instead of the
+            # default NullPool, so that the page cache and pragmas are
+            # not lost after every query.
+            engine = create_engine(
+                connection_string,
+                poolclass=QueuePool,
+                pool_size=pool_size,
+                max_overflow=-1,
+                connect_args={"check_same_thread": False},
+            )
+        else:
+            engine = create_engine(connection_string)
+        event.listen(engine, "connect", set_sqlite_pragmas)
+    else:
+        # Check connections before use, so that a restarted database
+        # server does not fail the first query on every pooled
+        # connection.
+        engine = create_engine(
+            connection_string,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_pre_ping=True,
+            pool_recycle=pool_recycle_s,
+        )
+    return engine
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
 
 
 def get_sqlite_connection_string(sqk_dir, network):
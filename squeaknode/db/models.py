@@ -24,13 +24,17 @@ import logging
 from sqlalchemy import BigInteger
 from sqlalchemy import Boolean
 from sqlalchemy import Column
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import LargeBinary
 from sqlalchemy import MetaData
 from sqlalchemy import String
 from sqlalchemy import Table
+from sqlalchemy import text
 from sqlalchemy import UniqueConstraint
 from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import column
+from sqlalchemy.sql import table
 
 
 logger = logging.getLogger(__name__)
@@ -60,7 +64,6 @@ class Models:
             self.metadata,
             Column("hash", LargeBinary(32), primary_key=True),
             Column("created_time_ms", SLBigInteger, nullable=False),
-            Column("squeak", LargeBinary, nullable=False),
             Column("hash_reply_sqk", LargeBinary(32), nullable=True),
             Column("hash_block", LargeBinary(32), nullable=False),
             Column("n_block_height", Integer, nullable=False),
@@ -70,6 +73,67 @@ class Models:
             Column("block_time", Integer, nullable=False),
             Column("liked_time_ms", SLBigInteger, default=None, nullable=True),
             Column("content", String(280), nullable=True),
+            # Indexes matching the keyset pagination order of the
+            # timeline, reply and liked squeak queries.
+            Index(
+                "ix_squeak_n_block_height_n_time_hash",
+                "n_block_height",
+                "n_time",
+                "hash",
+            ),
+            Index(
+                "ix_squeak_hash_reply_sqk",
+                "hash_reply_sqk",
+                "n_block_height",
+                "n_time",
+                "hash",
+            ),
+            Index(
+                "ix_squeak_liked_time_ms_hash",
+                "liked_time_ms",
+                "hash",
+                sqlite_where=text("liked_time_ms IS NOT NULL"),
+                postgresql_where=text("liked_time_ms IS NOT NULL"),
+            ),
+            # Partial indexes for lookup_squeaks, which only returns
+            # unlocked squeaks unless include_locked is set.
+            Index(
+                "ix_squeak_unlocked_author_address_n_block_height",
+                "author_address",
+                "n_block_height",
+                sqlite_where=text("secret_key IS NOT NULL"),
+                postgresql_where=text("secret_key IS NOT NULL"),
+            ),
+            Index(
+                "ix_squeak_unlocked_n_block_height_n_time_hash",
+                "n_block_height",
+                "n_time",
+                "hash",
+                sqlite_where=text("secret_key IS NOT NULL"),
+                postgresql_where=text("secret_key IS NOT NULL"),
+            ),
+            # Store the rows in the primary key b-tree, instead of
+            # keeping a separate index from hash to rowid.
+            sqlite_with_rowid=False,
+        )
+
+        # The serialized squeak is kept out of the squeak table, so
+        # that the rows scanned by the entry queries stay small.
+        self.squeak_blobs = Table(
+            "squeak_blob",
+            self.metadata,
+            Column("hash", LargeBinary(32), primary_key=True),
+            Column("squeak", LargeBinary, nullable=False),
+        )
+
+        # Full text index of unlocked squeak content. This is an FTS5
+        # virtual table created by migration on sqlite only, so it is
+        # not part of the metadata.
+        self.squeak_fts = table(
+            "squeak_fts",
+            column("hash"),
+            column("content"),
+            schema=schema,
         )
 
         self.profiles = Table(
@@ -123,6 +187,10 @@ class Models:
             Column("peer_port", Integer, nullable=False),
             Column("peer_use_tor", Boolean, nullable=False),
             Column("paid", Boolean, nullable=False, default=False),
+            Index(
+                "ix_received_offer_squeak_hash",
+                "squeak_hash",
+            ),
             sqlite_autoincrement=True,
         )
 
@@ -141,6 +209,11 @@ class Models:
             Column("price_msat", Integer, nullable=False, default=0),
             Column("node_pubkey", String(66), nullable=False),
             Column("valid", Boolean, nullable=False),
+            Index(
+                "ix_sent_payment_created_time_ms_payment_hash",
+                "created_time_ms",
+                "payment_hash",
+            ),
             sqlite_autoincrement=True,
         )
 
@@ -162,6 +235,10 @@ class Models:
             Column("peer_port", Integer, nullable=False),
             Column("peer_use_tor", Boolean, nullable=False),
             Column("paid", Boolean, nullable=False, default=False),
+            Index(
+                "ix_sent_offer_squeak_hash",
+                "squeak_hash",
+            ),
             sqlite_autoincrement=True,
         )
 
@@ -178,5 +255,14 @@ class Models:
             Column("peer_host", String, nullable=False),
             Column("peer_port", Integer, nullable=False),
             Column("peer_use_tor", Boolean, nullable=False),
+            Index(
+                "ix_received_payment_created_time_ms_received_payment_id",
+                "created_time_ms",
+                "received_payment_id",
+            ),
+            Index(
+                "ix_received_payment_settle_index",
+                "settle_index",
+            ),
             sqlite_autoincrement=True,
         )
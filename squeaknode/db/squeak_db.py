@@ -20,15 +20,20 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 import logging
+import threading
 import time
 from contextlib import contextmanager
+from typing import Dict
 from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Tuple
 
 import sqlalchemy
 from bitcoin.core import CBlockHeader
+from sqlalchemy import bindparam
 from sqlalchemy import func
+from sqlalchemy import lambda_stmt
 from sqlalchemy import literal
 from sqlalchemy.sql import select
 from sqlalchemy.sql import tuple_
@@ -52,21 +57,117 @@ from squeaknode.db.models import Models
 
 MAX_INT = 999999999999
 MAX_HASH = b'\xff' * 32
+# Stay below the 999 bound parameter limit of older sqlite versions.
+DELETE_SQUEAKS_BATCH_SIZE = 500
+# Fetch streamed received payments from the server-side cursor in
+# batches of this many rows.
+RECEIVED_PAYMENTS_STREAM_BATCH_SIZE = 1000
 
 
 logger = logging.getLogger(__name__)
 
 
+def get_fts_match_query(search_text: str) -> str:
+    """ Get the FTS5 query that matches words starting with each
+    search term.
+    """
+    return " ".join(
+        '"{}"*'.format(term.replace('"', '""'))
+        for term in search_text.split()
+    )
+
+
 class SqueakDb:
     def __init__(self, engine, schema=None):
         self.engine = engine
         self.schema = schema
         self.models = Models(schema=schema)
+        self.local = threading.local()
+        self.use_fts = engine.dialect.name == "sqlite"
+        self.profile_cache: Optional[Dict[str, SqueakProfile]] = None
+        self.profile_cache_lock = threading.Lock()
+        self.peer_cache: Optional[Dict[Tuple[str, int], SqueakPeer]] = None
+        self.peer_cache_lock = threading.Lock()
+        self.received_payment_summary_cache: Optional[ReceivedPaymentSummary] = None
+        self.received_payment_summary_cache_lock = threading.Lock()
+        self.sent_payment_summary_cache: Optional[SentPaymentSummary] = None
+        self.sent_payment_summary_cache_lock = threading.Lock()
+        self._prepare_statements()
+
+    def _prepare_statements(self):
+        """ Build the statements for the point lookups and updates once.
+
+        The statements take their arguments as bind parameters, so each
+        call reuses the same object and its memoized cache key instead
+        of building and hashing a new expression tree.
+        """
+        self.get_squeak_stmt = (
+            select([self.squeak_blobs])
+            .where(self.squeak_blobs.c.hash == bindparam("squeak_hash"))
+        )
+        self.get_squeak_secret_key_stmt = (
+            select([self.squeaks.c.secret_key])
+            .where(self.squeaks.c.hash == bindparam("squeak_hash"))
+        )
+        self.set_squeak_liked_time_stmt = (
+            self.squeaks.update()
+            .where(self.squeaks.c.hash == bindparam("squeak_hash"))
+            .values(liked_time_ms=bindparam("new_liked_time_ms"))
+        )
+        self.delete_peer_stmt = (
+            self.peers.delete()
+            .where(self.peers.c.peer_id == bindparam("peer_id"))
+        )
+        self.get_received_offer_stmt = (
+            select([self.received_offers])
+            .where(self.received_offers.c.received_offer_id == bindparam("received_offer_id"))
+        )
+        self.set_received_offer_paid_stmt = (
+            self.received_offers.update()
+            .where(self.received_offers.c.payment_hash == bindparam("offer_payment_hash"))
+            .values(paid=bindparam("new_paid"))
+        )
+        self.get_sent_offer_by_payment_hash_stmt = (
+            select([self.sent_offers])
+            .where(self.sent_offers.c.payment_hash == bindparam("payment_hash"))
+        )
+        self.set_sent_offer_paid_stmt = (
+            self.sent_offers.update()
+            .where(self.sent_offers.c.payment_hash == bindparam("offer_payment_hash"))
+            .values(paid=bindparam("new_paid"))
+        )
 
     @contextmanager
     def get_connection(self):
-        with self.engine.connect() as connection:
+        """ Get the connection of the current thread.
+
+        Nested calls on the same thread share one connection, which is
+        returned to the pool when the outermost block exits.
+        """
+        connection = getattr(self.local, "connection", None)
+        if connection is not None:
             yield connection
+            return
+        with self.engine.connect() as connection:
+            self.local.connection = connection
+            try:
+                yield connection
+            finally:
+                self.local.connection = None
+
+    @contextmanager
+    def transaction(self):
+        """ Run the enclosed queries in one transaction.
+
+        If a transaction is already open on the current thread, the
+        queries join it.
+        """
+        with self.get_connection() as connection:
+            if connection.in_transaction():
+                yield connection
+            else:
+                with connection.begin():
+                    yield connection
 
     def init(self):
         """ Create the tables and indices in the database. """
@@ -77,6 +178,14 @@ class SqueakDb:
     def squeaks(self):
         return self.models.squeaks
 
+    @property
+    def squeak_blobs(self):
+        return self.models.squeak_blobs
+
+    @property
+    def squeak_fts(self):
+        return self.models.squeak_fts
+
     @property
     def profiles(self):
         return self.models.profiles
@@ -186,10 +295,82 @@ class SqueakDb:
         Return the hash (bytes) of the inserted squeak.
         Return None if squeak already exists.
         """
+        squeak_hash = get_hash(squeak)
         ins = self.squeaks.insert().values(
-            created_time_ms=self.timestamp_now_ms,
-            hash=get_hash(squeak),
+            **self._get_squeak_values(squeak, squeak_hash, block_header),
+        )
+        ins_blob = self.squeak_blobs.insert().values(
+            hash=squeak_hash,
             squeak=squeak.serialize(),
+        )
+        try:
+            with self.transaction() as connection:
+                connection.execute(ins)
+                connection.execute(ins_blob)
+            return squeak_hash
+        except sqlalchemy.exc.IntegrityError:
+            logger.debug("Failed to insert squeak.", exc_info=True)
+            return None
+
+    def insert_squeaks(
+            self,
+            squeak_block_headers: List[Tuple[CSqueak, CBlockHeader]],
+            max_squeaks: Optional[int] = None,
+    ) -> List[Optional[bytes]]:
+        """ Insert new squeaks in one transaction.
+
+        Return the hash (bytes) of each inserted squeak, or None for
+        each squeak that already exists. If max_squeaks is given, raise
+        an exception instead if the new squeaks would exceed it.
+        """
+        squeak_hashes = [
+            get_hash(squeak) for squeak, _ in squeak_block_headers
+        ]
+        existing_hashes_stmt = select([self.squeaks.c.hash]).where(
+            self.squeaks.c.hash.in_(squeak_hashes))
+        try:
+            with self.transaction() as connection:
+                seen_hashes = {
+                    row["hash"] for row in connection.execute(existing_hashes_stmt)
+                }
+                inserted_squeak_hashes: List[Optional[bytes]] = []
+                squeak_rows = []
+                squeak_blob_rows = []
+                for (squeak, block_header), squeak_hash in zip(squeak_block_headers, squeak_hashes):
+                    if squeak_hash in seen_hashes:
+                        inserted_squeak_hashes.append(None)
+                        continue
+                    seen_hashes.add(squeak_hash)
+                    squeak_rows.append(
+                        self._get_squeak_values(squeak, squeak_hash, block_header))
+                    squeak_blob_rows.append(
+                        dict(hash=squeak_hash, squeak=squeak.serialize()))
+                    inserted_squeak_hashes.append(squeak_hash)
+                if squeak_rows and max_squeaks is not None:
+                    # Only count the squeaks that are not stored yet.
+                    num_squeaks = connection.execute(
+                        select([func.count()]).select_from(self.squeaks)
+                    ).scalar()
+                    if num_squeaks + len(squeak_rows) > max_squeaks:
+                        raise Exception("Exceeded max number of squeaks.")
+                if squeak_rows:
+                    connection.execute(self.squeaks.insert(), squeak_rows)
+                    connection.execute(
+                        self.squeak_blobs.insert(), squeak_blob_rows)
+            return inserted_squeak_hashes
+        except sqlalchemy.exc.IntegrityError:
+            # Another writer inserted one of the squeaks concurrently.
+            logger.debug(
+                "Failed to insert squeaks, inserting one at a time.", exc_info=True)
+            return [
+                self.insert_squeak(squeak, block_header)
+                for squeak, block_header in squeak_block_headers
+            ]
+
+    def _get_squeak_values(self, squeak: CSqueak, squeak_hash: bytes, block_header: CBlockHeader) -> dict:
+        return dict(
+            created_time_ms=self.timestamp_now_ms,
+            hash=squeak_hash,
             hash_reply_sqk=squeak.hashReplySqk if squeak.is_reply else None,
             hash_block=squeak.hashBlock,
             n_block_height=squeak.nBlockHeight,
@@ -198,21 +379,14 @@ class SqueakDb:
             secret_key=None,
             block_time=block_header.nTime,
         )
-        with self.get_connection() as connection:
-            try:
-                res = connection.execute(ins)
-                squeak_hash = res.inserted_primary_key[0]
-                return squeak_hash
-            except sqlalchemy.exc.IntegrityError:
-                logger.debug("Failed to insert squeak.", exc_info=True)
-                return None
 
     def get_squeak(self, squeak_hash: bytes) -> Optional[CSqueak]:
         """ Get a squeak. """
-        s = select([self.squeaks]).where(
-            self.squeaks.c.hash == squeak_hash)
         with self.get_connection() as connection:
-            result = connection.execute(s)
+            result = connection.execute(
+                self.get_squeak_stmt,
+                {"squeak_hash": squeak_hash},
+            )
             row = result.fetchone()
             if row is None:
                 return None
@@ -220,10 +394,11 @@ class SqueakDb:
 
     def get_squeak_secret_key(self, squeak_hash: bytes) -> Optional[bytes]:
         """ Get a squeak secret key. """
-        s = select([self.squeaks]).where(
-            self.squeaks.c.hash == squeak_hash)
         with self.get_connection() as connection:
-            result = connection.execute(s)
+            result = connection.execute(
+                self.get_squeak_secret_key_stmt,
+                {"squeak_hash": squeak_hash},
+            )
             row = result.fetchone()
             if row is None:
                 return None
@@ -231,22 +406,16 @@ class SqueakDb:
 
     def get_squeak_entry(self, squeak_hash: bytes) -> Optional[SqueakEntry]:
         """ Get a squeak with the author profile. """
-        s = (
-            select([self.squeaks, self.profiles])
-            .select_from(
-                self.squeaks.outerjoin(
-                    self.profiles,
-                    self.profiles.c.address == self.squeaks.c.author_address,
-                )
-            )
-            .where(self.squeaks.c.hash == squeak_hash)
+        squeaks = self.squeaks
+        s = lambda_stmt(
+            lambda: select([squeaks]).where(squeaks.c.hash == squeak_hash)
         )
         with self.get_connection() as connection:
             result = connection.execute(s)
             row = result.fetchone()
             if row is None:
                 return None
-            return self._parse_squeak_entry(row)
+            return self._parse_squeak_entry(row, self._get_cached_profiles())
 
     def get_timeline_squeak_entries(
             self,
@@ -268,37 +437,44 @@ class SqueakDb:
             last_squeak_time,
             last_squeak_hash.hex(),
         ))
-        s = (
-            select([self.squeaks, self.profiles])
-            .select_from(
-                self.squeaks.outerjoin(
-                    self.profiles,
-                    self.profiles.c.address == self.squeaks.c.author_address,
+        squeaks = self.squeaks
+        profiles = self.profiles
+        s = lambda_stmt(
+            lambda: (
+                select([squeaks])
+                .select_from(
+                    squeaks.join(
+                        profiles,
+                        profiles.c.address == squeaks.c.author_address,
+                    )
                 )
-            )
-            .where(self.profile_is_following)
-            .where(
-                tuple_(
-                    self.squeaks.c.n_block_height,
-                    self.squeaks.c.n_time,
-                    self.squeaks.c.hash,
-                ) < tuple_(
-                    last_block_height,
-                    last_squeak_time,
-                    last_squeak_hash,
+                .where(
+                    profiles.c.following == True  # noqa: E712
                 )
+                .where(
+                    tuple_(
+                        squeaks.c.n_block_height,
+                        squeaks.c.n_time,
+                        squeaks.c.hash,
+                    ) < tuple_(
+                        last_block_height,
+                        last_squeak_time,
+                        last_squeak_hash,
+                    )
+                )
+                .order_by(
+                    squeaks.c.n_block_height.desc(),
+                    squeaks.c.n_time.desc(),
+                    squeaks.c.hash.desc(),
+                )
+                .limit(limit)
             )
-            .order_by(
-                self.squeaks.c.n_block_height.desc(),
-                self.squeaks.c.n_time.desc(),
-                self.squeaks.c.hash.desc(),
-            )
-            .limit(limit)
         )
         with self.get_connection() as connection:
             result = connection.execute(s)
             rows = result.fetchall()
-            return [self._parse_squeak_entry(row) for row in rows]
+        cached_profiles = self._get_cached_profiles()
+        return [self._parse_squeak_entry(row, cached_profiles) for row in rows]
 
     def get_liked_squeak_entries(
             self,
@@ -317,36 +493,34 @@ class SqueakDb:
             last_liked_time_ms,
             last_squeak_hash.hex(),
         ))
-        s = (
-            select([self.squeaks, self.profiles])
-            .select_from(
-                self.squeaks.outerjoin(
-                    self.profiles,
-                    self.profiles.c.address == self.squeaks.c.author_address,
+        squeaks = self.squeaks
+        s = lambda_stmt(
+            lambda: (
+                select([squeaks])
+                .where(
+                    squeaks.c.liked_time_ms != None  # noqa: E711
                 )
-            )
-            .where(
-                self.squeak_is_liked,
-            )
-            .where(
-                tuple_(
-                    self.squeaks.c.liked_time_ms,
-                    self.squeaks.c.hash,
-                ) < tuple_(
-                    last_liked_time_ms,
-                    last_squeak_hash,
+                .where(
+                    tuple_(
+                        squeaks.c.liked_time_ms,
+                        squeaks.c.hash,
+                    ) < tuple_(
+                        last_liked_time_ms,
+                        last_squeak_hash,
+                    )
                 )
+                .order_by(
+                    squeaks.c.liked_time_ms.desc(),
+                    squeaks.c.hash.desc(),
+                )
+                .limit(limit)
             )
-            .order_by(
-                self.squeaks.c.liked_time_ms.desc(),
-                self.squeaks.c.hash.desc(),
-            )
-            .limit(limit)
         )
         with self.get_connection() as connection:
             result = connection.execute(s)
             rows = result.fetchall()
-            return [self._parse_squeak_entry(row) for row in rows]
+        cached_profiles = self._get_cached_profiles()
+        return [self._parse_squeak_entry(row, cached_profiles) for row in rows]
 
     def get_squeak_entries_for_address(
             self,
@@ -371,37 +545,35 @@ class SqueakDb:
             last_squeak_time,
             last_squeak_hash.hex(),
         ))
-        s = (
-            select([self.squeaks, self.profiles])
-            .select_from(
-                self.squeaks.outerjoin(
-                    self.profiles,
-                    self.profiles.c.address == self.squeaks.c.author_address,
+        squeaks = self.squeaks
+        s = lambda_stmt(
+            lambda: (
+                select([squeaks])
+                .where(squeaks.c.author_address == address)
+                .where(
+                    tuple_(
+                        squeaks.c.n_block_height,
+                        squeaks.c.n_time,
+                        squeaks.c.hash,
+                    ) < tuple_(
+                        last_block_height,
+                        last_squeak_time,
+                        last_squeak_hash,
+                    )
                 )
-            )
-            .where(self.squeaks.c.author_address == address)
-            .where(
-                tuple_(
-                    self.squeaks.c.n_block_height,
-                    self.squeaks.c.n_time,
-                    self.squeaks.c.hash,
-                ) < tuple_(
-                    last_block_height,
-                    last_squeak_time,
-                    last_squeak_hash,
+                .order_by(
+                    squeaks.c.n_block_height.desc(),
+                    squeaks.c.n_time.desc(),
+                    squeaks.c.hash.desc(),
                 )
+                .limit(limit)
             )
-            .order_by(
-                self.squeaks.c.n_block_height.desc(),
-                self.squeaks.c.n_time.desc(),
-                self.squeaks.c.hash.desc(),
-            )
-            .limit(limit)
         )
         with self.get_connection() as connection:
             result = connection.execute(s)
             rows = result.fetchall()
-            return [self._parse_squeak_entry(row) for row in rows]
+        cached_profiles = self._get_cached_profiles()
+        return [self._parse_squeak_entry(row, cached_profiles) for row in rows]
 
     def get_squeak_entries_for_text_search(
             self,
@@ -426,20 +598,26 @@ class SqueakDb:
             last_squeak_time,
             last_squeak_hash.hex(),
         ))
-        s = (
-            select([self.squeaks, self.profiles])
-            .select_from(
-                self.squeaks.outerjoin(
-                    self.profiles,
-                    self.profiles.c.address == self.squeaks.c.author_address,
+        squeaks = self.squeaks
+        squeak_fts = self.squeak_fts
+        match_query = get_fts_match_query(search_text)
+        search_pattern = f'%{search_text}%'
+        s = lambda_stmt(lambda: select([squeaks]))
+        if self.use_fts and match_query:
+            s += lambda s: s.where(
+                squeaks.c.hash.in_(
+                    select([squeak_fts.c.hash])
+                    .where(squeak_fts.c.content.match(match_query))
                 )
             )
-            .where(self.squeaks.c.content.ilike(f'%{search_text}%'))
-            .where(
+        else:
+            s += lambda s: s.where(squeaks.c.content.ilike(search_pattern))
+        s += lambda s: (
+            s.where(
                 tuple_(
-                    self.squeaks.c.n_block_height,
-                    self.squeaks.c.n_time,
-                    self.squeaks.c.hash,
+                    squeaks.c.n_block_height,
+                    squeaks.c.n_time,
+                    squeaks.c.hash,
                 ) < tuple_(
                     last_block_height,
                     last_squeak_time,
@@ -447,16 +625,17 @@ class SqueakDb:
                 )
             )
             .order_by(
-                self.squeaks.c.n_block_height.desc(),
-                self.squeaks.c.n_time.desc(),
-                self.squeaks.c.hash.desc(),
+                squeaks.c.n_block_height.desc(),
+                squeaks.c.n_time.desc(),
+                squeaks.c.hash.desc(),
             )
             .limit(limit)
         )
         with self.get_connection() as connection:
             result = connection.execute(s)
             rows = result.fetchall()
-            return [self._parse_squeak_entry(row) for row in rows]
+        cached_profiles = self._get_cached_profiles()
+        return [self._parse_squeak_entry(row, cached_profiles) for row in rows]
 
     def get_thread_ancestor_squeak_entries(self, squeak_hash: bytes) -> List[SqueakEntry]:
         """ Get all reply ancestors of squeak hash. """
@@ -484,14 +663,11 @@ class SqueakDb:
         )
 
         s = (
-            select([self.squeaks, self.profiles])
+            select([self.squeaks])
             .select_from(
                 self.squeaks.join(
                     ancestors,
                     ancestors.c.hash == self.squeaks.c.hash,
-                ).outerjoin(
-                    self.profiles,
-                    self.profiles.c.address == self.squeaks.c.author_address,
                 )
             )
             .order_by(
@@ -502,7 +678,8 @@ class SqueakDb:
         with self.get_connection() as connection:
             result = connection.execute(s)
             rows = result.fetchall()
-            return [self._parse_squeak_entry(row) for row in rows]
+        cached_profiles = self._get_cached_profiles()
+        return [self._parse_squeak_entry(row, cached_profiles) for row in rows]
 
         # sql = """
         # WITH RECURSIVE is_thread_ancestor(hash, depth) AS (
@@ -545,37 +722,35 @@ class SqueakDb:
             last_squeak_time,
             last_squeak_hash.hex(),
         ))
-        s = (
-            select([self.squeaks, self.profiles])
-            .select_from(
-                self.squeaks.outerjoin(
-                    self.profiles,
-                    self.profiles.c.address == self.squeaks.c.author_address,
+        squeaks = self.squeaks
+        s = lambda_stmt(
+            lambda: (
+                select([squeaks])
+                .where(squeaks.c.hash_reply_sqk == squeak_hash)
+                .where(
+                    tuple_(
+                        squeaks.c.n_block_height,
+                        squeaks.c.n_time,
+                        squeaks.c.hash,
+                    ) < tuple_(
+                        last_block_height,
+                        last_squeak_time,
+                        last_squeak_hash,
+                    )
                 )
-            )
-            .where(self.squeaks.c.hash_reply_sqk == squeak_hash)
-            .where(
-                tuple_(
-                    self.squeaks.c.n_block_height,
-                    self.squeaks.c.n_time,
-                    self.squeaks.c.hash,
-                ) < tuple_(
-                    last_block_height,
-                    last_squeak_time,
-                    last_squeak_hash,
+                .order_by(
+                    squeaks.c.n_block_height.desc(),
+                    squeaks.c.n_time.desc(),
+                    squeaks.c.hash.desc(),
                 )
+                .limit(limit)
             )
-            .order_by(
-                self.squeaks.c.n_block_height.desc(),
-                self.squeaks.c.n_time.desc(),
-                self.squeaks.c.hash.desc(),
-            )
-            .limit(limit)
         )
         with self.get_connection() as connection:
             result = connection.execute(s)
             rows = result.fetchall()
-            return [self._parse_squeak_entry(row) for row in rows]
+        cached_profiles = self._get_cached_profiles()
+        return [self._parse_squeak_entry(row, cached_profiles) for row in rows]
 
     def lookup_squeaks(
         self,
@@ -691,7 +866,7 @@ class SqueakDb:
         criteria for deletion.
         """
         s = (
-            select([self.squeaks, self.profiles])
+            select([self.squeaks.c.hash])
             .select_from(
                 self.squeaks.outerjoin(
                     self.profiles,
@@ -720,87 +895,86 @@ class SqueakDb:
         with self.get_connection() as connection:
             res = connection.execute(ins)
             profile_id = res.inserted_primary_key[0]
-            return profile_id
+        self.clear_profile_cache()
+        return profile_id
+
+    def clear_profile_cache(self) -> None:
+        """ Drop the cached profiles, after a profile was changed. """
+        with self.profile_cache_lock:
+            self.profile_cache = None
+
+    def _get_cached_profiles(self) -> Dict[str, SqueakProfile]:
+        """ Get all profiles keyed by address, in profile id order,
+        loading them from the database if they are not cached.
+
+        The load holds the lock, so a change that clears the cache
+        after it is committed can never be overwritten by an older
+        snapshot.
+        """
+        with self.profile_cache_lock:
+            if self.profile_cache is None:
+                s = select([self.profiles]).order_by(
+                    self.profiles.c.profile_id,
+                )
+                with self.get_connection() as connection:
+                    result = connection.execute(s)
+                    rows = result.fetchall()
+                    self.profile_cache = {
+                        row["address"]: self._parse_squeak_profile(row)
+                        for row in rows
+                    }
+            return self.profile_cache
 
     def get_profiles(self) -> List[SqueakProfile]:
         """ Get all profiles. """
-        s = select([self.profiles])
-        with self.get_connection() as connection:
-            result = connection.execute(s)
-            rows = result.fetchall()
-            profiles = [self._parse_squeak_profile(row) for row in rows]
-            return profiles
+        return list(self._get_cached_profiles().values())
 
     def get_signing_profiles(self) -> List[SqueakProfile]:
         """ Get all signing profiles. """
-        s = select([self.profiles]).where(self.profile_has_private_key)
-        with self.get_connection() as connection:
-            result = connection.execute(s)
-            rows = result.fetchall()
-            profiles = [self._parse_squeak_profile(row) for row in rows]
-            return profiles
+        return [
+            profile for profile in self._get_cached_profiles().values()
+            if profile.private_key is not None
+        ]
 
     def get_contact_profiles(self) -> List[SqueakProfile]:
         """ Get all contact profiles. """
-        s = select([self.profiles]).where(self.profile_has_no_private_key)
-        with self.get_connection() as connection:
-            result = connection.execute(s)
-            rows = result.fetchall()
-            profiles = [self._parse_squeak_profile(row) for row in rows]
-            return profiles
+        return [
+            profile for profile in self._get_cached_profiles().values()
+            if profile.private_key is None
+        ]
 
     def get_following_profiles(self) -> List[SqueakProfile]:
         """ Get all following profiles. """
-        s = select([self.profiles]).where(self.profiles.c.following)
-        with self.get_connection() as connection:
-            result = connection.execute(s)
-            rows = result.fetchall()
-            profiles = [self._parse_squeak_profile(row) for row in rows]
-            return profiles
+        return [
+            profile for profile in self._get_cached_profiles().values()
+            if profile.following
+        ]
 
     def get_following_profiles_from_addreses(self, addresses: List[str]) -> List[SqueakProfile]:
         """ Get all following profiles. """
-        s = (
-            select([self.profiles])
-            .where(self.profiles.c.following)
-            .where(self.profiles.c.address.in_(addresses))
-        )
-        with self.get_connection() as connection:
-            result = connection.execute(s)
-            rows = result.fetchall()
-            profiles = [self._parse_squeak_profile(row) for row in rows]
-            return profiles
+        address_set = set(addresses)
+        return [
+            profile for profile in self._get_cached_profiles().values()
+            if profile.following and profile.address in address_set
+        ]
 
     def get_profile(self, profile_id: int) -> Optional[SqueakProfile]:
         """ Get a profile. """
-        s = select([self.profiles]).where(
-            self.profiles.c.profile_id == profile_id)
-        with self.get_connection() as connection:
-            result = connection.execute(s)
-            row = result.fetchone()
-            if row is None:
-                return None
-            return self._parse_squeak_profile(row)
+        for profile in self._get_cached_profiles().values():
+            if profile.profile_id == profile_id:
+                return profile
+        return None
 
     def get_profile_by_address(self, address: str) -> Optional[SqueakProfile]:
         """ Get a profile by address. """
-        s = select([self.profiles]).where(self.profiles.c.address == address)
-        with self.get_connection() as connection:
-            result = connection.execute(s)
-            row = result.fetchone()
-            if row is None:
-                return None
-            return self._parse_squeak_profile(row)
+        return self._get_cached_profiles().get(address)
 
     def get_profile_by_name(self, name: str) -> Optional[SqueakProfile]:
         """ Get a profile by name. """
-        s = select([self.profiles]).where(self.profiles.c.profile_name == name)
-        with self.get_connection() as connection:
-            result = connection.execute(s)
-            row = result.fetchone()
-            if row is None:
-                return None
-            return self._parse_squeak_profile(row)
+        for profile in self._get_cached_profiles().values():
+            if profile.profile_name == name:
+                return profile
+        return None
 
     def set_profile_following(self, profile_id: int, following: bool) -> None:
         """ Set a profile is following. """
@@ -811,6 +985,7 @@ class SqueakDb:
         )
         with self.get_connection() as connection:
             connection.execute(stmt)
+        self.clear_profile_cache()
 
     def set_profile_use_custom_price(self, profile_id: int, use_custom_price: bool) -> None:
         """ Set a profile use custom price. """
@@ -821,6 +996,7 @@ class SqueakDb:
         )
         with self.get_connection() as connection:
             connection.execute(stmt)
+        self.clear_profile_cache()
 
     def set_profile_custom_price_msat(self, profile_id: int, custom_price_msat: int) -> None:
         """ Set a profile custom price in msats. """
@@ -831,6 +1007,7 @@ class SqueakDb:
         )
         with self.get_connection() as connection:
             connection.execute(stmt)
+        self.clear_profile_cache()
 
     def set_profile_name(self, profile_id: int, profile_name: str) -> None:
         """ Set a profile name. """
@@ -841,6 +1018,7 @@ class SqueakDb:
         )
         with self.get_connection() as connection:
             connection.execute(stmt)
+        self.clear_profile_cache()
 
     def delete_profile(self, profile_id: int) -> None:
         """ Delete a profile. """
@@ -849,6 +1027,7 @@ class SqueakDb:
         )
         with self.get_connection() as connection:
             connection.execute(delete_profile_stmt)
+        self.clear_profile_cache()
 
     def set_profile_image(self, profile_id: int, profile_image: bytes) -> None:
         """ Set a profile image. """
@@ -859,47 +1038,87 @@ class SqueakDb:
         )
         with self.get_connection() as connection:
             connection.execute(stmt)
+        self.clear_profile_cache()
 
     def set_squeak_decryption_key(self, squeak_hash: bytes, secret_key: bytes, content: str) -> None:
         """ Set the decryption key and decrypted content of a squeak. """
+        # The secret key of a squeak never changes, so only the first
+        # call writes, and the content is indexed once.
         stmt = (
             self.squeaks.update()
             .where(self.squeaks.c.hash == squeak_hash)
+            .where(self.squeak_has_no_secret_key)
             .values(
                 secret_key=secret_key,
                 content=content,
             )
         )
-        with self.get_connection() as connection:
-            connection.execute(stmt)
+        ins_fts = self.squeak_fts.insert().values(
+            hash=squeak_hash,
+            content=content,
+        )
+        with self.transaction() as connection:
+            result = connection.execute(stmt)
+            if self.use_fts and result.rowcount:
+                connection.execute(ins_fts)
 
     def set_squeak_liked(self, squeak_hash: bytes) -> None:
         """ Set the squeak to be liked. """
-        stmt = (
-            self.squeaks.update()
-            .where(self.squeaks.c.hash == squeak_hash)
-            .values(liked_time_ms=self.timestamp_now_ms)
-        )
         with self.get_connection() as connection:
-            connection.execute(stmt)
+            connection.execute(
+                self.set_squeak_liked_time_stmt,
+                {
+                    "squeak_hash": squeak_hash,
+                    "new_liked_time_ms": self.timestamp_now_ms,
+                },
+            )
 
     def set_squeak_unliked(self, squeak_hash: bytes) -> None:
         """ Set the squeak to be unliked. """
-        stmt = (
-            self.squeaks.update()
-            .where(self.squeaks.c.hash == squeak_hash)
-            .values(liked_time_ms=None)
-        )
         with self.get_connection() as connection:
-            connection.execute(stmt)
+            connection.execute(
+                self.set_squeak_liked_time_stmt,
+                {
+                    "squeak_hash": squeak_hash,
+                    "new_liked_time_ms": None,
+                },
+            )
 
     def delete_squeak(self, squeak_hash: bytes) -> None:
         """ Delete a squeak. """
         delete_squeak_stmt = self.squeaks.delete().where(
             self.squeaks.c.hash == squeak_hash
         )
-        with self.get_connection() as connection:
+        delete_squeak_blob_stmt = self.squeak_blobs.delete().where(
+            self.squeak_blobs.c.hash == squeak_hash
+        )
+        delete_squeak_fts_stmt = self.squeak_fts.delete().where(
+            self.squeak_fts.c.hash == squeak_hash
+        )
+        with self.transaction() as connection:
             connection.execute(delete_squeak_stmt)
+            connection.execute(delete_squeak_blob_stmt)
+            if self.use_fts:
+                connection.execute(delete_squeak_fts_stmt)
+
+    def delete_squeaks(self, squeak_hashes: List[bytes]) -> None:
+        """ Delete squeaks in one transaction. """
+        with self.transaction() as connection:
+            for i in range(0, len(squeak_hashes), DELETE_SQUEAKS_BATCH_SIZE):
+                batch = squeak_hashes[i:i + DELETE_SQUEAKS_BATCH_SIZE]
+                connection.execute(
+                    self.squeaks.delete().where(
+                        self.squeaks.c.hash.in_(batch))
+                )
+                connection.execute(
+                    self.squeak_blobs.delete().where(
+                        self.squeak_blobs.c.hash.in_(batch))
+                )
+                if self.use_fts:
+                    connection.execute(
+                        self.squeak_fts.delete().where(
+                            self.squeak_fts.c.hash.in_(batch))
+                    )
 
     def insert_peer(self, squeak_peer: SqueakPeer) -> int:
         """ Insert a new squeak peer. """
@@ -914,49 +1133,60 @@ class SqueakDb:
         with self.get_connection() as connection:
             res = connection.execute(ins)
             id = res.inserted_primary_key[0]
-            return id
+        self.clear_peer_cache()
+        return id
+
+    def clear_peer_cache(self) -> None:
+        """ Drop the cached peers, after a peer was changed. """
+        with self.peer_cache_lock:
+            self.peer_cache = None
+
+    def _get_cached_peers(self) -> Dict[Tuple[str, int], SqueakPeer]:
+        """ Get all peers keyed by host and port, in peer id order,
+        loading them from the database if they are not cached.
+        """
+        with self.peer_cache_lock:
+            if self.peer_cache is None:
+                s = select([self.peers]).order_by(
+                    self.peers.c.peer_id,
+                )
+                with self.get_connection() as connection:
+                    result = connection.execute(s)
+                    rows = result.fetchall()
+                    self.peer_cache = {
+                        (row["host"], row["port"]): self._parse_squeak_peer(row)
+                        for row in rows
+                    }
+            return self.peer_cache
 
     def get_peer(self, peer_id: int) -> Optional[SqueakPeer]:
         """ Get a peer. """
-        s = select([self.peers]).where(self.peers.c.peer_id == peer_id)
-        with self.get_connection() as connection:
-            result = connection.execute(s)
-            row = result.fetchone()
-            if row is None:
-                return None
-            return self._parse_squeak_peer(row)
+        for peer in self._get_cached_peers().values():
+            if peer.peer_id == peer_id:
+                return peer
+        return None
 
     def get_peer_by_address(self, peer_address: PeerAddress) -> Optional[SqueakPeer]:
         """ Get a peer by address. """
-        s = (
-            select([self.peers])
-            .where(self.peers.c.host == peer_address.host)
-            .where(self.peers.c.port == peer_address.port)
+        return self.get_peer_by_host_port(
+            peer_address.host,
+            peer_address.port,
         )
-        with self.get_connection() as connection:
-            result = connection.execute(s)
-            row = result.fetchone()
-            if row is None:
-                return None
-            return self._parse_squeak_peer(row)
+
+    def get_peer_by_host_port(self, host: str, port: int) -> Optional[SqueakPeer]:
+        """ Get a peer by host and port. """
+        return self._get_cached_peers().get((host, port))
 
     def get_peers(self) -> List[SqueakPeer]:
         """ Get all peers. """
-        s = select([self.peers])
-        with self.get_connection() as connection:
-            result = connection.execute(s)
-            rows = result.fetchall()
-            peers = [self._parse_squeak_peer(row) for row in rows]
-            return peers
+        return list(self._get_cached_peers().values())
 
     def get_autoconnect_peers(self) -> List[SqueakPeer]:
         """ Get peers that are set to be autoconnect. """
-        s = select([self.peers]).where(self.peers.c.autoconnect)
-        with self.get_connection() as connection:
-            result = connection.execute(s)
-            rows = result.fetchall()
-            peers = [self._parse_squeak_peer(row) for row in rows]
-            return peers
+        return [
+            peer for peer in self._get_cached_peers().values()
+            if peer.autoconnect
+        ]
 
     def set_peer_autoconnect(self, peer_id: int, autoconnect: bool):
         """ Set a peer is autoconnect. """
@@ -967,6 +1197,7 @@ class SqueakDb:
         )
         with self.get_connection() as connection:
             connection.execute(stmt)
+        self.clear_peer_cache()
 
     def set_peer_name(self, peer_id: int, peer_name: str):
         """ Set a peer name. """
@@ -977,12 +1208,16 @@ class SqueakDb:
         )
         with self.get_connection() as connection:
             connection.execute(stmt)
+        self.clear_peer_cache()
 
     def delete_peer(self, peer_id: int):
         """ Delete a peer. """
-        delete_peer_stmt = self.peers.delete().where(self.peers.c.peer_id == peer_id)
         with self.get_connection() as connection:
-            connection.execute(delete_peer_stmt)
+            connection.execute(
+                self.delete_peer_stmt,
+                {"peer_id": peer_id},
+            )
+        self.clear_peer_cache()
 
     def insert_received_offer(self, received_offer: ReceivedOffer) -> Optional[int]:
         """ Insert a new received offer.
@@ -1035,12 +1270,11 @@ class SqueakDb:
 
     def get_received_offer(self, received_offer_id: int) -> Optional[ReceivedOffer]:
         """ Get offer with peer for an offer id. """
-        s = (
-            select([self.received_offers])
-            .where(self.received_offers.c.received_offer_id == received_offer_id)
-        )
         with self.get_connection() as connection:
-            result = connection.execute(s)
+            result = connection.execute(
+                self.get_received_offer_stmt,
+                {"received_offer_id": received_offer_id},
+            )
             row = result.fetchone()
             if row is None:
                 return None
@@ -1099,13 +1333,14 @@ class SqueakDb:
 
     def set_received_offer_paid(self, payment_hash: bytes, paid: bool) -> None:
         """ Set a received offer is paid. """
-        stmt = (
-            self.received_offers.update()
-            .where(self.received_offers.c.payment_hash == payment_hash)
-            .values(paid=paid)
-        )
         with self.get_connection() as connection:
-            connection.execute(stmt)
+            connection.execute(
+                self.set_received_offer_paid_stmt,
+                {
+                    "offer_payment_hash": payment_hash,
+                    "new_paid": paid,
+                },
+            )
 
     def insert_sent_payment(self, sent_payment: SentPayment):
         """ Insert a new sent payment. """
@@ -1124,7 +1359,8 @@ class SqueakDb:
         with self.get_connection() as connection:
             res = connection.execute(ins)
             sent_payment_id = res.inserted_primary_key[0]
-            return sent_payment_id
+        self.clear_sent_payment_summary_cache()
+        return sent_payment_id
 
     def get_sent_payments(
             self,
@@ -1214,11 +1450,11 @@ class SqueakDb:
 
     def get_sent_offer_by_payment_hash(self, payment_hash: bytes) -> Optional[SentOffer]:
         """ Get a sent offer by preimage hash. """
-        s = select([self.sent_offers]).where(
-            self.sent_offers.c.payment_hash == payment_hash
-        )
         with self.get_connection() as connection:
-            result = connection.execute(s)
+            result = connection.execute(
+                self.get_sent_offer_by_payment_hash_stmt,
+                {"payment_hash": payment_hash},
+            )
             row = result.fetchone()
             if row is None:
                 return None
@@ -1267,15 +1503,30 @@ class SqueakDb:
             deleted_sent_offers = res.rowcount
             return deleted_sent_offers
 
+    def delete_expired_offers(self, sent_offer_interval_s) -> Tuple[int, int]:
+        """
+        Delete all expired received offers, and the sent offers that
+        have been expired for more than sent_offer_interval_s seconds,
+        in one transaction. Return the numbers of deleted received
+        offers and sent offers.
+        """
+        with self.transaction():
+            deleted_received_offers = self.delete_expired_received_offers()
+            deleted_sent_offers = self.delete_expired_sent_offers(
+                sent_offer_interval_s,
+            )
+        return deleted_received_offers, deleted_sent_offers
+
     def set_sent_offer_paid(self, payment_hash: bytes, paid: bool) -> None:
         """ Set a sent offer is paid. """
-        stmt = (
-            self.sent_offers.update()
-            .where(self.sent_offers.c.payment_hash == payment_hash)
-            .values(paid=paid)
-        )
         with self.get_connection() as connection:
-            connection.execute(stmt)
+            connection.execute(
+                self.set_sent_offer_paid_stmt,
+                {
+                    "offer_payment_hash": payment_hash,
+                    "new_paid": paid,
+                },
+            )
 
     def get_latest_settle_index(self) -> Optional[int]:
         """ Get the lnd settled index of the most recent received payment. """
@@ -1308,11 +1559,12 @@ class SqueakDb:
             try:
                 res = connection.execute(ins)
                 received_payment_id = res.inserted_primary_key[0]
-                return received_payment_id
             except sqlalchemy.exc.IntegrityError:
                 logger.debug(
                     "Failed to insert received payment.", exc_info=True)
                 return None
+        self.clear_received_payment_summary_cache()
+        return received_payment_id
 
     def get_received_payments(
             self,
@@ -1321,32 +1573,30 @@ class SqueakDb:
     ) -> List[ReceivedPayment]:
         """ Get all received payments. """
         last_created_time = last_received_payment.created_time_ms if last_received_payment else self.timestamp_now_ms
-        last_payment_hash = last_received_payment.payment_hash if last_received_payment else MAX_HASH
+        last_received_payment_id = last_received_payment.received_payment_id if last_received_payment else MAX_INT
         logger.info("""Get received payments db query with
         limit: {}
         last_created_time: {}
-        last_payment_hash: {}
+        last_received_payment_id: {}
         """.format(
             limit,
             last_created_time,
-            last_payment_hash.hex(),
+            last_received_payment_id,
         ))
         s = (
             select([self.received_payments])
-            .order_by(
-            )
             .where(
                 tuple_(
                     self.received_payments.c.created_time_ms,
-                    self.received_payments.c.payment_hash,
+                    self.received_payments.c.received_payment_id,
                 ) < tuple_(
                     last_created_time,
-                    last_payment_hash,
+                    last_received_payment_id,
                 )
             )
             .order_by(
                 self.received_payments.c.created_time_ms.desc(),
-                self.received_payments.c.payment_hash.desc(),
+                self.received_payments.c.received_payment_id.desc(),
             )
             .limit(limit)
         )
@@ -1375,49 +1625,72 @@ class SqueakDb:
             )
             .where(self.received_payments.c.received_payment_id > start_index)
         )
-        with self.get_connection() as connection:
-            result = connection.execute(s)
+        # Use a connection of its own, because the caller may do other
+        # work on this thread between items.
+        with self.engine.connect() as connection:
+            result = connection.execution_options(
+                stream_results=True,
+            ).execute(s).yield_per(RECEIVED_PAYMENTS_STREAM_BATCH_SIZE)
             for row in result:
                 received_payment = self._parse_received_payment(row)
                 yield received_payment
 
+    def clear_received_payment_summary_cache(self) -> None:
+        """ Drop the cached received payment summary, after a received
+        payment was inserted.
+        """
+        with self.received_payment_summary_cache_lock:
+            self.received_payment_summary_cache = None
+
+    def clear_sent_payment_summary_cache(self) -> None:
+        """ Drop the cached sent payment summary, after a sent payment
+        was inserted.
+        """
+        with self.sent_payment_summary_cache_lock:
+            self.sent_payment_summary_cache = None
+
     def get_received_payment_summary(self) -> ReceivedPaymentSummary:
         """ Get received payment summary. """
-        s = select([
-            func.count().label("num_payments_received"),
-            func.sum(self.received_payments.c.price_msat).label(
-                "total_amount_received_msat"),
-        ]).select_from(self.received_payments)
-        with self.get_connection() as connection:
-            result = connection.execute(s)
-            row = result.fetchone()
-            received_payment_summary = self._parse_received_payment_summary(
-                row)
-            return received_payment_summary
+        with self.received_payment_summary_cache_lock:
+            if self.received_payment_summary_cache is None:
+                s = select([
+                    func.count().label("num_payments_received"),
+                    func.sum(self.received_payments.c.price_msat).label(
+                        "total_amount_received_msat"),
+                ]).select_from(self.received_payments)
+                with self.get_connection() as connection:
+                    result = connection.execute(s)
+                    row = result.fetchone()
+                    self.received_payment_summary_cache = self._parse_received_payment_summary(
+                        row)
+            return self.received_payment_summary_cache
 
     def get_sent_payment_summary(self) -> SentPaymentSummary:
         """ Get sent payment summary. """
-        s = select([
-            func.count().label("num_payments_sent"),
-            func.sum(self.sent_payments.c.price_msat).label(
-                "total_amount_sent_msat"),
-        ]).select_from(self.sent_payments)
-        with self.get_connection() as connection:
-            result = connection.execute(s)
-            row = result.fetchone()
-            sent_payment_summary = self._parse_sent_payment_summary(row)
-            return sent_payment_summary
+        with self.sent_payment_summary_cache_lock:
+            if self.sent_payment_summary_cache is None:
+                s = select([
+                    func.count().label("num_payments_sent"),
+                    func.sum(self.sent_payments.c.price_msat).label(
+                        "total_amount_sent_msat"),
+                ]).select_from(self.sent_payments)
+                with self.get_connection() as connection:
+                    result = connection.execute(s)
+                    row = result.fetchone()
+                    self.sent_payment_summary_cache = self._parse_sent_payment_summary(
+                        row)
+            return self.sent_payment_summary_cache
 
     def _parse_squeak(self, row) -> CSqueak:
         return CSqueak.deserialize(row["squeak"])
 
-    def _parse_squeak_entry(self, row) -> SqueakEntry:
+    def _parse_squeak_entry(self, row, cached_profiles: Dict[str, SqueakProfile]) -> SqueakEntry:
         secret_key_column = row["secret_key"]
         is_locked = bool(secret_key_column)
         reply_to = (
             row["hash_reply_sqk"]) if row["hash_reply_sqk"] else None
         liked_time_ms = row["liked_time_ms"]
-        profile = self._try_parse_squeak_profile(row)
+        profile = cached_profiles.get(row["author_address"])
         return SqueakEntry(
             squeak_hash=(row["hash"]),
             address=row["author_address"],
@@ -1446,11 +1719,6 @@ class SqueakDb:
             profile_image=row["profile_image"],
         )
 
-    def _try_parse_squeak_profile(self, row) -> Optional[SqueakProfile]:
-        if row["profile_id"] is None:
-            return None
-        return self._parse_squeak_profile(row)
-
     def _parse_squeak_peer(self, row) -> SqueakPeer:
         return SqueakPeer(
             peer_id=row[self.peers.c.peer_id],
@@ -1479,22 +1747,14 @@ class SqueakDb:
                 host=row["lightning_host"],
                 port=row["lightning_port"],
             ),
-            peer_address=PeerAddress(
-                host=row["peer_host"],
-                port=row["peer_port"],
-                use_tor=row["peer_use_tor"],
-            ),
+            peer_address=self._parse_peer_address(row),
         )
 
     def _parse_sent_payment(self, row) -> SentPayment:
         return SentPayment(
             sent_payment_id=row["sent_payment_id"],
             created_time_ms=row[self.sent_payments.c.created_time_ms],
-            peer_address=PeerAddress(
-                host=row["peer_host"],
-                port=row["peer_port"],
-                use_tor=row["peer_use_tor"],
-            ),
+            peer_address=self._parse_peer_address(row),
             squeak_hash=(row["squeak_hash"]),
             payment_hash=(row["payment_hash"]),
             secret_key=(row["secret_key"]),
@@ -1514,11 +1774,7 @@ class SqueakDb:
             payment_request=row["payment_request"],
             invoice_time=row["invoice_timestamp"],
             invoice_expiry=row["invoice_expiry"],
-            peer_address=PeerAddress(
-                host=row["peer_host"],
-                port=row["peer_port"],
-                use_tor=row["peer_use_tor"],
-            ),
+            peer_address=self._parse_peer_address(row),
         )
 
     def _parse_received_payment(self, row) -> ReceivedPayment:
@@ -1529,11 +1785,14 @@ class SqueakDb:
             payment_hash=(row["payment_hash"]),
             price_msat=row["price_msat"],
             settle_index=row["settle_index"],
-            peer_address=PeerAddress(
-                host=row["peer_host"],
-                port=row["peer_port"],
-                use_tor=row["peer_use_tor"],
-            ),
+            peer_address=self._parse_peer_address(row),
+        )
+
+    def _parse_peer_address(self, row) -> PeerAddress:
+        return PeerAddress(
+            host=row["peer_host"],
+            port=row["peer_port"],
+            use_tor=row["peer_use_tor"],
         )
 
     def _parse_received_payment_summary(self, row) -> ReceivedPaymentSummary:
@@ -22,6 +22,9 @@
 import codecs
 import logging
 import os
+from typing import Callable
+from typing import Dict
+from typing import Iterator
 
 import grpc
 
@@ -57,10 +60,29 @@ class LNDLightningClient:
         self.tls_cert_path = tls_cert_path
         self.macaroon_path = macaroon_path
         # self.stub = None
+        self.raw_methods: Dict[str, Callable] = {}
 
     def init(self):
         self.stub = self._get_stub()
 
+    def get_raw_unary_unary(self, method: str) -> Callable[[bytes], bytes]:
+        """Get a callable for a lightning method that sends and receives
+        serialized messages without parsing them."""
+        if method not in self.raw_methods:
+            self.raw_methods[method] = self.channel.unary_unary(
+                "/lnrpc.Lightning/{}".format(method),
+            )
+        return self.raw_methods[method]
+
+    def get_raw_unary_stream(self, method: str) -> Callable[[bytes], Iterator[bytes]]:
+        """Get a callable for a lightning streaming method that sends and
+        receives serialized messages without parsing them."""
+        if method not in self.raw_methods:
+            self.raw_methods[method] = self.channel.unary_stream(
+                "/lnrpc.Lightning/{}".format(method),
+            )
+        return self.raw_methods[method]
+
     def _get_stub(self):
         url = "{}:{}".format(self.host, self.port)
 
@@ -89,8 +111,8 @@ class LNDLightningClient:
             cert_creds, auth_creds)
 
         # finally pass in the combined credentials when creating a channel
-        channel = grpc.secure_channel(url, combined_creds)
-        return lnd_pb2_grpc.LightningStub(channel)
+        self.channel = grpc.secure_channel(url, combined_creds)
+        return lnd_pb2_grpc.LightningStub(self.channel)
 
     def add_invoice(self, preimage: bytes, amount_msat: int) -> lnd_pb2.AddInvoiceResponse:
         invoice = lnd_pb2.Invoice(
@@ -27,6 +27,9 @@ from signal import signal
 from signal import SIGTERM
 from threading import Event
 
+# The protobuf stubs do not cover the internal package.
+from google.protobuf.internal import api_implementation  # type: ignore
+
 from squeaknode.config.config import SqueaknodeConfig
 from squeaknode.node.squeak_node import SqueakNode
 
@@ -82,6 +85,13 @@ def main():
 
 def run_node(config):
     logger.info("Config: {}".format(config))
+    protobuf_implementation = api_implementation.Type()
+    logger.info("Protobuf implementation: {}".format(protobuf_implementation))
+    if protobuf_implementation == "python":
+        logger.warning(
+            "Using the pure-Python protobuf backend. Set "
+            "PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION=cpp for faster "
+            "admin RPC responses.")
     signal(SIGTERM, handler)
     signal(SIGINT, handler)
     signal(SIGHUP, handler)
@@ -104,18 +104,17 @@ class NetworkManager(object):
             try:
                 peer.send_msg(msg)
             except Exception:
-                logger.exception("Failed to send msg to peer: {}".format(
-                    peer,
-                ))
+                logger.exception("Failed to send msg to peer: %s", peer)
 
     def update_local_subscriptions(self, locator: CSqueakLocator) -> None:
         for peer in self.connection_manager.peers:
             try:
                 peer.update_local_subscription(locator)
             except Exception:
-                logger.exception("Failed to update local subcription with peer: {}".format(
+                logger.exception(
+                    "Failed to update local subcription with peer: %s",
                     peer,
-                ))
+                )
 
     @property
     def local_address(self) -> PeerAddress:
@@ -136,9 +135,7 @@ class NetworkManager(object):
     def subscribe_connected_peers(self, stopped) -> Iterable[List[Peer]]:
         # yield from self.connection_manager.yield_peers_changed(stopped)
         for item in self.connection_manager.yield_peers_changed(stopped):
-            logger.info("subscribe_connected_peers yielding item: {}".format(
-                item,
-            ))
+            logger.debug("subscribe_connected_peers yielding item: %s", item)
             yield item
 
     def subscribe_connected_peer(self, peer_address: PeerAddress, stopped) -> Iterable[Peer]:
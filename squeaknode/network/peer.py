@@ -239,7 +239,7 @@ class Peer(object):
         try:
             with self._peer_socket_lock:
                 self._peer_socket.send(data)
-                self.record_msg_sent(msg)
+                self.record_msg_sent(len(data))
                 self.on_peer_updated()
         except Exception:
             logger.info('Failed to send msg to {}'.format(self))
@@ -337,10 +337,9 @@ class Peer(object):
         self._num_bytes_received += len(msg.to_bytes())
         self._last_msg_revc_time = time_now()
 
-    def record_msg_sent(self, msg):
-        if msg:
-            self._num_msgs_sent += 1
-            self._num_bytes_sent += len(msg.to_bytes())
+    def record_msg_sent(self, num_bytes):
+        self._num_msgs_sent += 1
+        self._num_bytes_sent += num_bytes
 
     # def subscribe_peer_state(self, stopped):
     #     for result in self.peer_changed_listener.yield_items(stopped):
@@ -22,29 +22,58 @@
 import logging
 import queue
 import threading
+import time
 import uuid
 from contextlib import contextmanager
 logger = logging.getLogger(__name__)
 DEFAULT_MAX_QUEUE_SIZE = 1000
 DEFAULT_UPDATE_INTERVAL_S = 1
+DEFAULT_MAX_BATCH_SIZE = 32
+DEFAULT_MAX_BATCH_WAIT_S = 0.005
 
 
 class EventListener:
     def __init__(self):
         self.callbacks = {}
+        self.keyed_callbacks = {}
+        # Guards both callback dicts, because subscriptions are added
+        # and removed by other threads.
+        self.callbacks_lock = threading.Lock()
 
-    def handle_new_item(self, item):
-        for callback in self.callbacks.values():
+    def handle_new_item(self, item, keys=()):
+        """Pass the item to every unkeyed callback, and to the callbacks
+        registered under any of the given keys."""
+        # Copy the callbacks under the lock, and call them outside of
+        # it, because a callback can block on a full queue.
+        with self.callbacks_lock:
+            callbacks = list(self.callbacks.values())
+            for key in keys:
+                callbacks.extend(self.keyed_callbacks.get(key, {}).values())
+        for callback in callbacks:
             callback(item)
 
-    def add_callback(self, name, callback):
-        self.callbacks[name] = callback
+    def has_callbacks(self):
+        return bool(self.callbacks or self.keyed_callbacks)
 
-    def remove_callback(self, name):
-        del self.callbacks[name]
+    def add_callback(self, name, callback, key=None):
+        with self.callbacks_lock:
+            if key is None:
+                self.callbacks[name] = callback
+            else:
+                self.keyed_callbacks.setdefault(key, {})[name] = callback
+
+    def remove_callback(self, name, key=None):
+        with self.callbacks_lock:
+            if key is None:
+                del self.callbacks[name]
+            else:
+                key_callbacks = self.keyed_callbacks[key]
+                del key_callbacks[name]
+                if not key_callbacks:
+                    del self.keyed_callbacks[key]
 
     @contextmanager
-    def get_subscription(self, stopped: threading.Event):
+    def get_subscription(self, stopped: threading.Event, key=None):
         client = ListenerSubscriptionClient(
             stopped,
         )
@@ -56,7 +85,7 @@ class EventListener:
         callback_name = "new_item_callback_{}".format(uuid.uuid1()),
 
         logger.debug("Adding callback.")
-        self.add_callback(callback_name, client.enqueue_item)
+        self.add_callback(callback_name, client.enqueue_item, key=key)
         try:
             logger.debug("Yielding client.")
             yield client
@@ -64,13 +93,28 @@ class EventListener:
             logger.exception("Subscription client failed.")
         finally:
             logger.debug("Removing callback.")
-            self.remove_callback(callback_name)
+            self.remove_callback(callback_name, key=key)
 
-    def yield_items(self, stopped: threading.Event):
-        with self.get_subscription(stopped) as client:
+    def yield_items(self, stopped: threading.Event, key=None):
+        """Yield new items. If a key is given, only the items handled
+        with that key are yielded."""
+        with self.get_subscription(stopped, key=key) as client:
             for result in client.get_item():
                 yield result
 
+    def yield_item_batches(
+            self,
+            stopped: threading.Event,
+            max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+            max_batch_wait_s: float = DEFAULT_MAX_BATCH_WAIT_S,
+    ):
+        with self.get_subscription(stopped) as client:
+            for batch in client.get_item_batches(
+                    max_batch_size,
+                    max_batch_wait_s,
+            ):
+                yield batch
+
 
 class ListenerSubscriptionClient():
     def __init__(
@@ -97,6 +141,34 @@ class ListenerSubscriptionClient():
             yield item
             self.q.task_done()
             logger.debug(
-                "Removed item from queue. Size: {}".format(
-                    self.q.qsize())
+                "Removed item from queue. Size: %s",
+                self.q.qsize(),
             )
+
+    def get_item_batches(self, max_batch_size: int, max_batch_wait_s: float):
+        """Yield lists of items. A batch is yielded once it is full, or
+        when max_batch_wait_s has passed since its first item arrived."""
+        while True:
+            item = self.q.get()
+            if item is None:
+                logger.debug("Poison pill swallowed.")
+                return
+            batch = [item]
+            stopped = False
+            deadline = time.monotonic() + max_batch_wait_s
+            while len(batch) < max_batch_size:
+                remaining_s = deadline - time.monotonic()
+                if remaining_s <= 0:
+                    break
+                try:
+                    item = self.q.get(timeout=remaining_s)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopped = True
+                    break
+                batch.append(item)
+            yield batch
+            if stopped:
+                logger.debug("Poison pill swallowed.")
+                return
@@ -34,6 +34,7 @@ class PeerConnectionWorker(PeriodicWorker):
         squeak_controller: SqueakController,
         connect_interval_s: int,
     ):
+        super().__init__()
         self.squeak_controller = squeak_controller
         self.connect_interval_s = connect_interval_s
 
@@ -26,6 +26,8 @@ from abc import abstractmethod
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_STOP_TIMEOUT_S = 5
+
 
 class Worker(ABC):
 
@@ -33,10 +35,19 @@ class Worker(ABC):
     def start(self) -> None:
         pass
 
+    @abstractmethod
+    def stop(self) -> None:
+        pass
+
 
 class PeriodicWorker(Worker):
     """Access a bitcoin daemon using RPC."""
 
+    def __init__(self):
+        self.stopped = threading.Event()
+        self.work_lock = threading.Lock()
+        self.timer = None
+
     @abstractmethod
     def work_fn(self) -> None:
         pass
@@ -50,15 +61,18 @@ class PeriodicWorker(Worker):
         pass
 
     def do_work(self):
-        if self.get_interval_s():
-            timer = threading.Timer(
-                self.get_interval_s(),
-                self.do_work,
-            )
-            timer.daemon = True
-            timer.name = "{}_thread".format(self.get_name())
-            timer.start()
-            self.work_fn()
+        with self.work_lock:
+            if self.stopped.is_set():
+                return
+            if self.get_interval_s():
+                self.timer = threading.Timer(
+                    self.get_interval_s(),
+                    self.do_work,
+                )
+                self.timer.daemon = True
+                self.timer.name = "{}_thread".format(self.get_name())
+                self.timer.start()
+                self.work_fn()
 
     def start(self) -> None:
         thread = threading.Thread(
@@ -66,3 +80,16 @@ class PeriodicWorker(Worker):
             args=(),
         )
         thread.start()
+
+    def stop(self, timeout_s: float = DEFAULT_STOP_TIMEOUT_S) -> None:
+        """Stop scheduling new runs, and wait up to timeout_s for a run
+        that is already in progress to finish."""
+        self.stopped.set()
+        if self.work_lock.acquire(timeout=timeout_s):
+            if self.timer is not None:
+                self.timer.cancel()
+            self.work_lock.release()
+        else:
+            logger.warning("Timed out waiting for {} to stop.".format(
+                self.get_name(),
+            ))
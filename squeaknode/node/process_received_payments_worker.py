@@ -22,6 +22,8 @@
 import logging
 import threading
 
+from squeaknode.node.periodic_worker import DEFAULT_STOP_TIMEOUT_S
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,16 +31,20 @@ class ProcessReceivedPaymentsWorker:
     def __init__(self, payment_processor):
         self.payment_processor = payment_processor
         self.stopped = threading.Event()
+        self.thread = None
 
     def start_running(self):
-        threading.Thread(
+        self.thread = threading.Thread(
             target=self.process_subscribed_invoices,
             # daemon=True,
             name="process_received_payments_thread",
-        ).start()
+        )
+        self.thread.start()
 
-    def stop_running(self):
+    def stop_running(self, timeout_s: float = DEFAULT_STOP_TIMEOUT_S):
         self.stopped.set()
+        if self.thread is not None:
+            self.thread.join(timeout_s)
 
     def process_subscribed_invoices(self):
         logger.info("Starting ProcessReceivedPaymentsWorker...")
@@ -67,9 +67,9 @@ class ReceivedPaymentsSubscriptionClient:
                 for payment in self.get_latest_received_payments(payment_index):
                     self.q.put(payment)
                     payment_index = payment.received_payment_id
-                    logger.info(
-                        "Added payment to queue. Size: {}".format(
-                            self.q.qsize())
+                    logger.debug(
+                        "Added payment to queue. Size: %s",
+                        self.q.qsize(),
                     )
             except Exception:
                 logger.error(
@@ -94,7 +94,7 @@ class ReceivedPaymentsSubscriptionClient:
                 return
             yield payment
             self.q.task_done()
-            logger.info(
-                "Removed payment from queue. Size: {}".format(
-                    self.q.qsize())
+            logger.debug(
+                "Removed payment from queue. Size: %s",
+                self.q.qsize(),
             )
@@ -21,9 +21,12 @@
 # SOFTWARE.
 import logging
 import threading
+from contextlib import contextmanager
+from typing import Dict
 from typing import Iterable
 from typing import List
 from typing import Optional
+from typing import Tuple
 from typing import Union
 
 import squeak.params
@@ -64,6 +67,30 @@ from squeaknode.node.temporary_interest_manager import TemporaryInterestManager
 logger = logging.getLogger(__name__)
 
 
+# Keys for the new squeak subscriptions, so that a new squeak is only
+# passed to the subscribers that are interested in it.
+def squeak_hash_key(squeak_hash: bytes) -> Tuple[str, bytes]:
+    return ("hash", squeak_hash)
+
+
+def squeak_reply_to_key(squeak_hash: bytes) -> Tuple[str, bytes]:
+    return ("reply_to", squeak_hash)
+
+
+def squeak_address_key(address: str) -> Tuple[str, str]:
+    return ("address", address)
+
+
+def get_squeak_entry_keys(squeak_entry: SqueakEntry) -> List[Tuple[str, Union[bytes, str]]]:
+    keys: List[Tuple[str, Union[bytes, str]]] = [
+        squeak_hash_key(squeak_entry.squeak_hash),
+        squeak_address_key(squeak_entry.address),
+    ]
+    if squeak_entry.reply_to is not None:
+        keys.append(squeak_reply_to_key(squeak_entry.reply_to))
+    return keys
+
+
 class SqueakController:
 
     def __init__(
@@ -79,12 +106,13 @@ class SqueakController:
         self.payment_processor = payment_processor
         self.network_manager = network_manager
         self.new_squeak_listener = EventListener()
+        self.new_squeak_entry_listener = EventListener()
         self.new_received_offer_listener = EventListener()
         self.new_secret_key_listener = EventListener()
         self.temporary_interest_manager = TemporaryInterestManager()
         self.config = config
 
-    def save_squeak(self, squeak: CSqueak) -> Optional[bytes]:
+    def save_squeak(self, squeak: CSqueak, publish_entry: bool = True) -> Optional[bytes]:
         # Check if the squeak is valid
         self.squeak_core.check_squeak(squeak)
         # Get the block header for the squeak.
@@ -99,13 +127,68 @@ class SqueakController:
         )
         if inserted_squeak_hash is None:
             return None
-        logger.info("Saved squeak: {}".format(
-            inserted_squeak_hash.hex(),
-        ))
-        # Notify the listener
-        self.new_squeak_listener.handle_new_item(squeak)
+        self._handle_saved_squeak(
+            squeak,
+            inserted_squeak_hash,
+            publish_entry,
+        )
         return inserted_squeak_hash
 
+    def save_squeaks(
+            self,
+            squeaks: List[CSqueak],
+            publish_entry: bool = True,
+    ) -> List[Optional[bytes]]:
+        """Save squeaks with a single bulk insert. Return the hash of each
+        inserted squeak, or None for each squeak that already exists."""
+        squeak_block_headers = []
+        for new_squeak in squeaks:
+            self.squeak_core.check_squeak(new_squeak)
+            block_header = self.squeak_core.get_block_header(new_squeak)
+            squeak_block_headers.append((new_squeak, block_header))
+        inserted_squeak_hashes = self.squeak_db.insert_squeaks(
+            squeak_block_headers,
+            max_squeaks=self.config.node.max_squeaks,
+        )
+        for new_squeak, inserted_squeak_hash in zip(squeaks, inserted_squeak_hashes):
+            if inserted_squeak_hash is not None:
+                self._handle_saved_squeak(
+                    new_squeak,
+                    inserted_squeak_hash,
+                    publish_entry,
+                )
+        return inserted_squeak_hashes
+
+    def _handle_saved_squeak(
+            self,
+            squeak: CSqueak,
+            squeak_hash: bytes,
+            publish_entry: bool,
+    ) -> None:
+        logger.info("Saved squeak: %s", squeak_hash.hex())
+        # Notify the listeners
+        self.new_squeak_listener.handle_new_item(
+            squeak,
+            keys=(squeak_hash_key(squeak_hash),),
+        )
+        # Squeaks made by this node are published by the make methods,
+        # after they are unlocked.
+        if publish_entry:
+            self._publish_new_squeak_entry(squeak_hash)
+
+    def _publish_new_squeak_entry(self, squeak_hash: bytes) -> None:
+        # Look up the entry once here, instead of once in every
+        # subscription that the new squeak is passed to.
+        if not self.new_squeak_entry_listener.has_callbacks():
+            return
+        squeak_entry = self.get_squeak_entry(squeak_hash)
+        if squeak_entry is None:
+            return
+        self.new_squeak_entry_listener.handle_new_item(
+            squeak_entry,
+            keys=get_squeak_entry_keys(squeak_entry),
+        )
+
     def unlock_squeak(self, squeak_hash: bytes, secret_key: bytes):
         squeak = self.squeak_db.get_squeak(squeak_hash)
         decrypted_content = self.squeak_core.get_decrypted_content(
@@ -117,25 +200,68 @@ class SqueakController:
             secret_key,
             decrypted_content,
         )
-        logger.info("Unlocked squeak: {}".format(
-            squeak_hash.hex(),
-        ))
+        logger.info("Unlocked squeak: %s", squeak_hash.hex())
         # Notify the listener
         self.new_secret_key_listener.handle_new_item(squeak)
 
-    def make_squeak(self, profile_id: int, content_str: str, replyto_hash: bytes) -> Optional[bytes]:
+    def make_squeak(self, profile_id: int, content_str: str, replyto_hash: Optional[bytes]) -> Optional[bytes]:
         squeak_profile = self.squeak_db.get_profile(profile_id)
+        return self._make_squeak_with_profile(
+            squeak_profile, content_str, replyto_hash)
+
+    def make_squeaks(
+            self,
+            squeak_params: Iterable[Tuple[int, str, Optional[bytes]]],
+    ) -> List[Optional[bytes]]:
+        """Make squeaks from (profile_id, content_str, replyto_hash)
+        tuples, looking up each profile only once."""
+        squeak_profiles: Dict[int, Optional[SqueakProfile]] = {}
+        squeaks = []
+        decryption_keys = []
+        for profile_id, content_str, replyto_hash in squeak_params:
+            if profile_id not in squeak_profiles:
+                squeak_profiles[profile_id] = self.squeak_db.get_profile(
+                    profile_id)
+            squeak, decryption_key = self.squeak_core.make_squeak(
+                squeak_profiles[profile_id], content_str, replyto_hash)
+            squeaks.append(squeak)
+            decryption_keys.append(decryption_key)
+        inserted_squeak_hashes = self.save_squeaks(
+            squeaks,
+            publish_entry=False,
+        )
+        for inserted_squeak_hash, decryption_key in zip(inserted_squeak_hashes, decryption_keys):
+            if inserted_squeak_hash is not None:
+                self.unlock_squeak(inserted_squeak_hash, decryption_key)
+                self._publish_new_squeak_entry(inserted_squeak_hash)
+        return inserted_squeak_hashes
+
+    def _make_squeak_with_profile(
+            self,
+            squeak_profile: Optional[SqueakProfile],
+            content_str: str,
+            replyto_hash: Optional[bytes],
+    ) -> Optional[bytes]:
         squeak, decryption_key = self.squeak_core.make_squeak(
             squeak_profile, content_str, replyto_hash)
-        inserted_squeak_hash = self.save_squeak(squeak)
+        inserted_squeak_hash = self.save_squeak(squeak, publish_entry=False)
         if inserted_squeak_hash is None:
             return None
         self.unlock_squeak(
             inserted_squeak_hash,
             decryption_key,
         )
+        self._publish_new_squeak_entry(inserted_squeak_hash)
         return inserted_squeak_hash
 
+    @contextmanager
+    def db_connection(self):
+        """Run the enclosed calls on this thread on one database
+        connection, instead of checking one out of the pool per query.
+        """
+        with self.squeak_db.get_connection():
+            yield
+
     def get_squeak(self, squeak_hash: bytes) -> Optional[CSqueak]:
         return self.squeak_db.get_squeak(squeak_hash)
 
@@ -145,7 +271,7 @@ class SqueakController:
     def delete_squeak(self, squeak_hash: bytes) -> None:
         num_deleted_offers = self.squeak_db.delete_offers_for_squeak(
             squeak_hash)
-        logger.info("Deleted number of offers : {}".format(num_deleted_offers))
+        logger.info("Deleted number of offers : %s", num_deleted_offers)
         self.squeak_db.delete_squeak(squeak_hash)
 
     def save_received_squeak(self, squeak: CSqueak) -> None:
@@ -341,6 +467,9 @@ class SqueakController:
     def get_peer_by_address(self, peer_address: PeerAddress) -> Optional[SqueakPeer]:
         return self.squeak_db.get_peer_by_address(peer_address)
 
+    def get_peer_by_host_port(self, host: str, port: int) -> Optional[SqueakPeer]:
+        return self.squeak_db.get_peer_by_host_port(host, port)
+
     def get_peers(self):
         return self.squeak_db.get_peers()
 
@@ -381,7 +510,7 @@ class SqueakController:
             raise Exception("Received offer with id {} not found.".format(
                 received_offer_id,
             ))
-        logger.info("Paying received offer: {}".format(received_offer))
+        logger.info("Paying received offer: %s", received_offer)
         sent_payment = self.squeak_core.pay_offer(received_offer)
         sent_payment_id = self.squeak_db.insert_sent_payment(sent_payment)
         # # Delete the received offer
@@ -423,21 +552,19 @@ class SqueakController:
             last_received_payment,
         )
 
-    def delete_all_expired_received_offers(self):
-        num_expired_received_offers = self.squeak_db.delete_expired_received_offers()
-        if num_expired_received_offers > 0:
-            logger.info("Deleted number of expired received offers: {}".format(
-                num_expired_received_offers))
-
-    def delete_all_expired_sent_offers(self):
+    def delete_all_expired_offers(self):
         sent_offer_retention_s = self.config.node.sent_offer_retention_s
-        num_expired_sent_offers = self.squeak_db.delete_expired_sent_offers(
-            sent_offer_retention_s,
-        )
+        num_expired_received_offers, num_expired_sent_offers = \
+            self.squeak_db.delete_expired_offers(sent_offer_retention_s)
+        if num_expired_received_offers > 0:
+            logger.info(
+                "Deleted number of expired received offers: %s",
+                num_expired_received_offers,
+            )
         if num_expired_sent_offers > 0:
             logger.info(
-                "Deleted number of expired sent offers: {}".format(
-                    num_expired_sent_offers)
+                "Deleted number of expired sent offers: %s",
+                num_expired_sent_offers,
             )
 
     def subscribe_received_payments(self, initial_index: int, stopped: threading.Event):
@@ -542,10 +669,13 @@ class SqueakController:
             received_offer)
         if received_offer_id is None:
             return
-        logger.info("Saved received offer: {}".format(received_offer))
+        logger.info("Saved received offer: %s", received_offer)
         received_offer = received_offer._replace(
             received_offer_id=received_offer_id)
-        self.new_received_offer_listener.handle_new_item(received_offer)
+        self.new_received_offer_listener.handle_new_item(
+            received_offer,
+            keys=(received_offer.squeak_hash,),
+        )
 
     def get_followed_addresses(self) -> List[str]:
         followed_profiles = self.squeak_db.get_following_profiles()
@@ -565,34 +695,24 @@ class SqueakController:
         squeaks_to_delete = self.squeak_db.get_old_squeaks_to_delete(
             self.config.node.squeak_retention_s,
         )
+        self.squeak_db.delete_squeaks(squeaks_to_delete)
         for squeak_hash in squeaks_to_delete:
-            self.squeak_db.delete_squeak(
-                squeak_hash,
-            )
-            logger.info("Deleted squeak: {}".format(
-                squeak_hash.hex(),
-            ))
+            logger.info("Deleted squeak: %s", squeak_hash.hex())
 
     def like_squeak(self, squeak_hash: bytes):
-        logger.info("Liking squeak: {}".format(
-            squeak_hash.hex(),
-        ))
+        logger.info("Liking squeak: %s", squeak_hash.hex())
         self.squeak_db.set_squeak_liked(
             squeak_hash,
         )
 
     def unlike_squeak(self, squeak_hash: bytes):
-        logger.info("Unliking squeak: {}".format(
-            squeak_hash.hex(),
-        ))
+        logger.info("Unliking squeak: %s", squeak_hash.hex())
         self.squeak_db.set_squeak_unliked(
             squeak_hash,
         )
 
     def connect_peer(self, peer_address: PeerAddress) -> None:
-        logger.info("Connect to peer: {}".format(
-            peer_address,
-        ))
+        logger.info("Connect to peer: %s", peer_address)
         self.network_manager.connect_peer_sync(peer_address)
 
     def connect_saved_peers(self) -> None:
@@ -674,7 +794,7 @@ class SqueakController:
 
     def download_squeaks(
             self,
-            addresses: List[str],
+            addresses: Iterable[str],
             min_block: int,
             max_block: int,
             replyto_hash: Optional[bytes],
@@ -701,9 +821,7 @@ class SqueakController:
         self.broadcast_msg(getsqueaks_msg)
 
     def download_single_squeak(self, squeak_hash: bytes):
-        logger.info("Downloading single squeak: {}".format(
-            squeak_hash.hex(),
-        ))
+        logger.info("Downloading single squeak: %s", squeak_hash.hex())
         # Add the temporary interest in this hash.
         self.temporary_interest_manager.add_hash_interest(1, squeak_hash)
         invs = [
@@ -715,9 +833,7 @@ class SqueakController:
         self.broadcast_msg(getdata_msg)
 
     def download_offers(self, squeak_hash: bytes):
-        logger.info("Downloading offers for squeak: {}".format(
-            squeak_hash.hex(),
-        ))
+        logger.info("Downloading offers for squeak: %s", squeak_hash.hex())
         invs = [
             CInv(type=2, hash=squeak_hash)
         ]
@@ -725,9 +841,7 @@ class SqueakController:
         self.broadcast_msg(getdata_msg)
 
     def download_replies(self, squeak_hash: bytes):
-        logger.info("Downloading replies for squeak: {}".format(
-            squeak_hash.hex(),
-        ))
+        logger.info("Downloading replies for squeak: %s", squeak_hash.hex())
         interest = CInterested(
             hashReplySqk=squeak_hash,
         )
@@ -741,9 +855,10 @@ class SqueakController:
         self.broadcast_msg(getsqueaks_msg)
 
     def download_address_squeaks(self, squeak_address: str):
-        logger.info("Downloading address squeaks for address: {}".format(
+        logger.info(
+            "Downloading address squeaks for address: %s",
             squeak_address,
-        ))
+        )
         interest = CInterested(
             addresses=[CSqueakAddress(squeak_address)],
         )
@@ -760,9 +875,7 @@ class SqueakController:
         self.network_manager.broadcast_msg(msg)
 
     def disconnect_peer(self, peer_address: PeerAddress) -> None:
-        logger.info("Disconnect to peer: {}".format(
-            peer_address,
-        ))
+        logger.info("Disconnect to peer: %s", peer_address)
         self.network_manager.disconnect_peer(peer_address)
 
     def subscribe_connected_peers(self, stopped: threading.Event) -> Iterable[List[ConnectedPeer]]:
@@ -791,6 +904,18 @@ class SqueakController:
     def subscribe_new_squeaks(self, stopped: threading.Event):
         yield from self.new_squeak_listener.yield_items(stopped)
 
+    def subscribe_new_squeak_batches(
+            self,
+            stopped: threading.Event,
+            max_batch_size: int,
+            max_batch_wait_s: float,
+    ) -> Iterable[List[CSqueak]]:
+        yield from self.new_squeak_listener.yield_item_batches(
+            stopped,
+            max_batch_size=max_batch_size,
+            max_batch_wait_s=max_batch_wait_s,
+        )
+
     def subscribe_new_secret_keys(self, stopped: threading.Event):
         yield from self.new_secret_key_listener.yield_items(stopped)
 
@@ -799,43 +924,57 @@ class SqueakController:
         self.network_manager.update_local_subscriptions(locator)
 
     def subscribe_received_offers_for_squeak(self, squeak_hash: bytes, stopped: threading.Event):
-        for received_offer in self.new_received_offer_listener.yield_items(stopped):
-            if received_offer.squeak_hash == squeak_hash:
-                yield received_offer
+        yield from self.new_received_offer_listener.yield_items(
+            stopped,
+            key=squeak_hash,
+        )
 
     def subscribe_squeak_entry(self, squeak_hash: bytes, stopped: threading.Event):
-        for item in self.new_squeak_listener.yield_items(stopped):
-            if squeak_hash == get_hash(item):
-                yield self.get_squeak_entry(squeak_hash)
+        yield from self.new_squeak_entry_listener.yield_items(
+            stopped,
+            key=squeak_hash_key(squeak_hash),
+        )
 
     def subscribe_squeak_reply_entries(self, squeak_hash: bytes, stopped: threading.Event):
-        for item in self.new_squeak_listener.yield_items(stopped):
-            if squeak_hash == item.hashReplySqk:
-                reply_hash = get_hash(item)
-                yield self.get_squeak_entry(reply_hash)
+        yield from self.new_squeak_entry_listener.yield_items(
+            stopped,
+            key=squeak_reply_to_key(squeak_hash),
+        )
 
     def subscribe_squeak_address_entries(self, squeak_address: str, stopped: threading.Event):
-        for item in self.new_squeak_listener.yield_items(stopped):
-            if squeak_address == str(item.GetAddress()):
-                squeak_hash = get_hash(item)
-                yield self.get_squeak_entry(squeak_hash)
+        yield from self.new_squeak_entry_listener.yield_items(
+            stopped,
+            key=squeak_address_key(squeak_address),
+        )
 
     def subscribe_squeak_ancestor_entries(self, squeak_hash: bytes, stopped: threading.Event):
-        for item in self.new_squeak_listener.yield_items(stopped):
-            if squeak_hash == get_hash(item):
-                yield self.get_ancestor_squeak_entries(squeak_hash)
+        for item in self.new_squeak_listener.yield_items(
+                stopped,
+                key=squeak_hash_key(squeak_hash),
+        ):
+            yield self.get_ancestor_squeak_entries(squeak_hash)
 
     def subscribe_squeak_entries(self, stopped: threading.Event):
-        for item in self.new_squeak_listener.yield_items(stopped):
-            squeak_hash = get_hash(item)
-            yield self.get_squeak_entry(squeak_hash)
+        yield from self.new_squeak_entry_listener.yield_items(stopped)
 
     def subscribe_timeline_squeak_entries(self, stopped: threading.Event):
-        for item in self.new_squeak_listener.yield_items(stopped):
+        for squeak_entry in self.new_squeak_entry_listener.yield_items(stopped):
             followed_addresses = self.get_followed_addresses()
-            if str(item.GetAddress()) in set(followed_addresses):
-                squeak_hash = get_hash(item)
-                yield self.get_squeak_entry(squeak_hash)
+            if squeak_entry.address in set(followed_addresses):
+                yield squeak_entry
+
+    def subscribe_squeak_entry_batches(self, stopped: threading.Event) -> Iterable[List[SqueakEntry]]:
+        yield from self.new_squeak_entry_listener.yield_item_batches(stopped)
+
+    def subscribe_timeline_squeak_entry_batches(self, stopped: threading.Event) -> Iterable[List[SqueakEntry]]:
+        for squeak_entries in self.new_squeak_entry_listener.yield_item_batches(stopped):
+            followed_addresses = set(self.get_followed_addresses())
+            followed_squeak_entries = [
+                squeak_entry for squeak_entry in squeak_entries
+                if squeak_entry.address in followed_addresses
+            ]
+            if followed_squeak_entries:
+                yield followed_squeak_entries
 
     def get_external_address(self) -> PeerAddress:
         return self.network_manager.external_address
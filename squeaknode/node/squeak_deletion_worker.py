@@ -33,6 +33,7 @@ class SqueakDeletionWorker(PeriodicWorker):
         squeak_controller: SqueakController,
         clean_interval_s: int,
     ):
+        super().__init__()
         self.squeak_controller = squeak_controller
         self.clean_interval_s = clean_interval_s
 
@@ -26,7 +26,6 @@ from squeak.params import SelectParams
 
 from squeaknode.admin.squeak_admin_server_handler import SqueakAdminServerHandler
 from squeaknode.admin.squeak_admin_server_servicer import SqueakAdminServerServicer
-from squeaknode.admin.webapp.app import SqueakAdminWebServer
 from squeaknode.bitcoin.bitcoin_block_subscription_client import BitcoinBlockSubscriptionClient
 from squeaknode.bitcoin.bitcoin_core_client import BitcoinCoreClient
 from squeaknode.config.config import SqueaknodeConfig
@@ -49,6 +48,10 @@ from squeaknode.node.update_subscribed_squeak_worker import UpdateSubscribedSque
 logger = logging.getLogger(__name__)
 
 
+# Upper bound on the wait between database initialization attempts.
+DB_INIT_MAX_RETRY_S = 30
+
+
 class SqueakNode:
 
     def __init__(self, config: SqueaknodeConfig):
@@ -66,7 +69,8 @@ class SqueakNode:
         self.initialize_squeak_controller()
         self.initialize_admin_handler()
         self.initialize_admin_rpc_server()
-        self.initialize_admin_web_server()
+        if self.config.webadmin.enabled:
+            self.initialize_admin_web_server()
         self.initialize_received_payment_processor_worker()
         self.initialize_peer_connection_worker()
         self.initialize_squeak_deletion_worker()
@@ -92,11 +96,17 @@ class SqueakNode:
         self.new_bitcoin_block_worker.start_running()
 
     def stop_running(self):
-        self.admin_web_server.stop()
+        if self.config.webadmin.enabled:
+            self.admin_web_server.stop()
         self.admin_rpc_server.stop()
+        self.peer_connection_worker.stop()
         self.network_manager.stop()
-        self.received_payment_processor_worker.stop_running()
+        self.squeak_deletion_worker.stop()
+        self.offer_expiry_worker.stop()
         self.new_squeak_worker.stop_running()
+        self.new_secret_key_worker.stop_running()
+        self.received_payment_processor_worker.stop_running()
+        self.engine.dispose()
 
     def initialize_network(self):
         # load the network
@@ -110,15 +120,33 @@ class SqueakNode:
         )
         logger.info("Using connection string: {}".format(
             connection_string))
-        engine = get_engine(connection_string)
-        self.squeak_db = SqueakDb(engine)
-        for _ in range(10):
+        self.engine = get_engine(
+            connection_string,
+            pool_size=self.config.db.pool_size,
+            max_overflow=self.config.db.max_overflow,
+            pool_recycle_s=self.config.db.pool_recycle_s,
+        )
+        self.squeak_db = SqueakDb(self.engine)
+        max_attempts = self.config.db.init_max_attempts
+        for attempt in range(max_attempts):
             try:
                 self.squeak_db.init()
-                break
+                return
             except Exception:
-                logger.exception("Failed to initialize database.")
-                time.sleep(10)
+                if attempt == max_attempts - 1:
+                    raise
+                # Back off exponentially, so that a database that is
+                # still starting up is retried quickly at first.
+                retry_s = min(
+                    self.config.db.init_retry_base_s * 2 ** attempt,
+                    DB_INIT_MAX_RETRY_S,
+                )
+                logger.exception(
+                    "Failed to initialize database. Retrying in {} seconds...".format(
+                        retry_s,
+                    ),
+                )
+                time.sleep(retry_s)
 
     def initialize_lightning_client(self):
         # load the lightning client
@@ -182,10 +210,14 @@ class SqueakNode:
         self.admin_rpc_server = SqueakAdminServerServicer(
             self.config.admin.rpc_host,
             self.config.admin.rpc_port,
+            self.config.admin.rpc_max_workers,
             self.admin_handler,
         )
 
     def initialize_admin_web_server(self):
+        # Imported here so that flask is only loaded when the web admin
+        # is enabled.
+        from squeaknode.admin.webapp.app import SqueakAdminWebServer
         self.admin_web_server = SqueakAdminWebServer(
             self.config.webadmin.host,
             self.config.webadmin.port,
@@ -34,12 +34,12 @@ class SqueakOfferExpiryWorker(PeriodicWorker):
         squeak_controller: SqueakController,
         clean_interval_s: int,
     ):
+        super().__init__()
         self.squeak_controller = squeak_controller
         self.clean_interval_s = clean_interval_s
 
     def work_fn(self):
-        self.squeak_controller.delete_all_expired_received_offers()
-        self.squeak_controller.delete_all_expired_sent_offers()
+        self.squeak_controller.delete_all_expired_offers()
 
     def get_interval_s(self):
         return self.clean_interval_s
@@ -35,6 +35,8 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_MAX_QUEUE_SIZE = 1000
 DEFAULT_UPDATE_INTERVAL_S = 1
+FORWARD_MAX_BATCH_SIZE = DEFAULT_MAX_QUEUE_SIZE
+FORWARD_MAX_BATCH_WAIT_S = 0.05
 
 HASH_LENGTH = 32
 EMPTY_HASH = b'\x00' * HASH_LENGTH
@@ -62,25 +64,33 @@ class UpdateSubscribedSqueaksWorker:
 
     def handle_new_squeaks(self):
         logger.debug("Starting UpdateSubscribedSqueaksWorker...")
-        for squeak in self.squeak_controller.subscribe_new_squeaks(
+        for squeaks in self.squeak_controller.subscribe_new_squeak_batches(
                 self.stopped,
+                max_batch_size=FORWARD_MAX_BATCH_SIZE,
+                max_batch_wait_s=FORWARD_MAX_BATCH_WAIT_S,
         ):
-            logger.debug("Handling new squeak: {!r}".format(
-                get_hash(squeak).hex(),
+            squeak_hashes = [get_hash(squeak) for squeak in squeaks]
+            logger.debug("Handling new squeaks: {!r}".format(
+                [squeak_hash.hex() for squeak_hash in squeak_hashes],
             ))
-            self.forward_squeak(squeak)
+            self.forward_squeaks(squeaks, squeak_hashes)
 
-    def forward_squeak(self, squeak):
-        logger.debug("Forward new squeak: {!r}".format(
-            get_hash(squeak).hex(),
-        ))
+    def forward_squeaks(self, squeaks, squeak_hashes):
+        """Send each connected peer a single inv message with the
+        squeaks that it is subscribed to."""
+        invs = [
+            CInv(type=MSG_SQUEAK, hash=squeak_hash)
+            for squeak_hash in squeak_hashes
+        ]
         for peer in self.network_manager.get_connected_peers():
-            if peer.is_remote_subscribed(squeak):
-                logger.debug("Forwarding to peer: {}".format(
+            peer_invs = [
+                inv for squeak, inv in zip(squeaks, invs)
+                if peer.is_remote_subscribed(squeak)
+            ]
+            if peer_invs:
+                logger.debug("Forwarding {} squeaks to peer: {}".format(
+                    len(peer_invs),
                     peer,
                 ))
-                squeak_hash = get_hash(squeak)
-                inv = CInv(type=MSG_SQUEAK, hash=squeak_hash)
-                inv_msg = msg_inv(inv=[inv])
-                peer.send_msg(inv_msg)
+                peer.send_msg(msg_inv(inv=peer_invs))
         logger.debug("Finished checking peers to forward.")
@@ -0,0 +1,50 @@
+# MIT License
+#
+# Copyright (c) 2020 Jonathan Zernik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from proto import squeak_admin_pb2
+from squeaknode.admin.messages import squeak_entries_to_message
+from squeaknode.core.squeak_entry import SqueakEntry
+from squeaknode.core.squeaks import get_hash
+
+
+def test_import_admin_handler():
+    # The handler imports the messages module, whose annotations must
+    # not be evaluated against the pinned protobuf runtime.
+    import squeaknode.admin.squeak_admin_server_handler  # noqa: F401
+
+
+def test_squeak_entries_to_message(squeak, address, genesis_block_info):
+    squeak_entry = SqueakEntry(
+        squeak_hash=get_hash(squeak),
+        address=address,
+        block_height=genesis_block_info.block_height,
+        block_hash=genesis_block_info.block_hash,
+        block_time=0,
+        squeak_time=squeak.nTime,
+        reply_to=None,
+        is_unlocked=False,
+        squeak_profile=None,
+    )
+    reply = squeak_admin_pb2.SqueakDisplayBatchReply()
+    squeak_entries_to_message([squeak_entry], reply.squeak_display_entries)
+
+    assert len(reply.squeak_display_entries) == 1
+    assert reply.squeak_display_entries[0].squeak_hash == get_hash(squeak).hex()
@@ -28,18 +28,18 @@ from squeaknode.bitcoin.block_info import BlockInfo
 from squeaknode.core.squeaks import make_squeak_with_block
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def signing_key():
     yield CSigningKey.generate()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def address(signing_key):
     verifying_key = signing_key.get_verifying_key()
     yield str(CSqueakAddress.from_verifying_key(verifying_key))
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def genesis_block_info():
     yield BlockInfo(
         block_height=0,
@@ -48,12 +48,12 @@ def genesis_block_info():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def squeak_content():
     yield "hello!"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def squeak_and_secret_key(signing_key, squeak_content, genesis_block_info):
     yield make_squeak_with_block(
         signing_key,
@@ -63,13 +63,13 @@ def squeak_and_secret_key(signing_key, squeak_content, genesis_block_info):
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def squeak(squeak_and_secret_key):
     squeak, _ = squeak_and_secret_key
     yield squeak
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def secret_key(squeak_and_secret_key):
     _, secret_key = squeak_and_secret_key
     yield secret_key
@@ -19,12 +19,22 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
+import time
+
+import mock
 import pytest
 from sqlalchemy import create_engine
 
+from squeaknode.core.peer_address import PeerAddress
+from squeaknode.core.peers import create_saved_peer
+from squeaknode.core.received_payment import ReceivedPayment
+from squeaknode.core.sent_offer import SentOffer
+from squeaknode.core.sent_payment import SentPayment
 from squeaknode.core.squeaks import get_hash
 from squeaknode.db.squeak_db import SqueakDb
+from tests.utils import gen_address
 from tests.utils import gen_contact_profile
+from tests.utils import gen_random_hash
 from tests.utils import gen_signing_profile
 from tests.utils import gen_squeak_with_block_header
 
@@ -217,6 +227,111 @@ def test_insert_duplicate_squeak(squeak_db, squeak, block_header, inserted_squea
     assert insert_result is None
 
 
+def test_insert_squeaks(squeak_db, signing_key, squeak, block_header, inserted_squeak_hash):
+    new_squeak, new_block_header = gen_squeak_with_block_header(
+        signing_key=signing_key,
+        block_height=8888,
+    )
+    inserted_squeak_hashes = squeak_db.insert_squeaks([
+        (squeak, block_header),
+        (new_squeak, new_block_header),
+        (new_squeak, new_block_header),
+    ])
+
+    assert inserted_squeak_hashes == [None, get_hash(new_squeak), None]
+    assert squeak_db.get_squeak(get_hash(new_squeak)) == new_squeak
+
+
+def test_insert_squeaks_max_squeaks(squeak_db, signing_key, squeak, block_header, inserted_squeak_hash):
+    new_squeak, new_block_header = gen_squeak_with_block_header(
+        signing_key=signing_key,
+        block_height=8888,
+    )
+    squeak_block_headers = [
+        (squeak, block_header),
+        (new_squeak, new_block_header),
+        (new_squeak, new_block_header),
+    ]
+
+    with pytest.raises(Exception):
+        squeak_db.insert_squeaks(squeak_block_headers, max_squeaks=1)
+    assert squeak_db.get_squeak(get_hash(new_squeak)) is None
+
+    # Squeaks that already exist do not count towards the limit.
+    inserted_squeak_hashes = squeak_db.insert_squeaks(
+        squeak_block_headers, max_squeaks=2)
+
+    assert inserted_squeak_hashes == [None, get_hash(new_squeak), None]
+
+
+def test_delete_squeak(squeak_db, inserted_squeak_hash):
+    squeak_db.delete_squeak(inserted_squeak_hash)
+
+    assert squeak_db.get_squeak(inserted_squeak_hash) is None
+    assert squeak_db.get_squeak_entry(inserted_squeak_hash) is None
+
+
+def test_delete_squeaks(squeak_db, inserted_squeak_hashes):
+    squeak_db.delete_squeaks(inserted_squeak_hashes[:60])
+
+    assert all(
+        squeak_db.get_squeak(squeak_hash) is None
+        for squeak_hash in inserted_squeak_hashes[:60]
+    )
+    assert all(
+        squeak_db.get_squeak_entry(squeak_hash) is not None
+        for squeak_hash in inserted_squeak_hashes[60:]
+    )
+
+
+def test_get_old_squeaks_to_delete(squeak_db, inserted_squeak_hash, signing_key):
+    liked_squeak, liked_block_header = gen_squeak_with_block_header(
+        signing_key=signing_key,
+        block_height=8888,
+    )
+    liked_squeak_hash = squeak_db.insert_squeak(
+        liked_squeak, liked_block_header)
+    squeak_db.set_squeak_liked(liked_squeak_hash)
+    old_squeak_hashes = squeak_db.get_old_squeaks_to_delete(
+        interval_s=-1,
+    )
+
+    assert old_squeak_hashes == [inserted_squeak_hash]
+
+
+def test_get_squeak_entries_for_text_search(squeak_db, unlocked_squeak_hash):
+    search_squeak_entries = squeak_db.get_squeak_entries_for_text_search(
+        search_text="hell",
+        limit=10,
+        last_entry=None,
+    )
+
+    assert [entry.squeak_hash for entry in search_squeak_entries] == [
+        unlocked_squeak_hash,
+    ]
+
+
+def test_get_squeak_entries_for_text_search_locked(squeak_db, inserted_squeak_hash):
+    search_squeak_entries = squeak_db.get_squeak_entries_for_text_search(
+        search_text="hell",
+        limit=10,
+        last_entry=None,
+    )
+
+    assert len(search_squeak_entries) == 0
+
+
+def test_get_squeak_entries_for_text_search_deleted(squeak_db, unlocked_squeak_hash):
+    squeak_db.delete_squeak(unlocked_squeak_hash)
+    search_squeak_entries = squeak_db.get_squeak_entries_for_text_search(
+        search_text="hell",
+        limit=10,
+        last_entry=None,
+    )
+
+    assert len(search_squeak_entries) == 0
+
+
 def test_get_missing_squeak(squeak_db, squeak):
     squeak_hash = get_hash(squeak)
     retrieved_squeak = squeak_db.get_squeak(squeak_hash)
@@ -233,6 +348,20 @@ def test_get_squeak_entry(squeak_db, squeak, block_header, address, inserted_squ
     assert retrieved_squeak_entry.block_time == block_header.nTime
 
 
+def test_get_squeak_entry_with_profile(squeak_db, inserted_squeak_hash, inserted_signing_profile):
+    retrieved_squeak_entry = squeak_db.get_squeak_entry(inserted_squeak_hash)
+
+    assert retrieved_squeak_entry.squeak_profile == inserted_signing_profile
+
+    squeak_db.set_profile_image(
+        inserted_signing_profile.profile_id,
+        b"fake_profile_image",
+    )
+    retrieved_squeak_entry = squeak_db.get_squeak_entry(inserted_squeak_hash)
+
+    assert retrieved_squeak_entry.squeak_profile.profile_image == b"fake_profile_image"
+
+
 def test_get_missing_squeak_entry(squeak_db, squeak, address):
     squeak_hash = get_hash(squeak)
     retrieved_squeak_entry = squeak_db.get_squeak_entry(squeak_hash)
@@ -292,6 +421,24 @@ def test_get_timeline_squeak_entries(squeak_db, followed_squeak_hashes):
     assert len(timeline_squeak_entries) == 2
 
 
+def test_get_timeline_squeak_entries_pages(squeak_db, followed_squeak_hashes):
+    first_page = squeak_db.get_timeline_squeak_entries(
+        limit=30,
+        last_entry=None,
+    )
+    second_page = squeak_db.get_timeline_squeak_entries(
+        limit=200,
+        last_entry=first_page[-1],
+    )
+    retrieved_hashes = [
+        entry.squeak_hash for entry in first_page + second_page
+    ]
+
+    assert len(first_page) == 30
+    assert len(second_page) == len(followed_squeak_hashes) - 30
+    assert set(retrieved_hashes) == set(followed_squeak_hashes)
+
+
 def test_get_timeline_squeak_entries_all_unfollowed(squeak_db, unfollowed_squeak_hashes):
     timeline_squeak_entries = squeak_db.get_timeline_squeak_entries(
         limit=2,
@@ -327,6 +474,33 @@ def test_set_profile_unfollowing(squeak_db, unfollowed_contact_profile):
     assert not unfollowed_contact_profile.following
 
 
+def test_get_profiles_after_change(squeak_db, inserted_contact_profile):
+    squeak_db.set_profile_name(
+        inserted_contact_profile.profile_id,
+        "new_contact_profile_name",
+    )
+    other_profile_id = squeak_db.insert_profile(
+        gen_contact_profile("other_contact_profile_name", str(gen_address())),
+    )
+    profiles = squeak_db.get_profiles()
+
+    assert [profile.profile_id for profile in profiles] == [
+        inserted_contact_profile.profile_id,
+        other_profile_id,
+    ]
+    assert profiles[0].profile_name == "new_contact_profile_name"
+
+
+def test_get_profiles_cached(squeak_db, inserted_contact_profile):
+    with mock.patch.object(squeak_db, 'get_connection', autospec=True) as mock_get_connection:
+        profile = squeak_db.get_profile_by_address(
+            inserted_contact_profile.address,
+        )
+
+    assert profile == inserted_contact_profile
+    assert mock_get_connection.call_count == 0
+
+
 def test_get_liked_squeak_entries(
         squeak_db,
         liked_squeak_hashes,
@@ -363,3 +537,274 @@ def test_set_squeak_unliked(squeak_db, unliked_squeak_hash):
     retrieved_squeak_entry = squeak_db.get_squeak_entry(unliked_squeak_hash)
 
     assert retrieved_squeak_entry.liked_time_ms is None
+
+
+def test_get_peer_by_host_port(squeak_db):
+    peer_address = PeerAddress(
+        host="fake_host",
+        port=8765,
+        use_tor=False,
+    )
+    peer_id = squeak_db.insert_peer(
+        create_saved_peer("fake_peer_name", peer_address),
+    )
+    retrieved_peer = squeak_db.get_peer_by_host_port("fake_host", 8765)
+    missing_peer = squeak_db.get_peer_by_host_port("fake_host", 8766)
+
+    assert retrieved_peer.peer_id == peer_id
+    assert retrieved_peer.address == peer_address
+    assert missing_peer is None
+
+
+def test_get_peer_and_delete_peer(squeak_db):
+    peer_address = PeerAddress(
+        host="fake_host",
+        port=8765,
+        use_tor=False,
+    )
+    peer_id = squeak_db.insert_peer(
+        create_saved_peer("fake_peer_name", peer_address),
+    )
+    retrieved_peer = squeak_db.get_peer(peer_id)
+    squeak_db.delete_peer(peer_id)
+
+    assert retrieved_peer.address == peer_address
+    assert squeak_db.get_peer(peer_id) is None
+
+
+def test_get_peers_after_change(squeak_db):
+    peer_id = squeak_db.insert_peer(
+        create_saved_peer(
+            "fake_peer_name",
+            PeerAddress(host="fake_host", port=8765, use_tor=False),
+        ),
+    )
+    assert squeak_db.get_autoconnect_peers() == []
+
+    squeak_db.set_peer_autoconnect(peer_id, True)
+    squeak_db.set_peer_name(peer_id, "new_peer_name")
+    other_peer_id = squeak_db.insert_peer(
+        create_saved_peer(
+            "other_peer_name",
+            PeerAddress(host="other_host", port=8765, use_tor=False),
+        ),
+    )
+    peers = squeak_db.get_peers()
+
+    assert [peer.peer_id for peer in peers] == [peer_id, other_peer_id]
+    assert peers[0].peer_name == "new_peer_name"
+    assert squeak_db.get_autoconnect_peers() == [peers[0]]
+
+
+def test_get_peer_by_address_cached(squeak_db):
+    peer_address = PeerAddress(
+        host="fake_host",
+        port=8765,
+        use_tor=False,
+    )
+    peer_id = squeak_db.insert_peer(
+        create_saved_peer("fake_peer_name", peer_address),
+    )
+    squeak_db.get_peers()
+    with mock.patch.object(squeak_db, 'get_connection', autospec=True) as mock_get_connection:
+        peer = squeak_db.get_peer_by_address(peer_address)
+
+    assert peer.peer_id == peer_id
+    assert mock_get_connection.call_count == 0
+
+
+def test_set_sent_offer_paid(squeak_db):
+    peer_address = PeerAddress(
+        host="fake_host",
+        port=8765,
+        use_tor=False,
+    )
+    sent_offer = SentOffer(
+        sent_offer_id=None,
+        squeak_hash=gen_random_hash(),
+        payment_hash=gen_random_hash(),
+        secret_key=gen_random_hash(),
+        nonce=gen_random_hash(),
+        price_msat=1000,
+        payment_request="fake_payment_request",
+        invoice_time=int(time.time()),
+        invoice_expiry=3600,
+        peer_address=peer_address,
+    )
+    squeak_db.insert_sent_offer(sent_offer)
+    squeak_db.set_sent_offer_paid(sent_offer.payment_hash, paid=True)
+
+    assert squeak_db.get_sent_offer_by_payment_hash(
+        sent_offer.payment_hash,
+    ).squeak_hash == sent_offer.squeak_hash
+    assert squeak_db.get_sent_offer_by_squeak_hash_and_peer(
+        sent_offer.squeak_hash,
+        peer_address,
+    ) is None
+
+
+def test_delete_expired_offers(squeak_db):
+    peer_address = PeerAddress(
+        host="fake_host",
+        port=8765,
+        use_tor=False,
+    )
+    sent_offers = [
+        SentOffer(
+            sent_offer_id=None,
+            squeak_hash=gen_random_hash(),
+            payment_hash=gen_random_hash(),
+            secret_key=gen_random_hash(),
+            nonce=gen_random_hash(),
+            price_msat=1000,
+            payment_request="fake_payment_request",
+            invoice_time=invoice_time,
+            invoice_expiry=3600,
+            peer_address=peer_address,
+        )
+        for invoice_time in [int(time.time()) - 7200, int(time.time())]
+    ]
+    for sent_offer in sent_offers:
+        squeak_db.insert_sent_offer(sent_offer)
+    num_deleted = squeak_db.delete_expired_offers(0)
+
+    assert num_deleted == (0, 1)
+    assert squeak_db.get_sent_offer_by_payment_hash(
+        sent_offers[0].payment_hash,
+    ) is None
+    assert squeak_db.get_sent_offer_by_payment_hash(
+        sent_offers[1].payment_hash,
+    ) is not None
+
+
+def test_get_received_payments_pages(squeak_db):
+    peer_address = PeerAddress(
+        host="fake_host",
+        port=8765,
+        use_tor=False,
+    )
+    # Insert all payments with the same created time, so that the pages
+    # are ordered by the received payment id.
+    with mock.patch.object(SqueakDb, 'timestamp_now_ms', new_callable=mock.PropertyMock) as mock_timestamp_now_ms:
+        mock_timestamp_now_ms.return_value = 123456
+        received_payment_ids = [
+            squeak_db.insert_received_payment(
+                ReceivedPayment(
+                    received_payment_id=None,
+                    created_time_ms=None,
+                    squeak_hash=gen_random_hash(),
+                    payment_hash=gen_random_hash(),
+                    price_msat=1000,
+                    settle_index=i,
+                    peer_address=peer_address,
+                )
+            )
+            for i in range(5)
+        ]
+        first_page = squeak_db.get_received_payments(3, None)
+        second_page = squeak_db.get_received_payments(3, first_page[-1])
+
+    assert [payment.received_payment_id for payment in first_page + second_page] == \
+        list(reversed(received_payment_ids))
+
+
+def test_yield_received_payments_from_index(squeak_db):
+    peer_address = PeerAddress(
+        host="fake_host",
+        port=8765,
+        use_tor=False,
+    )
+    received_payment_ids = [
+        squeak_db.insert_received_payment(
+            ReceivedPayment(
+                received_payment_id=None,
+                created_time_ms=None,
+                squeak_hash=gen_random_hash(),
+                payment_hash=gen_random_hash(),
+                price_msat=1000,
+                settle_index=i,
+                peer_address=peer_address,
+            )
+        )
+        for i in range(5)
+    ]
+    received_payments = squeak_db.yield_received_payments_from_index(
+        received_payment_ids[1],
+    )
+
+    assert [payment.received_payment_id for payment in received_payments] == \
+        received_payment_ids[2:]
+
+
+def test_get_received_payment_summary_after_insert(squeak_db):
+    peer_address = PeerAddress(
+        host="fake_host",
+        port=8765,
+        use_tor=False,
+    )
+    empty_summary = squeak_db.get_received_payment_summary()
+    squeak_db.insert_received_payment(
+        ReceivedPayment(
+            received_payment_id=None,
+            created_time_ms=None,
+            squeak_hash=gen_random_hash(),
+            payment_hash=gen_random_hash(),
+            price_msat=1000,
+            settle_index=1,
+            peer_address=peer_address,
+        )
+    )
+    summary = squeak_db.get_received_payment_summary()
+
+    assert empty_summary.num_received_payments == 0
+    assert summary.num_received_payments == 1
+    assert summary.total_amount_received_msat == 1000
+
+
+def test_get_sent_payments_pages(squeak_db):
+    peer_address = PeerAddress(
+        host="fake_host",
+        port=8765,
+        use_tor=False,
+    )
+    # Insert all payments with the same created time, so that the pages
+    # are ordered by the payment hash.
+    with mock.patch.object(SqueakDb, 'timestamp_now_ms', new_callable=mock.PropertyMock) as mock_timestamp_now_ms:
+        mock_timestamp_now_ms.return_value = 123456
+        payment_hashes = [gen_random_hash() for _ in range(5)]
+        for payment_hash in payment_hashes:
+            squeak_db.insert_sent_payment(
+                SentPayment(
+                    sent_payment_id=None,
+                    created_time_ms=None,
+                    peer_address=peer_address,
+                    squeak_hash=gen_random_hash(),
+                    payment_hash=payment_hash,
+                    secret_key=gen_random_hash(),
+                    price_msat=1000,
+                    node_pubkey="fake_node_pubkey",
+                    valid=True,
+                )
+            )
+        first_page = squeak_db.get_sent_payments(3, None)
+        second_page = squeak_db.get_sent_payments(3, first_page[-1])
+
+    assert [payment.payment_hash for payment in first_page + second_page] == \
+        sorted(payment_hashes, reverse=True)
+
+
+def test_get_connection_nested(squeak_db):
+    with squeak_db.get_connection() as connection:
+        with squeak_db.get_connection() as nested_connection:
+            assert nested_connection is connection
+
+    assert squeak_db.local.connection is None
+
+
+def test_transaction_rollback(squeak_db, squeak, block_header):
+    with pytest.raises(ValueError):
+        with squeak_db.transaction():
+            squeak_db.insert_squeak(squeak, block_header)
+            raise ValueError()
+
+    assert squeak_db.get_squeak(get_hash(squeak)) is None
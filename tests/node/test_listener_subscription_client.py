@@ -0,0 +1,102 @@
+# MIT License
+#
+# Copyright (c) 2020 Jonathan Zernik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import sys
+import threading
+
+from squeaknode.node.listener_subscription_client import EventListener
+from squeaknode.node.listener_subscription_client import ListenerSubscriptionClient
+
+
+def test_get_item_batches():
+    stopped = threading.Event()
+    client = ListenerSubscriptionClient(stopped)
+    for item in [1, 2, 3]:
+        client.enqueue_item(item)
+    stopped.set()
+    client.wait_for_stopped()
+    batches = list(client.get_item_batches(
+        max_batch_size=2,
+        max_batch_wait_s=1,
+    ))
+
+    assert batches == [[1, 2], [3]]
+
+
+def test_get_item_batches_wait_expired():
+    stopped = threading.Event()
+    client = ListenerSubscriptionClient(stopped)
+    client.enqueue_item(1)
+    batches = client.get_item_batches(
+        max_batch_size=32,
+        max_batch_wait_s=0.01,
+    )
+
+    assert next(batches) == [1]
+
+
+def test_handle_new_item_keyed_callbacks():
+    listener = EventListener()
+    all_items = []
+    foo_items = []
+    listener.add_callback("all", all_items.append)
+    listener.add_callback("foo", foo_items.append, key="foo")
+    listener.handle_new_item(1, keys=["foo"])
+    listener.handle_new_item(2, keys=["bar"])
+    listener.handle_new_item(3)
+    listener.remove_callback("foo", key="foo")
+    listener.handle_new_item(4, keys=["foo"])
+
+    assert all_items == [1, 2, 3, 4]
+    assert foo_items == [1]
+    assert listener.keyed_callbacks == {}
+
+
+def test_add_remove_keyed_callbacks_concurrently():
+    listener = EventListener()
+    errors = []
+
+    def subscribe_and_unsubscribe(thread_index):
+        try:
+            for i in range(5000):
+                name = "callback_{}_{}".format(thread_index, i)
+                listener.add_callback(name, print, key="foo")
+                listener.remove_callback(name, key="foo")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target=subscribe_and_unsubscribe, args=(i,))
+        for i in range(8)
+    ]
+    # Switch threads often, so that the add and remove calls interleave.
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert errors == []
+    assert listener.keyed_callbacks == {}
@@ -30,17 +30,18 @@ from squeaknode.core.squeak_peer import SqueakPeer
 from squeaknode.db.squeak_db import SqueakDb
 from squeaknode.network.network_manager import NetworkManager
 from squeaknode.node.payment_processor import PaymentProcessor
+from squeaknode.node.squeak_controller import squeak_address_key
 from squeaknode.node.squeak_controller import SqueakController
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def config():
     squeaknode_config = SqueaknodeConfig()
     squeaknode_config.read()
     return squeaknode_config
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def regtest_config():
     squeaknode_config = SqueaknodeConfig(
         dict_config={'node': {'network': 'regtest'}}
@@ -132,6 +133,16 @@ def test_get_buy_offer(squeak_controller):
     assert squeak_controller.get_offer is not None
 
 
+def test_db_connection(squeak_db, squeak_controller):
+    squeak_db.get_connection.return_value = mock.MagicMock()
+    with squeak_controller.db_connection():
+        squeak_controller.get_squeak(b"fake_hash")
+
+    squeak_db.get_connection.return_value.__enter__.assert_called_once_with()
+    squeak_db.get_connection.return_value.__exit__.assert_called_once()
+    squeak_db.get_squeak.assert_called_once_with(b"fake_hash")
+
+
 def test_get_network_default(squeak_controller):
     assert squeak_controller.get_network() == "testnet"
 
@@ -163,3 +174,81 @@ def test_create_peer(squeak_db, squeak_controller, peer_address):
             autoconnect=False,
         )
     )
+
+
+def test_make_squeaks(squeak_db, squeak_core, squeak_controller):
+    squeak_core.make_squeak.return_value = (mock.Mock(), b"fake_key")
+    squeak_db.get_number_of_squeaks.return_value = 0
+    squeak_db.insert_squeaks.return_value = [b"hash_1", None, b"hash_3"]
+
+    inserted_squeak_hashes = squeak_controller.make_squeaks([
+        (1, "first", None),
+        (1, "second", b"reply_to"),
+        (2, "third", None),
+    ])
+
+    assert inserted_squeak_hashes == [b"hash_1", None, b"hash_3"]
+    assert squeak_db.get_profile.call_count == 2
+    assert squeak_core.make_squeak.call_count == 3
+    assert squeak_db.insert_squeaks.call_count == 1
+    assert squeak_db.set_squeak_decryption_key.call_count == 2
+
+
+def test_save_squeak_publishes_entry(squeak_db, squeak_controller):
+    squeak_db.get_number_of_squeaks.return_value = 0
+    squeak_db.insert_squeak.return_value = b"fake_hash"
+    squeak_entry = mock.Mock(
+        squeak_hash=b"fake_hash",
+        address="fake_address",
+        reply_to=None,
+    )
+    squeak_db.get_squeak_entry.return_value = squeak_entry
+    received_entries = []
+    listener = squeak_controller.new_squeak_entry_listener
+    listener.add_callback("all", received_entries.append)
+    listener.add_callback(
+        "matching",
+        received_entries.append,
+        key=squeak_address_key("fake_address"),
+    )
+    listener.add_callback(
+        "other",
+        received_entries.append,
+        key=squeak_address_key("other_address"),
+    )
+    squeak_controller.save_squeak(mock.Mock())
+
+    assert received_entries == [squeak_entry, squeak_entry]
+    squeak_db.get_squeak_entry.assert_called_once_with(b"fake_hash")
+
+
+def test_make_squeak_publishes_unlocked_entry(squeak_db, squeak_core, squeak_controller):
+    squeak_db.get_number_of_squeaks.return_value = 0
+    squeak_db.insert_squeak.return_value = b"fake_hash"
+    squeak_core.make_squeak.return_value = (mock.Mock(), b"fake_secret_key")
+
+    def get_squeak_entry(squeak_hash):
+        return mock.Mock(
+            squeak_hash=squeak_hash,
+            address="fake_address",
+            reply_to=None,
+            is_unlocked=squeak_db.set_squeak_decryption_key.called,
+        )
+    squeak_db.get_squeak_entry.side_effect = get_squeak_entry
+    received_entries = []
+    squeak_controller.new_squeak_entry_listener.add_callback(
+        "all",
+        received_entries.append,
+    )
+    squeak_controller.make_squeak(1, "hello", None)
+
+    assert len(received_entries) == 1
+    assert received_entries[0].is_unlocked
+
+
+def test_save_squeak_without_subscribers(squeak_db, squeak_controller):
+    squeak_db.get_number_of_squeaks.return_value = 0
+    squeak_db.insert_squeak.return_value = b"fake_hash"
+    squeak_controller.save_squeak(mock.Mock())
+
+    squeak_db.get_squeak_entry.assert_not_called()
@@ -31,6 +31,12 @@ def mock_lightning_client():
     yield mock.patch('squeaknode.node.squeak_node.LNDLightningClient', autospec=True)
 
 
+@pytest.fixture()
+def mock_sleep():
+    with mock.patch('squeaknode.node.squeak_node.time.sleep', autospec=True) as mock_sleep:
+        yield mock_sleep
+
+
 def get_config(config_dict):
     config = SqueaknodeConfig(
         dict_config=config_dict,
@@ -65,7 +71,7 @@ def squeak_node(request):
             mock.patch('squeaknode.node.squeak_node.SqueakOfferExpiryWorker', autospec=True), \
             mock.patch('squeaknode.node.squeak_node.ProcessReceivedPaymentsWorker', autospec=True), \
             mock.patch('squeaknode.node.squeak_node.PeerConnectionWorker', autospec=True), \
-            mock.patch('squeaknode.node.squeak_node.SqueakAdminWebServer', autospec=True):
+            mock.patch('squeaknode.admin.webapp.app.SqueakAdminWebServer', autospec=True):
         config = get_config(request.param)
         yield SqueakNode(config)
 
@@ -73,3 +79,39 @@ def squeak_node(request):
 def test_start_stop(squeak_node):
     squeak_node.start_running()
     squeak_node.stop_running()
+
+
+def test_initialize_db_retries(mock_sleep):
+    with mock.patch('squeaknode.node.squeak_node.get_connection_string'), \
+            mock.patch('squeaknode.node.squeak_node.get_engine'), \
+            mock.patch('squeaknode.node.squeak_node.SqueakDb') as mock_squeak_db_cls:
+        mock_squeak_db_cls.return_value.init.side_effect = [
+            Exception(), Exception(), None]
+        squeak_node = SqueakNode(get_config(mainnet_config))
+        squeak_node.initialize_network()
+        squeak_node.initialize_db()
+
+    assert mock_squeak_db_cls.return_value.init.call_count == 3
+    assert [c.args for c in mock_sleep.call_args_list] == [(0.5,), (1.0,)]
+
+
+def test_initialize_db_gives_up(mock_sleep):
+    config_dict = {
+        'node': {
+            'network': 'mainnet'
+        },
+        'db': {
+            'init_max_attempts': '3'
+        },
+    }
+    with mock.patch('squeaknode.node.squeak_node.get_connection_string'), \
+            mock.patch('squeaknode.node.squeak_node.get_engine'), \
+            mock.patch('squeaknode.node.squeak_node.SqueakDb') as mock_squeak_db_cls:
+        mock_squeak_db_cls.return_value.init.side_effect = ValueError()
+        squeak_node = SqueakNode(get_config(config_dict))
+        squeak_node.initialize_network()
+        with pytest.raises(ValueError):
+            squeak_node.initialize_db()
+
+    assert mock_squeak_db_cls.return_value.init.call_count == 3
+    assert mock_sleep.call_count == 2
@@ -0,0 +1,50 @@
+# MIT License
+#
+# Copyright (c) 2020 Jonathan Zernik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import mock
+from squeak.messages import MSG_SQUEAK
+from squeak.net import CInv
+
+from squeaknode.core.squeaks import get_hash
+from squeaknode.node.update_subscribed_squeak_worker import UpdateSubscribedSqueaksWorker
+
+
+def test_forward_squeaks(squeak):
+    squeak_hash = get_hash(squeak)
+    subscribed_peer = mock.Mock()
+    subscribed_peer.is_remote_subscribed.return_value = True
+    unsubscribed_peer = mock.Mock()
+    unsubscribed_peer.is_remote_subscribed.return_value = False
+    network_manager = mock.Mock()
+    network_manager.get_connected_peers.return_value = [
+        subscribed_peer,
+        unsubscribed_peer,
+    ]
+    worker = UpdateSubscribedSqueaksWorker(mock.Mock(), network_manager)
+    worker.forward_squeaks([squeak, squeak], [squeak_hash, squeak_hash])
+
+    subscribed_peer.send_msg.assert_called_once()
+    inv_msg = subscribed_peer.send_msg.call_args.args[0]
+    assert inv_msg.inv == [
+        CInv(type=MSG_SQUEAK, hash=squeak_hash),
+        CInv(type=MSG_SQUEAK, hash=squeak_hash),
+    ]
+    unsubscribed_peer.send_msg.assert_not_called()